@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the Curl2* converters in bin/.
+
+Every case in the corpus is timed through parse_curl_command, each
+generator (generate_python_code, generate_csharp_code,
+generate_http_content) and a full CurlToAll conversion to files. For each
+it reports operations per second and the peak memory allocated by one
+operation. The corpus is the .curl files in corpus/ plus JSON bodies of
+1 MB and 10 MB, which are generated deterministically rather than checked
+in.
+
+Results are compared against baseline.json. The run fails when an operation
+is slower, or allocates more, than the baseline by more than --threshold
+percent. Baselines are only comparable on the machine that recorded them;
+re-record with --save-baseline after an intended change or on a new machine.
+
+Usage:
+  python bench/curl2/bench.py
+  python bench/curl2/bench.py --case 'json_*' --op parse --threshold 20
+  python bench/curl2/bench.py --save-baseline
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+BIN_DIR = os.path.join(os.path.dirname(os.path.dirname(BENCH_DIR)), 'bin')
+sys.path.insert(0, BIN_DIR)
+
+from CurlRequest import parse_curl_command, split_curl_commands  # noqa: E402
+from Curl2Python import CurlToPython  # noqa: E402
+from Curl2CSharp import CurlToCSharp  # noqa: E402
+from Curl2Http import CurlToHttp  # noqa: E402
+from Curl2All import CurlToAll  # noqa: E402
+
+OPERATIONS = ('parse', 'python', 'csharp', 'http', 'all')
+
+# Generated JSON bodies: case name -> approximate size in bytes
+GENERATED_JSON = {'json_1mb': 1 << 20, 'json_10mb': 10 << 20}
+
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_MIN_RUNS = 3
+DEFAULT_THRESHOLD = 10.0
+
+# Shortest timed sample; fast operations are repeated until a sample takes this long
+SAMPLE_TIME = 0.02
+
+# Memory growth below this many KiB is noise, whatever the percentage
+MEMORY_NOISE_KIB = 64
+
+
+def _discard(text):
+    """Write callable for generators whose output is not needed."""
+
+
+def generated_json_command(size):
+    """Return a POST with a JSON body of about size bytes, identical on every run."""
+    records = []
+    length = 0
+    i = 0
+    while length < size:
+        record = json.dumps({
+            'id': i,
+            'name': f"user{i:07d}",
+            'email': f"user{i:07d}@example.com",
+            'active': i % 3 != 0,
+            'score': round(i * 0.37 % 100, 2),
+            'tags': ['alpha', 'beta', 'gamma'][:i % 4]
+        })
+        records.append(record)
+        length += len(record) + 2
+        i += 1
+    body = '{"records": [' + ', '.join(records) + ']}'
+    return (f"curl -X POST https://api.example.com/v1/import "
+            f"-H 'Content-Type: application/json' -d '{body}'")
+
+
+def load_corpus(patterns=None):
+    """Return {case name: curl command} for the corpus files and generated bodies."""
+    corpus = {}
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if name.endswith('.curl'):
+            with open(os.path.join(CORPUS_DIR, name)) as f:
+                corpus[name[:-5]] = next(split_curl_commands(f))
+    for name, size in GENERATED_JSON.items():
+        # Skip generating 10 MB bodies that the filter excludes anyway
+        if not patterns or any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            corpus[name] = generated_json_command(size)
+    if patterns:
+        corpus = {name: command for name, command in corpus.items()
+                  if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)}
+    return corpus
+
+
+def operation(op, command, output_dir):
+    """Return a zero-argument callable that performs op once for command."""
+    if op == 'parse':
+        return lambda: parse_curl_command(command)
+    if op == 'all':
+        converter = CurlToAll(output_dir=output_dir, quiet=True, use_cache=False, deterministic=True)
+        return lambda: converter.convert_curl_to_all(command)
+
+    request = parse_curl_command(command)
+    if op == 'python':
+        return lambda: CurlToPython(request).generate_python_code(_discard)
+    if op == 'csharp':
+        return lambda: CurlToCSharp(request).generate_csharp_code(_discard)
+    return lambda: CurlToHttp(request, deterministic=True).generate_http_content(_discard)
+
+
+def _time_loop(function, number):
+    """Return the seconds taken to call function number times."""
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    return time.perf_counter() - start
+
+
+def measure(function, min_time=DEFAULT_MIN_TIME, min_runs=DEFAULT_MIN_RUNS):
+    """Return (ops per second, peak KiB) for function.
+
+    Fast operations are timed in loops long enough (SAMPLE_TIME) for timer
+    resolution and call overhead not to matter. Throughput comes from the
+    fastest sample, as slower ones only measure interference from the rest
+    of the machine; peak memory from one separate run under tracemalloc,
+    which would otherwise distort timings.
+    """
+    function()
+    gc.collect()
+
+    number = 1
+    while (elapsed := _time_loop(function, number)) < SAMPLE_TIME:
+        number *= max(2, min(10, int(SAMPLE_TIME / max(elapsed, 1e-9))))
+
+    times = [elapsed / number]
+    started = time.perf_counter()
+    while len(times) < min_runs or time.perf_counter() - started < min_time:
+        times.append(_time_loop(function, number) / number)
+
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return 1 / min(times), peak / 1024
+
+
+def run(corpus, operations, min_time, min_runs):
+    """Measure every case and operation; return {'case/op': {'ops_per_sec', 'peak_kib'}}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for case, command in corpus.items():
+            for op in operations:
+                ops_per_sec, peak_kib = measure(operation(op, command, output_dir), min_time, min_runs)
+                results[f"{case}/{op}"] = {'ops_per_sec': round(ops_per_sec, 2),
+                                           'peak_kib': round(peak_kib, 1)}
+                # Output files of the 'all' runs add up quickly for the big cases
+                for name in os.listdir(output_dir):
+                    os.unlink(os.path.join(output_dir, name))
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return {'case/op': (speed change %, memory change %, regressed)} against a baseline."""
+    comparison = {}
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        speed = (result['ops_per_sec'] - base['ops_per_sec']) / base['ops_per_sec'] * 100
+        memory = ((result['peak_kib'] - base['peak_kib']) / base['peak_kib'] * 100
+                  if base['peak_kib'] else 0.0)
+        regressed = (speed < -threshold
+                     or (memory > threshold and result['peak_kib'] - base['peak_kib'] > MEMORY_NOISE_KIB))
+        comparison[key] = (speed, memory, regressed)
+    return comparison
+
+
+def print_report(results, comparison):
+    """Print one row per case and operation, with the change from the baseline if known."""
+    print(f"{'case/op':32} {'ops/sec':>12} {'ms/op':>10} {'peak KiB':>10} {'speed':>9} {'memory':>9}")
+    for key, result in results.items():
+        row = (f"{key:32} {result['ops_per_sec']:>12,.1f} {1000 / result['ops_per_sec']:>10.3f} "
+               f"{result['peak_kib']:>10,.1f}")
+        if key in comparison:
+            speed, memory, regressed = comparison[key]
+            row += f" {speed:>+8.1f}% {memory:>+8.1f}%"
+            if regressed:
+                row += "  REGRESSION"
+        print(row)
+
+
+def main():
+    """Run the benchmarks and check them against the baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the Curl2* converters against a stored baseline")
+    parser.add_argument('--case', action='append', metavar='PATTERN',
+                        help='Only run cases matching this glob (repeatable)')
+    parser.add_argument('--op', action='append', choices=OPERATIONS,
+                        help='Only run this operation (repeatable)')
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME, metavar='SECONDS',
+                        help='Minimum time to spend timing each operation (default: %(default)s)')
+    parser.add_argument('--min-runs', type=int, default=DEFAULT_MIN_RUNS,
+                        help='Minimum runs of each operation (default: %(default)s)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, metavar='PERCENT',
+                        help='Fail if an operation is this much slower or larger than the baseline '
+                             '(default: %(default)s)')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='Baseline file (default: baseline.json beside this script)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Record the results as the new baseline instead of comparing')
+    parser.add_argument('--json', metavar='FILE', help='Also write the results to FILE as JSON')
+
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.case)
+    if not corpus:
+        print("No benchmark cases match")
+        return 1
+    results = run(corpus, args.op or OPERATIONS, args.min_time, args.min_runs)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        # Keep entries for cases and operations that weren't run this time
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print_report(results, {})
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    comparison = compare(results, baseline, args.threshold)
+    print_report(results, comparison)
+
+    regressions = [key for key, (_, _, regressed) in comparison.items() if regressed]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:g}%: {', '.join(regressions)}")
+        return 1
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Cold-start budget check for the Curl2* scripts in bin/.
+
+Each entry point is run as a fresh interpreter under `python -X importtime`,
+once for --help and once converting a trivial GET, the way an editor hook
+calls it. The time spent importing modules beyond the interpreter's own
+startup is checked against a budget, and so is the list of modules loaded:
+batch, sync, watch, bundle and daemon support must stay out of these paths
+and only be imported when used.
+
+The scripts that can hand a conversion to a daemon are then timed with and
+without `Curl2All.py --serve` listening, converting without the cache. With
+the daemon they must import less than converting in-process, and must not
+load the parser or converters at all.
+
+The budgets have headroom for a slow machine; scale them with --scale
+rather than editing them when a machine is much slower or faster.
+
+Usage:
+  python bench/curl2/startup.py
+  python bench/curl2/startup.py --runs 10 --scale 1.5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BIN_DIR = os.path.join(os.path.dirname(os.path.dirname(BENCH_DIR)), 'bin')
+
+TRIVIAL_GET = 'curl https://api.example.com/users'
+
+# (script, arguments, import budget in ms)
+ENTRY_POINTS = [
+    ('Curl2Python.py', ['--help'], 20),
+    ('Curl2Python.py', [TRIVIAL_GET], 60),
+    ('Curl2CSharp.py', ['--help'], 20),
+    ('Curl2CSharp.py', [TRIVIAL_GET], 60),
+    ('Curl2Http.py', ['--help'], 20),
+    ('Curl2Http.py', [TRIVIAL_GET], 60),
+    ('Curl2All.py', ['--help'], 70),
+    ('Curl2All.py', [TRIVIAL_GET], 90),
+]
+
+# Modules that only batch, sync, watch, bundle, subprocess and daemon-serving
+# runs need; a trivial run importing one of these is a regression whatever
+# the timings say
+LAZY_MODULES = ('concurrent.futures', 'multiprocessing', 'subprocess', 'socket', 'socketserver',
+                'zipfile', 'sqlite3', 'ctypes', 'CurlBundle', 'CurlHar', 'CurlScan', 'CurlSync',
+                'CurlWatch')
+
+# Entry points that try a running daemon before converting in-process; the
+# cache is off so both sides convert rather than replaying a cached result
+DAEMON_ENTRY_POINTS = [
+    ('Curl2Python.py', [TRIVIAL_GET]),
+    ('Curl2All.py', ['--no-cache', TRIVIAL_GET]),
+]
+
+# Modules a conversion answered by the daemon must not load
+DAEMON_LAZY_MODULES = ('CurlRequest', 'Curl2Python', 'Curl2CSharp', 'Curl2Http')
+
+DAEMON_START_TIMEOUT = 10
+
+DEFAULT_RUNS = 5
+
+
+def isolated_env(tmp_dir):
+    """Return an environment that keeps runs out of the real cache and away from a running daemon."""
+    env = dict(os.environ, TMPDIR=tmp_dir, XDG_CACHE_HOME=tmp_dir,
+               CURL2ALL_SOCKET=os.path.join(tmp_dir, 'no-daemon.sock'))
+    env.pop('CURL2_PROFILE', None)
+    return env
+
+
+def parse_importtime(stderr):
+    """Return {top-level module: cumulative microseconds} from -X importtime output."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            # The header line
+            continue
+        # Nested imports are indented below the module that imported them
+        if name.startswith('  '):
+            imports.setdefault(name.strip(), None)
+        else:
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def run_importtime(args, env):
+    """Run python -X importtime with args; return ({module: cumulative us or None}, wall seconds)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', *args], cwd=env['TMPDIR'],
+                            env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {result.returncode}:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), elapsed
+
+
+def measure(script, arguments, env, runs, startup_modules):
+    """Return (best import ms, best wall ms, modules imported) for one entry point."""
+    best_import = best_wall = float('inf')
+    modules = set()
+    for _ in range(runs):
+        imports, elapsed = run_importtime([os.path.join(BIN_DIR, script), *arguments], env)
+        total = sum(cumulative for name, cumulative in imports.items()
+                    if cumulative is not None and name not in startup_modules)
+        best_import = min(best_import, total / 1000)
+        best_wall = min(best_wall, elapsed * 1000)
+        modules.update(imports)
+    return best_import, best_wall, modules
+
+
+def eager_modules(modules, lazy_modules=LAZY_MODULES):
+    """Return the lazy_modules (or their submodules) found in modules."""
+    return sorted({lazy for lazy in lazy_modules for name in modules
+                   if name == lazy or name.startswith(lazy + '.')})
+
+
+@contextmanager
+def running_daemon(env):
+    """Run Curl2All.py --serve on env's CURL2ALL_SOCKET for the duration of the block."""
+    process = subprocess.Popen([sys.executable, os.path.join(BIN_DIR, 'Curl2All.py'), '--serve'],
+                               cwd=env['TMPDIR'], env=env, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + DAEMON_START_TIMEOUT
+        while not os.path.exists(env['CURL2ALL_SOCKET']):
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("Curl2All.py --serve did not start listening")
+            time.sleep(0.05)
+        yield
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    """Check every entry point against its budget."""
+    parser = argparse.ArgumentParser(description="Check the Curl2* scripts' cold-start import budgets")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS,
+                        help='Runs of each entry point; the fastest counts (default: %(default)s)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply every budget by this factor (default: %(default)s)')
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = isolated_env(tmp_dir)
+        startup_modules = set(run_importtime(['-c', 'pass'], env)[0])
+
+        print(f"{'entry point':44} {'imports ms':>10} {'budget':>8} {'wall ms':>9}")
+        for script, arguments, budget in ENTRY_POINTS:
+            label = f"{script} {'--help' if arguments == ['--help'] else 'GET'}"
+            import_ms, wall_ms, modules = measure(script, arguments, env, args.runs, startup_modules)
+            budget *= args.scale
+            row = f"{label:44} {import_ms:>10.1f} {budget:>8.0f} {wall_ms:>9.1f}"
+            if import_ms > budget:
+                row += "  OVER BUDGET"
+                failures.append(f"{label}: {import_ms:.1f} ms of imports, budget {budget:.0f} ms")
+            # site may already load some of them, e.g. for .pth files
+            eager = eager_modules(modules - startup_modules)
+            if eager:
+                row += f"  imports {', '.join(eager)}"
+                failures.append(f"{label}: imports {', '.join(eager)}")
+            print(row)
+
+        in_process = {}
+        for script, arguments in DAEMON_ENTRY_POINTS:
+            in_process[script] = measure(script, arguments, env, args.runs, startup_modules)[:2]
+
+        daemon_env = dict(env, CURL2ALL_SOCKET=os.path.join(tmp_dir, 'daemon.sock'))
+        print(f"\n{'uncached GET, in-process -> daemon':34} {'imports ms':>19} {'wall ms':>19}")
+        with running_daemon(daemon_env):
+            for script, arguments in DAEMON_ENTRY_POINTS:
+                import_ms, wall_ms, modules = measure(script, arguments, daemon_env, args.runs,
+                                                      startup_modules)
+                local_import_ms, local_wall_ms = in_process[script]
+                label = f"{script} GET"
+                row = (f"{label:34} {local_import_ms:>9.1f} -> {import_ms:>6.1f} "
+                       f"{local_wall_ms:>9.1f} -> {wall_ms:>6.1f}")
+                if import_ms >= local_import_ms:
+                    row += "  NO FASTER"
+                    failures.append(f"{label}: {import_ms:.1f} ms of imports with a daemon, "
+                                    f"{local_import_ms:.1f} ms without")
+                eager = eager_modules(modules - startup_modules, DAEMON_LAZY_MODULES)
+                if eager:
+                    row += f"  imports {', '.join(eager)}"
+                    failures.append(f"{label} with a daemon: imports {', '.join(eager)}")
+                print(row)
+
+    if failures:
+        print("\nCold-start budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,74 +11,199 @@ It can be used in several ways:
 3. Asking user for input: `python Curl2All.py` and then entering the cURL command
 
 Files will be generated with the format:
-{sortable_timestamp}_{request_verb}_{request_url}.{file_extension}
+{sortable_timestamp}_{request_verb}_{request_url}_{content_hash}.{file_extension}
 """
 
 import sys
+import io
 import os
 import re
+import time
+import shutil
+import hashlib
 import argparse
-import shlex
-import subprocess
+import importlib
+import itertools
+import threading
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from urllib.parse import urlparse
 import tempfile
 
+# Only what a single conversion needs is imported here. Batch, sync, watch,
+# HAR, scan, bundle and daemon support are imported by the code paths that
+# use them, so editor hooks calling this script per request start quickly.
+# The parser is imported on first use too, so a conversion answered by a
+# running daemon never loads it
+from CurlCache import DEFAULT_MAX_BYTES, ConversionCache, converter_version
+from CurlDaemon import default_socket_path, reads_local_input, send_request
+from CurlTimings import Timings, profile_mode, run_profiled
+
+# Hex digits of content hash in each filename; fan-out directories use
+# two of them per level
+DIGEST_LENGTH = 8
+MAX_FANOUT = 3
+
+# Temporary files are created private; finished files get the usual mode,
+# worked out from the umask on first use
+_umask = None
+_umask_lock = threading.Lock()
+
+
+def _file_mode():
+    """Return the mode a file created with open() gets under this process's umask."""
+    global _umask
+    if _umask is None:
+        with _umask_lock:
+            if _umask is None:
+                _umask = _read_umask()
+    return 0o666 & ~_umask
+
+
+def _read_umask():
+    """Return the process umask, without changing it where the kernel reports it."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    # os.umask can only be read by setting it; main() calls _file_mode()
+    # before any threads start, so nothing else sees the brief change
+    umask = os.umask(0o077)
+    os.umask(umask)
+    return umask
+
+
+@contextmanager
+def atomic_output(output_file):
+    """Yield a temporary path beside output_file that replaces it when the block succeeds.
+
+    Readers, and other Curl2All runs writing to the same directory, only
+    ever see complete files.
+    """
+    # Keeping the extension lets converter scripts recognise the file type
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix=os.path.splitext(output_file)[1],
+                                    dir=os.path.dirname(output_file))
+    try:
+        os.fchmod(fd, _file_mode())
+        os.close(fd)
+        yield tmp_path
+        os.replace(tmp_path, output_file)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
 
 class CurlToAll:
-    def __init__(self, output_dir="."):
+    def __init__(self, output_dir=".", in_process=True, quiet=False, pretty_json=True,
+                 deterministic=False, use_cache=False, cache_dir=None, fanout=0, bundle=None,
+                 timings=False):
         self.output_dir = os.path.abspath(output_dir)
+        # With a bundle, generated files are collected in self.artifacts as
+        # (name, method, url, timestamp, format, content) for the caller to
+        # store, instead of being written to output_dir
+        self.bundle = bundle
+        self.artifacts = []
+        self._index = None
+        # Levels of hash-prefix subdirectories, so huge batches don't end up
+        # in one flat directory
+        self.fanout = min(fanout, MAX_FANOUT)
+        self._directories = set()
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.in_process = in_process
+        self.quiet = quiet
+        self.pretty_json = pretty_json
+        # Cached output is replayed on later runs, so it must not embed
+        # anything specific to the run that generated it
+        self.deterministic = deterministic or use_cache
+        self.cache = ConversionCache(cache_dir) if use_cache else None
+        self.cache_hit = False
+        self.timings = Timings() if timings else None
+        self.results = {}
         self.converters = {
             'Python': ('Curl2Python.py', '.py'),
             'C#': ('Curl2CSharp.py', '.cs'),
             'HTTP': ('Curl2Http.py', '.http')
         }
+        # Converter class and generator method for each script, used when
+        # running in-process instead of spawning a new interpreter
+        self.generators = {
+            'Curl2Python.py': ('CurlToPython', 'generate_python_code'),
+            'Curl2CSharp.py': ('CurlToCSharp', 'generate_csharp_code'),
+            'Curl2Http.py': ('CurlToHttp', 'generate_http_content')
+        }
+        self._loaded = {}
     
-    def extract_http_method(self, curl_command):
-        """Extract HTTP method from curl command."""
-        method = 'GET'
-        
-        # Look for -X or --request flag
-        if re.search(r'-X\s+([A-Z]+)', curl_command):
-            match = re.search(r'-X\s+([A-Z]+)', curl_command)
-            method = match.group(1)
-        elif re.search(r'--request\s+([A-Z]+)', curl_command):
-            match = re.search(r'--request\s+([A-Z]+)', curl_command)
-            method = match.group(1)
-        elif re.search(r'(-d|--data|--data-raw|--data-binary)', curl_command):
-            # If data is present but no method specified, assume POST
-            method = 'POST'
-        
-        return method
-    
-    def extract_url(self, curl_command):
-        """Extract and clean URL from curl command."""
-        # Look for URL (http:// or https://)
-        url_match = re.search(r'(https?://[^\s\'\"]+)', curl_command)
-        if url_match:
-            url = url_match.group(1)
-            # Parse URL to get clean domain and path
-            parsed = urlparse(url)
-            # Remove query parameters and fragments for filename
-            clean_url = f"{parsed.netloc}{parsed.path}"
-            # Replace special characters for filename
-            clean_url = re.sub(r'[^a-zA-Z0-9._-]', '_', clean_url)
-            return clean_url
-        else:
+    def log(self, message):
+        """Print a progress message unless running quietly."""
+        if not self.quiet:
+            print(message)
+    
+    def filename_url(self, request):
+        """Clean the request URL for use in a filename."""
+        if not request.url:
             return "unknown_url"
+        
+        # Remove query parameters and fragments for filename
+        parsed = urlparse(request.url)
+        clean_url = f"{parsed.netloc}{parsed.path}" or request.url
+        # Replace special characters for filename
+        return re.sub(r'[^a-zA-Z0-9._-]', '_', clean_url)
     
     def generate_timestamp(self):
         """Generate sortable timestamp."""
         return datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    def generate_base_filename(self, curl_command):
-        """Generate base filename from curl command."""
+    def command_digest(self, curl_command):
+        """Return a short content hash of a curl command."""
+        return hashlib.sha256(curl_command.encode('utf-8', errors='surrogatepass')).hexdigest()[:DIGEST_LENGTH]
+    
+    def request_digest(self, request):
+        """Return a short content hash of a parsed request that has no command text."""
+        digest = hashlib.sha256()
+        for part in (request.method, request.url, request.headers, request.params, request.form,
+                     request.files, request.cookies, request.auth, request.body_file):
+            digest.update(repr(part).encode('utf-8', errors='surrogatepass'))
+            digest.update(b'\0')
+        if request.body is not None:
+            digest.update(request.body.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()[:DIGEST_LENGTH]
+    
+    def generate_base_filename(self, request, digest, sequence=None):
+        """Generate base filename from the parsed request."""
+        return self.format_base_filename(request.method, self.filename_url(request), digest, sequence)
+    
+    def format_base_filename(self, method, url, digest, sequence=None):
+        """Generate base filename from a method, a filename-safe URL and a content hash.
+
+        The content hash keeps names from different commands apart even when
+        they share a timestamp, method and URL, including across concurrent
+        runs writing to the same directory.
+        """
         timestamp = self.generate_timestamp()
-        method = self.extract_http_method(curl_command)
-        url = self.extract_url(curl_command)
         
-        return f"{timestamp}_{method}_{url}"
+        if sequence is not None:
+            # Batch runs convert many commands per second; keep names ordered
+            return f"{timestamp}_{sequence:06d}_{method}_{url}_{digest}"
+        return f"{timestamp}_{method}_{url}_{digest}"
+    
+    def output_path(self, base_filename, extension, digest):
+        """Return where an output file goes, under hash-prefix directories if fanning out.
+
+        For a bundle this is the member name, relative to the bundle root.
+        """
+        prefixes = [digest[2 * level:2 * level + 2] for level in range(self.fanout)]
+        if self.bundle:
+            return '/'.join(prefixes + [f"{base_filename}{extension}"])
+        
+        directory = os.path.join(self.output_dir, *prefixes)
+        if directory not in self._directories:
+            os.makedirs(directory, exist_ok=True)
+            self._directories.add(directory)
+        return os.path.join(directory, f"{base_filename}{extension}")
     
     def check_converter_scripts(self):
         """Check if all required converter scripts exist and are executable."""
@@ -89,68 +214,231 @@ class CurlToAll:
             if not os.path.isfile(script_path):
                 missing_scripts.append(script_name)
             elif not os.access(script_path, os.X_OK):
-                print(f"Warning: {script_name} is not executable. Making it executable...")
+                self.log(f"Warning: {script_name} is not executable. Making it executable...")
                 os.chmod(script_path, 0o755)
         
         if missing_scripts:
-            print(f"Error: Missing required scripts in {self.script_dir}:")
+            self.log(f"Error: Missing required scripts in {self.script_dir}:")
             for script in missing_scripts:
-                print(f"  - {script}")
+                self.log(f"  - {script}")
             return False
         
         return True
     
     def ensure_output_directory(self):
         """Create output directory if it doesn't exist."""
-        if not os.path.exists(self.output_dir):
-            print(f"Creating output directory: {self.output_dir}")
+        if not self.bundle and not os.path.exists(self.output_dir):
+            self.log(f"Creating output directory: {self.output_dir}")
             os.makedirs(self.output_dir, exist_ok=True)
     
-    def run_converter(self, name, script_name, output_file, curl_command):
-        """Run a single converter script."""
+    def load_converter(self, script_name):
+        """Import a converter script and return its class and generator method name."""
+        if script_name not in self._loaded:
+            if self.script_dir not in sys.path:
+                sys.path.insert(0, self.script_dir)
+            module = importlib.import_module(os.path.splitext(script_name)[0])
+            class_name, method_name = self.generators[script_name]
+            self._loaded[script_name] = (getattr(module, class_name), method_name)
+        return self._loaded[script_name]
+    
+    def run_converter_in_process(self, name, script_name, output_file, request):
+        """Run a single converter in this interpreter on an already parsed request."""
+        try:
+            self.log(f"Generating {name} code...")
+            
+            converter_class, method_name = self.load_converter(script_name)
+            converter = converter_class(request, pretty_json=self.pretty_json,
+                                        deterministic=self.deterministic)
+            if self.timings:
+                # Generate into memory first so generating and writing are timed apart
+                buffer = io.StringIO()
+                getattr(converter, method_name)(buffer)
+                self.timings.mark('generate')
+                if self.bundle:
+                    self.add_artifact(output_file, buffer.getvalue())
+                else:
+                    with atomic_output(output_file) as tmp_path, open(tmp_path, 'w') as f:
+                        f.write(buffer.getvalue())
+                self.timings.mark('write')
+            elif self.bundle:
+                buffer = io.StringIO()
+                getattr(converter, method_name)(buffer)
+                self.add_artifact(output_file, buffer.getvalue())
+            else:
+                # Generators stream straight into a temporary file that is
+                # renamed into place once complete
+                with atomic_output(output_file) as tmp_path, open(tmp_path, 'w') as f:
+                    getattr(converter, method_name)(f)
+            
+            self.log(f"✓ {name}: {output_file}")
+            return True
+            
+        except Exception as e:
+            self.log(f"✗ Failed to generate {name} code: {str(e)}")
+            return False
+    
+    def start_artifacts(self, method, url):
+        """Reset the collected bundle files and set the index fields for the next ones."""
+        self.artifacts = []
+        self._index = (method, url, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    
+    def add_artifact(self, name, content):
+        """Collect one generated file for the bundle."""
+        self.artifacts.append((name, *self._index, os.path.splitext(name)[1][1:], content))
+    
+    def run_converter(self, name, script_name, output_file, curl_command, request):
+        """Run a single converter, in-process unless the subprocess fallback was requested."""
+        if self.in_process:
+            return self.run_converter_in_process(name, script_name, output_file, request)
+        return self.run_converter_subprocess(name, script_name, output_file, curl_command)
+    
+    def run_converter_subprocess(self, name, script_name, output_file, curl_command):
+        """Run a single converter script in a child interpreter."""
+        import subprocess
         script_path = os.path.join(self.script_dir, script_name)
         
         try:
-            print(f"Generating {name} code...")
+            self.log(f"Generating {name} code...")
             
             # Run the converter script
-            result = subprocess.run([
-                'python', script_path, 
-                '--output', output_file,
-                curl_command
-            ], capture_output=True, text=True, check=True)
+            options = [] if self.pretty_json else ['--no-pretty']
+            if self.deterministic and script_name == 'Curl2Http.py':
+                options.append('--deterministic')
+            with atomic_output(output_file) as tmp_path:
+                result = subprocess.run([
+                    sys.executable, script_path, 
+                    '--output', tmp_path,
+                    *options,
+                    curl_command
+                ], capture_output=True, text=True, check=True)
             
-            print(f"✓ {name}: {output_file}")
+            self.log(f"✓ {name}: {output_file}")
             return True
             
         except subprocess.CalledProcessError as e:
-            print(f"✗ Failed to generate {name} code")
+            self.log(f"✗ Failed to generate {name} code")
             if e.stderr:
-                print(f"Error: {e.stderr.strip()}")
+                self.log(f"Error: {e.stderr.strip()}")
             return False
         except Exception as e:
-            print(f"✗ Failed to generate {name} code: {str(e)}")
+            self.log(f"✗ Failed to generate {name} code: {str(e)}")
             return False
     
-    def convert_curl_to_all(self, curl_command):
+    def restore_cached(self, meta, cached_files, digest, sequence=None):
+        """Copy a cached conversion into the output directory."""
+        if meta.get('warning'):
+            self.log(meta['warning'])
+        
+        base_filename = self.format_base_filename(meta['method'], meta['url'], digest, sequence)
+        self.log("Using cached conversion...")
+        self.log(f"Base filename: {base_filename}")
+        self.log("")
+        
+        self.start_artifacts(meta['method'], meta.get('request_url', meta['url']))
+        for name, (script_name, extension) in self.converters.items():
+            try:
+                output_file = self.output_path(base_filename, extension, digest)
+                if self.bundle:
+                    with open(cached_files[extension]) as f:
+                        self.add_artifact(output_file, f.read())
+                else:
+                    with atomic_output(output_file) as tmp_path:
+                        shutil.copyfile(cached_files[extension], tmp_path)
+            except (OSError, KeyError) as e:
+                self.log(f"✗ Failed to restore cached {name} code: {str(e)}")
+                continue
+            self.results[name] = output_file
+            self.log(f"✓ {name}: {output_file}")
+        
+        if self.timings:
+            self.timings.mark('write')
+            self.timings.count += 1
+        return all(self.results.values())
+    
+    def save_cache_stats(self, hits, misses, max_bytes=DEFAULT_MAX_BYTES):
+        """Trim the cache to max_bytes and record this run's hits and misses."""
+        if not self.cache:
+            return
+        self.cache.max_bytes = max_bytes
+        try:
+            evictions = self.cache.trim()
+            self.cache.record_run(hits, misses, evictions)
+        except OSError as e:
+            self.log(f"Warning: could not update conversion cache: {e}")
+    
+    def convert_curl_to_all(self, curl_command, sequence=None):
         """Convert curl command to all formats."""
+        self.results = {name: None for name in self.converters}
+        self.cache_hit = False
+        
         if not curl_command.strip():
-            print("Error: No curl command provided")
+            self.log("Error: No curl command provided")
             return False
         
-        # Check if converter scripts exist
-        if not self.check_converter_scripts():
+        if self.timings:
+            self.timings.start()
+        digest = self.command_digest(curl_command)
+        
+        # A cache hit skips parsing and generation entirely
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.key(curl_command, {'pretty_json': self.pretty_json})
+            cached = self.cache.get(cache_key)
+            if self.timings:
+                self.timings.mark('cache')
+            if cached:
+                self.ensure_output_directory()
+                self.cache_hit = True
+                return self.restore_cached(*cached, digest, sequence)
+        
+        # Check if converter scripts exist (the in-process loader reports its own errors)
+        if not self.in_process and not self.check_converter_scripts():
+            return False
+        
+        # Parse once; every in-process generator reads the same request model
+        from CurlRequest import parse_curl_command
+        try:
+            request = parse_curl_command(curl_command, self.timings)
+        except ValueError as e:
+            self.log(f"Error parsing curl command: {e}")
+            return False
+        
+        return self.convert_request(request, sequence, curl_command, cache_key, digest)
+    
+    def convert_request(self, request, sequence=None, curl_command=None, cache_key=None, digest=None):
+        """Convert an already parsed request to all formats.
+        
+        curl_command is only needed by the subprocess fallback, which hands
+        the original command to each converter script. digest is the content
+        hash used in filenames, computed from the request if not given.
+        """
+        self.results = {name: None for name in self.converters}
+        self.cache_hit = False
+        if not self.in_process and curl_command is None:
+            self.log("Error: requests without a cURL command can only be converted in-process")
+            return False
+        if not self.in_process and self.bundle:
+            self.log("Error: bundles can only be written by in-process conversion")
             return False
+        if self.timings:
+            self.timings.start()
+            self.timings.count += 1
         
         # Ensure output directory exists
         self.ensure_output_directory()
         
+        warning = request.unhandled_warning()
+        if warning:
+            self.log(warning)
+        
         # Generate base filename
-        base_filename = self.generate_base_filename(curl_command)
+        digest = digest or self.request_digest(request)
+        base_filename = self.generate_base_filename(request, digest, sequence)
         
-        print("Processing cURL command...")
-        print(f"Base filename: {base_filename}")
-        print("")
+        self.log("Processing cURL command...")
+        self.log(f"Base filename: {base_filename}")
+        self.log("")
+        self.start_artifacts(request.method, request.url)
         
         # Convert to all formats
         success_count = 0
@@ -158,32 +446,528 @@ class CurlToAll:
         generated_files = {}
         
         for name, (script_name, extension) in self.converters.items():
-            output_file = os.path.join(self.output_dir, f"{base_filename}{extension}")
+            output_file = self.output_path(base_filename, extension, digest)
             
-            if self.run_converter(name, script_name, output_file, curl_command):
+            if self.run_converter(name, script_name, output_file, curl_command, request):
                 success_count += 1
                 generated_files[name] = output_file
+                self.results[name] = output_file
         
         # Summary
-        print("")
-        print("Summary:")
-        print(f"Successfully generated {success_count} out of {total_count} files")
+        self.log("")
+        self.log("Summary:")
+        self.log(f"Successfully generated {success_count} out of {total_count} files")
         
         if success_count == total_count:
-            print("All conversions completed successfully!")
-            print("")
-            print("Generated files:")
+            # Output built from @file or stdin data would go stale with the file
+            if cache_key and not request.local_input:
+                meta = {
+                    'method': request.method,
+                    'url': self.filename_url(request),
+                    'request_url': request.url,
+                    'warning': warning
+                }
+                if self.bundle:
+                    self.cache.put_contents(cache_key, meta, {f".{artifact[4]}": artifact[5]
+                                                              for artifact in self.artifacts})
+                else:
+                    self.cache.put(cache_key, meta, {os.path.splitext(path)[1]: path
+                                                     for path in generated_files.values()})
+            self.log("All conversions completed successfully!")
+            self.log("")
+            self.log("Generated files:")
             for name, file_path in generated_files.items():
-                print(f"  {name:8}: {file_path}")
+                self.log(f"  {name:8}: {file_path}")
             return True
         else:
-            print("Some conversions failed. Check the errors above.")
+            self.log("Some conversions failed. Check the errors above.")
             if generated_files:
-                print("")
-                print("Successfully generated files:")
+                self.log("")
+                self.log("Successfully generated files:")
                 for name, file_path in generated_files.items():
-                    print(f"  {name:8}: {file_path}")
+                    self.log(f"  {name:8}: {file_path}")
+            return False
+
+
+def benchmark_modes(curl_command, runs):
+    """Time in-process conversion against the subprocess fallback."""
+    results = {}
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, in_process in [('subprocess', False), ('in-process', True)]:
+            converter = CurlToAll(output_dir=tmp_dir, in_process=in_process, quiet=True)
+            # Warm-up run so imports are not counted against the in-process mode
+            converter.convert_curl_to_all(curl_command)
+            
+            start = time.perf_counter()
+            for _ in range(runs):
+                converter.convert_curl_to_all(curl_command)
+            results[label] = (time.perf_counter() - start) / runs
+    
+    print(f"Benchmark over {runs} run(s) per mode:")
+    for label, seconds in results.items():
+        print(f"  {label:10}: {seconds * 1000:10.3f} ms per command")
+    if results['in-process'] > 0:
+        print(f"  speedup   : {results['subprocess'] / results['in-process']:10.1f}x")
+    
+    return results
+
+
+_batch_converter = None
+
+
+def _init_batch_worker(options):
+    """Create one converter per worker process so imports are only paid once."""
+    global _batch_converter
+    _batch_converter = CurlToAll(quiet=True, **options)
+
+
+def _convert_batch_item(item):
+    """Convert one (sequence, curl command or CurlRequest) pair inside a worker process."""
+    sequence, source = item
+    _batch_converter.artifacts = []
+    if isinstance(source, str):
+        _batch_converter.convert_curl_to_all(source, sequence)
+    else:
+        _batch_converter.convert_request(source, sequence)
+    timings = _batch_converter.timings.take() if _batch_converter.timings else None
+    stored_bytes = 0
+    if _batch_converter.cache:
+        # The parent process keeps the cache's size total for the whole batch
+        stored_bytes = _batch_converter.cache.stored_bytes
+        _batch_converter.cache.stored_bytes = 0
+    return (sequence, dict(_batch_converter.results), _batch_converter.cache_hit,
+            _batch_converter.artifacts, timings, stored_bytes)
+
+
+def _convert_batch_chunk(items):
+    """Convert a list of batch items inside a worker process."""
+    return [_convert_batch_item(item) for item in items]
+
+
+def _map_bounded(executor, items, chunksize, window):
+    """Convert items on the pool in order, keeping at most window chunks in flight.
+
+    Unlike Executor.map this pulls items from the iterator only as workers
+    catch up, so a streamed input is never held in memory all at once.
+    """
+    pending = deque()
+    items = iter(items)
+    while chunk := list(itertools.islice(items, chunksize)):
+        pending.append(executor.submit(_convert_batch_chunk, chunk))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def _timed_items(items, timings):
+    """Yield from items, charging the time spent producing each one to the read phase."""
+    items = iter(items)
+    while True:
+        timings.start()
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        timings.mark('read')
+        yield item
+
+
+def read_batch_commands(batch_file):
+    """Yield curl commands from a batch file, or from stdin for '-'."""
+    from CurlRequest import split_curl_commands
+    if batch_file == '-':
+        yield from split_curl_commands(sys.stdin)
+    else:
+        with open(batch_file) as f:
+            yield from split_curl_commands(f)
+
+
+def scan_files(paths):
+    """Yield the curl commands found in each history or log file in turn."""
+    from CurlScan import scan_curl_commands
+    for path in paths:
+        yield from scan_curl_commands(os.path.expanduser(path))
+
+
+def convert_batch(commands, workers=None, cache_max_bytes=DEFAULT_MAX_BYTES, **options):
+    """Convert many curl commands across a process pool and print a per-format tally.
+
+    commands may be any iterable of curl command strings or parsed
+    CurlRequests; it is consumed lazily. Keyword options are passed on to
+    CurlToAll in every worker. With a bundle option, workers send the
+    generated files back and only this process writes the bundle.
+    """
+    total = len(commands) if hasattr(commands, '__len__') else None
+    workers = max(1, workers or os.cpu_count() or 1)
+    if profile_mode():
+        # The profiler only sees this process
+        workers = 1
+    if total is not None:
+        workers = max(1, min(workers, total))
+    converter = CurlToAll(quiet=True, **options)
+    converter.ensure_output_directory()
+    bundle = None
+    if converter.bundle:
+        from CurlBundle import BundleError, open_bundle
+        try:
+            bundle = open_bundle(converter.bundle, 'a')
+        except BundleError as e:
+            print(f"Error: {e}")
             return False
+    timings = converter.timings
+    if timings:
+        commands = _timed_items(commands, timings)
+    
+    tally = {name: [0, 0] for name in converter.converters}
+    failed = []
+    hits = 0
+    done = 0
+    items = enumerate(commands, 1)
+    start = time.perf_counter()
+    
+    if workers == 1:
+        _init_batch_worker(options)
+        results = map(_convert_batch_item, items)
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(options,)
+        )
+        # Hand out work in chunks so IPC overhead stays small per command
+        chunksize = max(1, min(64, total // (workers * 4))) if total else 16
+        results = _map_bounded(executor, items, chunksize, workers * 2)
+    
+    progress_total = f"/{total}" if total else ""
+    try:
+        for done, (sequence, files, cache_hit, artifacts, item_timings, stored_bytes) in enumerate(results, 1):
+            hits += cache_hit
+            if converter.cache:
+                converter.cache.stored_bytes += stored_bytes
+            if timings:
+                timings.merge(*item_timings)
+                timings.start()
+            for artifact in artifacts:
+                bundle.add(*artifact)
+            if artifacts and timings:
+                timings.mark('write')
+            for name, output_file in files.items():
+                tally[name][0 if output_file else 1] += 1
+            if not all(files.values()):
+                failed.append(sequence)
+            if done == total or done % 100 == 0:
+                print(f"\rConverted {done}{progress_total} commands", end="", file=sys.stderr, flush=True)
+    finally:
+        if executor:
+            executor.shutdown()
+        if bundle:
+            bundle.close()
+    
+    if not done:
+        print("Error: No curl commands found in batch input")
+        return False
+    if done != total:
+        print(f"\rConverted {done} commands", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    total = done
+    converter.save_cache_stats(hits, total - hits, cache_max_bytes)
+    
+    elapsed = time.perf_counter() - start
+    print("Summary:")
+    print(f"Converted {total} command(s) with {workers} worker(s) in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} commands/s)")
+    if converter.cache:
+        print(f"  cache   : {hits} hit(s), {total - hits} miss(es)")
+    for name, (succeeded, failures) in tally.items():
+        print(f"  {name:8}: {succeeded} succeeded, {failures} failed")
+    if timings:
+        timings.report('Curl2All')
+    
+    if failed:
+        shown = ", ".join(f"#{sequence}" for sequence in failed[:20])
+        more = f" and {len(failed) - 20} more" if len(failed) > 20 else ""
+        print(f"Failed commands: {shown}{more}")
+        return False
+    
+    destination = os.path.abspath(converter.bundle) if converter.bundle else converter.output_dir
+    print(f"All conversions completed successfully! Files written to {destination}")
+    return True
+
+
+# Converter module, class and generator method for each convert() target
+CONVERT_TARGETS = {
+    'python': ('Curl2Python', 'CurlToPython', 'generate_python_code'),
+    'csharp': ('Curl2CSharp', 'CurlToCSharp', 'generate_csharp_code'),
+    'http': ('Curl2Http', 'CurlToHttp', 'generate_http_content')
+}
+
+
+def generate(request, targets=tuple(CONVERT_TARGETS), pretty_json=True, deterministic=False, name=None):
+    """Generate code for an already parsed CurlRequest and return {target: code}.
+
+    Raises ValueError for a target that isn't in CONVERT_TARGETS. name
+    replaces the default .http request title.
+    """
+    unknown = [target for target in targets if target not in CONVERT_TARGETS]
+    if unknown:
+        raise ValueError(f"Unknown target(s): {', '.join(unknown)}")
+    
+    results = {}
+    for target in targets:
+        module_name, class_name, method_name = CONVERT_TARGETS[target]
+        # import_module takes the import lock, so first use from several
+        # threads is safe; afterwards it is a sys.modules lookup
+        converter_class = getattr(importlib.import_module(module_name), class_name)
+        converter = converter_class(request, pretty_json=pretty_json, deterministic=deterministic)
+        if target == 'http':
+            results[target] = getattr(converter, method_name)(None, name)
+        else:
+            results[target] = getattr(converter, method_name)(None)
+    return results
+
+
+def convert(curl_command, targets=tuple(CONVERT_TARGETS), pretty_json=True, deterministic=False, name=None,
+            read_files=True):
+    """Convert a cURL command and return {target: code}.
+
+    Nothing is printed or written and every call builds its own request and
+    converters, so this is safe to call concurrently from a thread pool.
+    Raises CurlParseError (a ValueError) for a command that can't be
+    parsed or has no URL; see generate for the other arguments.
+
+    Pass read_files=False when the command comes from someone else: @file
+    bodies are then left for the generated code to open instead of being
+    read and inlined, and stdin is never read.
+    """
+    from CurlRequest import CurlMissingUrlError, parse_curl_command
+    request = parse_curl_command(curl_command, read_files=read_files)
+    if not request.url:
+        raise CurlMissingUrlError("No URL found in curl command")
+    return generate(request, targets, pretty_json, deterministic, name)
+
+
+# File extension written by sync_directory for each convert() target
+TARGET_EXTENSIONS = {'python': '.py', 'csharp': '.cs', 'http': '.http'}
+
+
+def _sync_item(item):
+    """Convert one .curl file for sync_directory; returns (digest, outputs, error)."""
+    from CurlRequest import split_curl_commands
+    source_dir, output_dir, relative, pretty_json = item
+    try:
+        with open(os.path.join(source_dir, relative), 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return None, [], str(e)
+    # Hash what is actually converted, in case the file changed since it was planned
+    digest = hashlib.sha256(data).hexdigest()
+    
+    try:
+        # A .curl file holds one command, possibly with comments around it
+        curl_command = next(split_curl_commands(data.decode('utf-8').splitlines()), None)
+        if curl_command is None:
+            return digest, [], "No curl command found"
+        results = convert(curl_command, pretty_json=pretty_json, deterministic=True)
+    except ValueError as e:
+        return digest, [], str(e)
+    
+    outputs = []
+    stem = os.path.splitext(relative)[0]
+    os.makedirs(os.path.join(output_dir, os.path.dirname(relative)), exist_ok=True)
+    for target, code in results.items():
+        output = stem + TARGET_EXTENSIONS[target]
+        with atomic_output(os.path.join(output_dir, output)) as tmp_path, open(tmp_path, 'w') as f:
+            f.write(code)
+        outputs.append(output)
+    return digest, outputs, None
+
+
+def sync_directory(source_dir, output_dir, workers=None, pretty_json=True, quiet=False):
+    """Regenerate the outputs of every changed .curl file under source_dir.
+
+    Unchanged inputs are skipped using the manifest in output_dir, outputs
+    of deleted inputs are removed, and everything is regenerated when the
+    converters or options change. Returns True if every input converted.
+    """
+    from CurlSync import SyncManifest, find_inputs, find_outputs
+    start = time.perf_counter()
+    source_dir = os.path.abspath(source_dir)
+    output_dir = os.path.abspath(output_dir)
+    manifest = SyncManifest(output_dir, converter_version(), {'pretty_json': pretty_json}).load()
+    
+    inputs = find_inputs(source_dir)
+    changed, unchanged, removed = manifest.plan(source_dir, inputs, find_outputs(output_dir))
+    
+    deleted = 0
+    for relative in removed:
+        deleted += manifest.remove_outputs(manifest.forget(relative))
+    
+    items = [(source_dir, output_dir, relative, pretty_json) for relative in changed]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(items)))
+    if workers == 1:
+        results = map(_sync_item, items)
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_sync_item, items, chunksize=max(1, min(64, len(items) // (workers * 4))))
+    
+    converted = 0
+    try:
+        for relative, (digest, outputs, error) in zip(changed, results):
+            deleted += manifest.remove_outputs(manifest.record(relative, *inputs[relative],
+                                                               digest, outputs, error))
+            converted += not error
+    finally:
+        if executor:
+            executor.shutdown()
+        # Keep whatever was converted, even if interrupted part way
+        manifest.save()
+    
+    # Includes unchanged inputs that failed on an earlier run
+    failed = manifest.errors()
+    if not quiet:
+        elapsed = time.perf_counter() - start
+        print(f"Synced {len(inputs)} input(s) in {elapsed:.2f}s: {converted} converted, "
+              f"{unchanged} unchanged, {len(removed)} removed, {deleted} output(s) deleted")
+        for relative, error in failed:
+            print(f"✗ {relative}: {error}")
+    return not failed
+
+
+def sync_paths(manifest, source_dir, output_dir, relatives, pretty_json=True):
+    """Bring the outputs of just the given inputs up to date, in this process."""
+    from CurlSync import file_digest
+    for relative in sorted(relatives):
+        start = time.perf_counter()
+        source_path = os.path.join(source_dir, relative)
+        try:
+            stat = os.stat(source_path)
+        except FileNotFoundError:
+            if relative in manifest.inputs:
+                deleted = manifest.remove_outputs(manifest.forget(relative))
+                print(f"- {relative}: removed {deleted} output(s)")
+            continue
+        
+        entry = manifest.inputs.get(relative)
+        if entry and (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+            continue
+        if entry and not entry.get('error') and entry['digest'] == file_digest(source_path):
+            # Saved without changes
+            manifest.record(relative, stat.st_mtime_ns, stat.st_size, entry['digest'], entry['outputs'])
+            continue
+        
+        digest, outputs, error = _sync_item((source_dir, output_dir, relative, pretty_json))
+        manifest.remove_outputs(manifest.record(relative, stat.st_mtime_ns, stat.st_size,
+                                                digest, outputs, error))
+        elapsed = (time.perf_counter() - start) * 1000
+        if error:
+            print(f"✗ {relative}: {error}")
+        else:
+            print(f"✓ {relative} -> {', '.join(os.path.basename(output) for output in outputs)} "
+                  f"({elapsed:.0f} ms)")
+
+
+def watch_directory(source_dir, output_dir, workers=None, pretty_json=True, poll_interval=None,
+                    debounce=None):
+    """Sync source_dir into output_dir, then keep regenerating outputs as .curl files change.
+
+    Runs until interrupted. Changes are picked up with inotify where
+    available, otherwise by polling every poll_interval seconds.
+    """
+    from CurlSync import SyncManifest
+    from CurlWatch import DEFAULT_DEBOUNCE, open_watcher, wait_for_changes
+    if debounce is None:
+        debounce = DEFAULT_DEBOUNCE
+    source_dir = os.path.abspath(source_dir)
+    output_dir = os.path.abspath(output_dir)
+    # Start watching first so edits made during the initial sync aren't missed
+    watcher = open_watcher(source_dir, poll_interval)
+    manifest = None
+    try:
+        sync_directory(source_dir, output_dir, workers, pretty_json)
+        manifest = SyncManifest(output_dir, converter_version(), {'pretty_json': pretty_json}).load()
+        # The initial sync may have converted in worker processes
+        for module_name, _, _ in CONVERT_TARGETS.values():
+            importlib.import_module(module_name)
+        
+        print(f"Watching {source_dir} for .curl changes ({watcher.name}, Ctrl+C to stop)")
+        while True:
+            changed = wait_for_changes(watcher, debounce)
+            if changed is None:
+                print("Too many changes at once; rescanning")
+                manifest.save()
+                sync_directory(source_dir, output_dir, workers, pretty_json)
+                manifest.load()
+            else:
+                sync_paths(manifest, source_dir, output_dir, changed, pretty_json)
+                manifest.save()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+        # Outputs written just before an interrupt must still be recorded
+        if manifest:
+            manifest.save()
+    return True
+
+
+def handle_daemon_request(message):
+    """Answer one daemon request with the converters already loaded in this process.
+
+    'convert' requests return the generated code for one target; 'all'
+    requests write every format to output_dir and return the log lines a
+    normal Curl2All run would have printed.
+    """
+    op = message.get('op', 'convert')
+    if op == 'ping':
+        return {'ok': True}
+    
+    command = message.get('command', '')
+    if reads_local_input(command):
+        # Paths and stdin would resolve in the daemon, not the client
+        return {'ok': False, 'error': "Commands with @file or stdin data must be converted by the client"}
+    options = dict(pretty_json=message.get('pretty_json', True),
+                   deterministic=message.get('deterministic', False))
+    
+    if op == 'all':
+        converter = CurlToAll(output_dir=message.get('output_dir', '.'),
+                              use_cache=message.get('use_cache', False),
+                              fanout=message.get('fanout', 0), **options)
+        log = []
+        converter.log = log.append
+        success = converter.convert_curl_to_all(command)
+        converter.save_cache_stats(converter.cache_hit, not converter.cache_hit,
+                                   message.get('cache_max_bytes', DEFAULT_MAX_BYTES))
+        return {'ok': success, 'log': log}
+    
+    if op != 'convert':
+        return {'ok': False, 'error': f"Unknown request op: {op}"}
+    
+    target = message.get('target')
+    if target not in CONVERT_TARGETS:
+        return {'ok': False, 'error': f"Unknown target: {target}"}
+    
+    from CurlRequest import parse_curl_command
+    try:
+        request = parse_curl_command(command)
+    except ValueError as e:
+        return {'ok': False, 'error': f"Error parsing curl command: {e}"}
+    
+    output = generate(request, (target,), name=message.get('name'), **options)[target]
+    return {'ok': True, 'output': output, 'warning': request.unhandled_warning()}
+
+
+def serve_daemon(socket_path=None):
+    """Load every converter once and answer requests on a Unix socket."""
+    from CurlDaemon import serve
+    for module_name, _, _ in CONVERT_TARGETS.values():
+        importlib.import_module(module_name)
+    return serve(handle_daemon_request, socket_path)
 
 
 def get_curl_input():
@@ -194,14 +978,16 @@ def get_curl_input():
         curl_parts = []
         i = 0
         while i < len(args):
-            if args[i] in ['-d', '--dir']:
+            if args[i] in ['-d', '--dir', '--benchmark', '--batch', '--workers', '--cache-size',
+                           '--socket', '--har', '--scan', '--fanout', '--bundle', '--sync', '--watch',
+                           '--poll']:
                 i += 2  # Skip the option and its value
-            elif args[i] in ['-h', '--help']:
+            elif args[i] in ['-h', '--help', '--subprocess', '--no-pretty', '--no-cache',
+                             '--cache-stats', '--deterministic', '--serve', '--no-daemon', '--timings']:
                 i += 1
             else:
                 curl_parts.extend(args[i:])
                 break
-            i += 1
         
         if curl_parts:
             return " ".join(curl_parts)
@@ -234,9 +1020,40 @@ Examples:
   python Curl2All.py 'curl -X POST https://api.example.com/users -H "Content-Type: application/json" -d "{\\"name\\":\\"John\\"}"'
   echo 'curl -X GET https://api.example.com/users' | python Curl2All.py
   python Curl2All.py --dir ./output 'curl ...'
+  python Curl2All.py --benchmark 20 'curl https://api.example.com/users'
+  python Curl2All.py --batch captured_requests.txt --dir ./output
+  cat captured_requests.txt | python Curl2All.py --batch - --workers 4
+  python Curl2All.py --har session.har --dir ./output
+  python Curl2All.py --scan ~/.zsh_history --scan build.log --dir ./output
+  python Curl2All.py --batch captured_requests.txt --bundle output.sqlite
+  python Curl2All.py list output.sqlite '*api.example.com*'
+  python Curl2All.py extract output.sqlite --format py --dir ./output
+  python Curl2All.py --sync ./requests --dir ./generated
+  python Curl2All.py --watch ./requests --dir ./generated
+  python Curl2All.py --cache-stats
+  python Curl2All.py --serve &
 
 Files will be generated with the format:
-{sortable_timestamp}_{request_verb}_{request_url}.{file_extension}
+{sortable_timestamp}_{request_verb}_{request_url}_{content_hash}.{file_extension}
+Batch runs add a sequence number after the timestamp. With --fanout N, files
+go into N levels of subdirectories named after the content hash (ab/cd/...).
+
+With --bundle, every file goes into one ZIP archive (.zip) or SQLite database
+(.sqlite, .db) instead, indexed by method, URL, timestamp and format. The
+list and extract subcommands read bundles back.
+
+--sync SOURCE converts every SOURCE/**/name.curl to name.py, name.cs and
+name.http under --dir, without timestamps. A manifest in --dir records what
+was generated from what, so re-runs only convert inputs that changed and
+delete the outputs of inputs that were removed. --watch SOURCE does the same,
+then keeps the outputs up to date as .curl files are edited.
+
+Conversions are cached under $XDG_CACHE_HOME/curl2all (~/.cache/curl2all),
+keyed by the command and converter version. Cached .http files leave out the
+generation timestamp so repeated runs produce identical output.
+
+While a daemon started with --serve is running, single conversions are
+forwarded to it so the converters do not have to be loaded again.
 
 If no curl command is provided as argument and no input is piped,
 the script will prompt for interactive input.
@@ -246,28 +1063,168 @@ the script will prompt for interactive input.
     parser.add_argument('curl_command', nargs='*', help='cURL command to convert')
     parser.add_argument('--dir', '-d', default='.', 
                        help='Output directory for generated files (default: current directory)')
+    parser.add_argument('--subprocess', action='store_true',
+                       help='Run each converter script in its own interpreter instead of in-process')
+    parser.add_argument('--benchmark', type=int, metavar='RUNS',
+                       help='Time in-process against subprocess conversion over RUNS runs and exit')
+    parser.add_argument('--batch', metavar='FILE',
+                       help='Convert every curl command in FILE (use - for stdin)')
+    parser.add_argument('--har', metavar='FILE',
+                       help='Convert every HTTP(S) request in a HAR export (use - for stdin)')
+    parser.add_argument('--scan', metavar='FILE', action='append',
+                       help='Convert every curl command found in a shell history or log file '
+                            '(repeatable)')
+    parser.add_argument('--sync', metavar='SOURCE',
+                       help='Incrementally regenerate outputs for every .curl file under SOURCE into --dir')
+    parser.add_argument('--watch', metavar='SOURCE',
+                       help='Like --sync, then keep regenerating outputs as .curl files change')
+    parser.add_argument('--poll', type=float, metavar='SECONDS',
+                       help='With --watch, poll every SECONDS instead of using inotify '
+                            '(needed on network filesystems)')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes for --batch, --har, --scan and --sync (default: CPU count)')
+    parser.add_argument('--fanout', type=int, default=0, choices=range(MAX_FANOUT + 1), metavar='LEVELS',
+                       help='Spread files over LEVELS of hash-prefix subdirectories, '
+                            f'0 to {MAX_FANOUT} (default: 0)')
+    parser.add_argument('--bundle', metavar='FILE',
+                       help='Add generated files to a .zip or .sqlite bundle instead of --dir')
+    parser.add_argument('--no-pretty', action='store_true',
+                       help='Embed JSON bodies verbatim instead of re-formatting them')
+    parser.add_argument('--deterministic', action='store_true',
+                       help='Leave the generation timestamp out of .http files (always on when caching)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Neither read nor write the conversion cache')
+    parser.add_argument('--cache-size', type=float, metavar='MB', default=DEFAULT_MAX_BYTES / 1024 / 1024,
+                       help='Evict least recently used cache entries beyond MB megabytes (default: %(default)g)')
+    parser.add_argument('--cache-stats', action='store_true',
+                       help='Print conversion cache statistics and exit')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run a conversion daemon on a Unix socket until interrupted')
+    parser.add_argument('--socket', metavar='PATH',
+                       help=f'Daemon socket path (default: {default_socket_path()})')
+    parser.add_argument('--no-daemon', action='store_true',
+                       help='Always convert in this process, even if a daemon is running')
+    parser.add_argument('--timings', action='store_true',
+                       help='Print wall time per conversion phase as JSON on stderr '
+                            '(summed over every command in batch runs)')
+    
+    if sys.argv[1:2] in (['list'], ['extract']):
+        from CurlBundle import bundle_main
+        return bundle_main(sys.argv[1:])
     
     args = parser.parse_args()
+    cache_max_bytes = int(args.cache_size * 1024 * 1024)
+    # Read the umask while this is the only thread
+    _file_mode()
+    
+    if args.cache_stats:
+        ConversionCache(max_bytes=cache_max_bytes).print_stats()
+        return 0
+    
+    if args.serve:
+        return 0 if serve_daemon(args.socket) else 1
+    
+    options = dict(output_dir=args.dir, in_process=not args.subprocess,
+                   pretty_json=not args.no_pretty, deterministic=args.deterministic,
+                   use_cache=not args.no_cache, fanout=args.fanout, bundle=args.bundle,
+                   timings=args.timings)
+    
+    if args.bundle and args.subprocess:
+        print("Error: --bundle converts in-process and can't be combined with --subprocess")
+        return 1
+    
+    if args.watch:
+        try:
+            return 0 if watch_directory(args.watch, args.dir, args.workers, not args.no_pretty,
+                                        args.poll) else 1
+        except OSError as e:
+            print(f"Error watching {args.watch}: {e}")
+            return 1
+    
+    if args.sync:
+        try:
+            return 0 if sync_directory(args.sync, args.dir, args.workers, not args.no_pretty) else 1
+        except OSError as e:
+            print(f"Error syncing {args.sync}: {e}")
+            return 1
+    
+    if args.batch:
+        commands = read_batch_commands(args.batch)
+        return 0 if convert_batch(commands, args.workers, cache_max_bytes, **options) else 1
+    
+    if args.scan:
+        try:
+            return 0 if convert_batch(scan_files(args.scan), args.workers,
+                                      cache_max_bytes, **options) else 1
+        except OSError as e:
+            print(f"\nError scanning file: {e}")
+            return 1
+    
+    if args.har:
+        if args.subprocess:
+            print("Error: --har converts requests in-process and can't be combined with --subprocess")
+            return 1
+        from CurlHar import read_har_requests
+        try:
+            return 0 if convert_batch(read_har_requests(args.har), args.workers,
+                                      cache_max_bytes, **options) else 1
+        except (OSError, ValueError) as e:
+            print(f"\nError reading HAR file: {e}")
+            return 1
     
     # Get curl command
+    timings = Timings() if args.timings else None
     if args.curl_command:
         curl_command = " ".join(args.curl_command)
     else:
         curl_command = get_curl_input()
+    if timings:
+        timings.mark('read')
     
     if not curl_command.strip():
         print("Error: No curl command provided")
         parser.print_help()
         return 1
     
+    if args.benchmark:
+        benchmark_modes(curl_command, args.benchmark)
+        return 0
+    
+    # Hand the conversion to a running daemon; fall through if there isn't one.
+    # Timed and profiled runs measure this process's own conversion, and
+    # @file or stdin data has to be read by this process
+    if (not args.no_daemon and not args.subprocess and not args.bundle
+            and not timings and not profile_mode() and not reads_local_input(curl_command)):
+        reply = send_request(dict(options, op='all', command=curl_command,
+                                  output_dir=os.path.abspath(args.dir),
+                                  cache_max_bytes=cache_max_bytes), args.socket)
+        if reply is not None:
+            for line in reply.get('log', []):
+                print(line)
+            if reply.get('error'):
+                print(f"Error: {reply['error']}")
+            return 0 if reply['ok'] else 1
+    
     # Create converter and run
-    converter = CurlToAll(output_dir=args.dir)
+    converter = CurlToAll(**options)
     
-    if converter.convert_curl_to_all(curl_command):
-        return 0
-    else:
-        return 1
+    success = converter.convert_curl_to_all(curl_command)
+    converter.save_cache_stats(converter.cache_hit, not converter.cache_hit, cache_max_bytes)
+    if args.bundle and converter.artifacts:
+        from CurlBundle import BundleError, open_bundle
+        try:
+            with open_bundle(args.bundle, 'a') as bundle:
+                for artifact in converter.artifacts:
+                    bundle.add(*artifact)
+        except BundleError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"Added {len(converter.artifacts)} file(s) to {args.bundle}")
+    if timings:
+        timings.merge(*converter.timings.take())
+        timings.report('Curl2All')
+    return 0 if success else 1
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(run_profiled(main))
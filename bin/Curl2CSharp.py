@@ -6,215 +6,227 @@ It can be used in several ways:
 1. As a command-line tool: `python Curl2CSharp.py 'curl ...'`
 2. By piping input: `echo "curl ..." | python Curl2CSharp.py`
 3. Asking user for input: `python Curl2CSharp.py` and then entering the cURL command, ending with a blank line.
+
+The request is sent through one static HttpClient over a pooled
+SocketsHttpHandler, with its headers on the HttpRequestMessage, so the code
+can be moved into a loop or a service without exhausting sockets.
+`--client-factory` registers the same handler with IHttpClientFactory instead.
+`--typed-json` builds a JSON body from records inferred from it, serialized
+through a source-generated System.Text.Json context (no reflection, so the
+code can be trimmed or compiled ahead of time), and reads JSON responses
+through the same context.
 """
 
 import sys
-import re
+import io
 import argparse
-import shlex
-import json
-from urllib.parse import urlparse, parse_qs
+
+# The parser and re are imported where they are used, so --help and the
+# argument checks run without loading them
+from CurlTimings import Timings, run_profiled, timed_output
+
+# Connections the shared handler opens per server, and how long one is kept
+# before it is replaced (so DNS changes are picked up)
+DEFAULT_MAX_CONNECTIONS = 10
+POOLED_CONNECTION_LIFETIME_MINUTES = 2
+
+# Name the client is registered under with --client-factory
+HTTP_CLIENT_NAME = "curl"
+
+# Methods with an HttpMethod property; others are constructed by name
+HTTP_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS', 'TRACE')
+
+# With --typed-json: the record inferred for the body and the source-generated
+# serializer context
+ROOT_DTO_NAME = "RequestBody"
+JSON_CONTEXT_NAME = "CurlJsonContext"
+
+# Types the generated code refers to, which an inferred record must not hide
+RESERVED_TYPE_NAMES = {
+    'AuthenticationHeaderValue', 'ByteArrayContent', 'Console', 'Convert', 'Encoding', 'Exception',
+    'File', 'FormUrlEncodedContent', 'HttpClient', 'HttpClientExample', 'HttpMethod',
+    'HttpRequestException', 'HttpRequestMessage', 'IHttpClientFactory', 'JsonElement',
+    'JsonPropertyName', 'JsonSerializable', 'JsonSerializer', 'JsonSerializerContext', 'KeyValuePair',
+    'List', 'Microsoft', 'MultipartFormDataContent', 'ServiceCollection', 'SocketsHttpHandler',
+    'StreamContent', 'StringContent', 'System', 'Task', 'TimeSpan', 'Timeout', JSON_CONTEXT_NAME,
+}
+
+# Members every record has, which a property must not be named after
+RESERVED_MEMBER_NAMES = {'Clone', 'Deconstruct', 'EqualityContract', 'Equals', 'GetHashCode', 'GetType',
+                         'MemberwiseClone', 'PrintMembers', 'ToString'}
+
+# Numeric JSON values widen along this order when an array mixes them
+NUMBER_KINDS = ('int', 'long', 'double')
+CSHARP_TYPES = {'string': 'string', 'bool': 'bool', 'int': 'int', 'long': 'long', 'double': 'double'}
+
+
+class CSharpDtos:
+    """Record DTOs inferred from a decoded JSON body, and the C# expression building it.
+
+    Objects become positional records and arrays List<T>. Array elements
+    are merged into one type: objects take the union of their properties,
+    numbers widen, and missing or null values make a property nullable.
+    Arrays mixing other kinds raise ValueError.
+    """
+
+    def __init__(self, value, escape):
+        self.value = value
+        self.escape = escape
+        # name -> [(JSON key, property name, shape)], in declaration order
+        self.records = {}
+        self.nullable_references = False
+        self._used_names = set(RESERVED_TYPE_NAMES)
+        self.shape = _json_shape(value)
+        self._name_records(self.shape, ROOT_DTO_NAME)
+        self.root_type = self.type_name(self.shape)
+        for properties in self.records.values():
+            for _, _, field in properties:
+                # Sets nullable_references, needed before anything is written
+                self.type_name(field)
+
+    def _unique_name(self, name):
+        """Return name, numbered if it is already taken."""
+        candidate = name
+        number = 2
+        while candidate in self._used_names:
+            candidate = f"{name}{number}"
+            number += 1
+        self._used_names.add(candidate)
+        return candidate
+
+    def _name_records(self, shape, hint):
+        """Name the records in shape after the JSON keys holding them."""
+        if shape is None:
+            return
+        if shape['kind'] == 'list':
+            self._name_records(shape['item'], _singular(hint))
+        elif shape['kind'] == 'object':
+            shape['name'] = name = self._unique_name(hint)
+            properties = []
+            self.records[name] = properties
+            taken = RESERVED_MEMBER_NAMES | {name}
+            for key, field in shape['fields'].items():
+                prop = _pascal_case(key)
+                if prop in taken:
+                    prop += "Value"
+                number = 2
+                while prop in taken:
+                    prop = f"{_pascal_case(key)}{number}"
+                    number += 1
+                taken.add(prop)
+                properties.append((key, prop, field))
+                self._name_records(field, prop)
+
+    def type_name(self, shape):
+        """Return the C# type for shape."""
+        if shape is None:
+            # Items of an array that was always empty
+            return "JsonElement"
+        if shape['kind'] == 'null':
+            return "JsonElement?"
+        if shape['kind'] == 'list':
+            name = f"List<{self.type_name(shape['item'])}>"
+        else:
+            name = shape.get('name') or CSHARP_TYPES[shape['kind']]
+        if shape['nullable']:
+            if shape['kind'] in ('string', 'list', 'object'):
+                self.nullable_references = True
+            return name + "?"
+        return name
+
+    def write_records(self, writer):
+        """Write a record declaration for every inferred object type."""
+        for name, properties in self.records.items():
+            writer.line("")
+            if not properties:
+                writer.line(f"public record {name}();")
+                continue
+            writer.line(f"public record {name}(")
+            for number, (key, prop, field) in enumerate(properties, 1):
+                attributes = []
+                if prop != key:
+                    attributes.append(f"JsonPropertyName(\"{self.escape(key)}\")")
+                if field and field.get('missing') and not (field['kind'] == 'null' or field.get('explicit_null')):
+                    attributes.append("JsonIgnore(Condition = JsonIgnoreCondition.WhenWritingNull)")
+                attribute = f"[property: {', '.join(attributes)}] " if attributes else ""
+                separator = ");" if number == len(properties) else ","
+                writer.line(f"    {attribute}{self.type_name(field)} {prop}{separator}")
+
+    def expression(self, indent):
+        """Return a C# expression constructing the body, continuation lines indented by indent."""
+        return self._expression(self.value, self.shape, indent)
+
+    def _expression(self, value, shape, indent):
+        """Return the C# expression for value, whose inferred shape is shape."""
+        if value is None:
+            return "null"
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, float) or shape['kind'] == 'double' and not -2 ** 63 <= value < 2 ** 63:
+            return repr(float(value))
+        if isinstance(value, int):
+            return str(value)
+        if isinstance(value, str):
+            import re
+            # Line separators and other control characters end a C# string literal
+            return '"' + re.sub(r'[\x00-\x1f\x85\u2028\u2029]',
+                                lambda m: f"\\u{ord(m.group()):04x}", self.escape(value)) + '"'
+        inner = indent + "    "
+        if isinstance(value, dict):
+            properties = self.records[shape['name']]
+            if not properties:
+                return f"new {shape['name']}()"
+            arguments = [f"{inner}{prop}: {self._expression(value.get(key), field, inner)}"
+                         for key, prop, field in properties]
+            return f"new {shape['name']}(\n" + ",\n".join(arguments) + ")"
+        list_type = self.type_name(dict(shape, nullable=False))
+        if not value:
+            return f"new {list_type}()"
+        items = [self._expression(item, shape['item'], inner) for item in value]
+        if shape['item']['kind'] in ('object', 'list'):
+            return f"new {list_type}\n{indent}{{\n" + "".join(f"{inner}{item},\n" for item in items) + f"{indent}}}"
+        return f"new {list_type} {{ {', '.join(items)} }}"
+
 
 
 class CurlToCSharp:
-    def __init__(self):
-        self.method = 'GET'
-        self.url = ''
-        self.headers = {}
-        self.data = None
-        self.json_data = None
-        self.params = {}
-        self.auth = None
-        self.cookies = {}
-        self.files = {}
-        self.verify = True
-        self.allow_redirects = True
-        self.timeout = None
-        self.proxies = {}
-        self.content_type = None
-
-    def parse_curl_command(self, curl_command):
-        """Parse a cURL command and extract relevant information."""
-        # Remove 'curl' from the beginning and clean up the command
-        curl_command = curl_command.strip()
-        if curl_command.startswith('curl'):
-            curl_command = curl_command[4:].strip()
-        
-        # Use shlex to properly split the command while respecting quotes
+    def __init__(self, request=None, pretty_json=True, deterministic=False, client_factory=False,
+                 max_connections=DEFAULT_MAX_CONNECTIONS, typed_json=False):
+        # C# output always embeds the body verbatim and nothing run-specific,
+        # so pretty_json and deterministic are only accepted for a constructor
+        # matching the other converters
+        self.request = request
+        self.pretty_json = pretty_json
+        self.deterministic = deterministic
+        self.client_factory = client_factory
+        self.max_connections = max_connections
+        self.typed_json = typed_json
+
+    def parse_curl_command(self, curl_command, timings=None):
+        """Parse a cURL command into the shared request model."""
+        from CurlRequest import parse_curl_command
         try:
-            tokens = shlex.split(curl_command)
+            self.request = parse_curl_command(curl_command, timings)
         except ValueError as e:
             print(f"Error parsing curl command: {e}")
             return False
-
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-            
-            if token in ['-X', '--request']:
-                i += 1
-                if i < len(tokens):
-                    self.method = tokens[i].upper()
-            
-            elif token in ['-H', '--header']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_header(tokens[i])
-            
-            elif token in ['-d', '--data', '--data-raw']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_data(tokens[i])
-            
-            elif token in ['--data-binary']:
-                i += 1
-                if i < len(tokens):
-                    self.data = tokens[i]
-            
-            elif token in ['-u', '--user']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_auth(tokens[i])
-            
-            elif token in ['-b', '--cookie']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_cookies(tokens[i])
-            
-            elif token in ['-F', '--form']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_form_data(tokens[i])
-            
-            elif token in ['-k', '--insecure']:
-                self.verify = False
-            
-            elif token in ['-L', '--location']:
-                self.allow_redirects = True
-            
-            elif token in ['--max-time']:
-                i += 1
-                if i < len(tokens):
-                    self.timeout = float(tokens[i])
-            
-            elif token in ['--proxy']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_proxy(tokens[i])
-            
-            elif token.startswith('http://') or token.startswith('https://'):
-                self.url = token
-                # Parse query parameters from URL
-                parsed_url = urlparse(token)
-                if parsed_url.query:
-                    self.params.update(parse_qs(parsed_url.query, keep_blank_values=True))
-                    # Remove query string from URL
-                    self.url = token.split('?')[0]
-            
-            elif token.startswith('-'):
-                # Skip unknown options
-                pass
-            
-            else:
-                # Assume it's the URL if we haven't found one yet
-                if not self.url:
-                    self.url = token
-                    parsed_url = urlparse(token)
-                    if parsed_url.query:
-                        self.params.update(parse_qs(parsed_url.query, keep_blank_values=True))
-                        self.url = token.split('?')[0]
-            
-            i += 1
         
+        warning = self.request.unhandled_warning()
+        if warning:
+            print(warning, file=sys.stderr)
         return True
 
-    def _parse_header(self, header):
-        """Parse a header string and add it to headers dict."""
-        if ':' in header:
-            key, value = header.split(':', 1)
-            key = key.strip()
-            value = value.strip()
-            
-            # Handle special headers
-            if key.lower() == 'content-type':
-                self.content_type = value
-                if value == 'application/json' and self.data:
-                    try:
-                        self.json_data = json.loads(self.data)
-                        self.data = None
-                    except json.JSONDecodeError:
-                        pass
-            
-            self.headers[key] = value
-
-    def _parse_data(self, data):
-        """Parse data and determine if it's JSON, form data, or raw data."""
-        self.data = data
-        
-        # Try to parse as JSON
-        try:
-            self.json_data = json.loads(data)
-            self.data = None
-            if not self.content_type:
-                self.content_type = 'application/json'
-        except json.JSONDecodeError:
-            # Check if it looks like form data
-            if '=' in data and '&' in data:
-                # Parse as form data
-                params = data.split('&')
-                form_data = {}
-                for param in params:
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-                        form_data[key] = value
-                self.data = form_data
-                if not self.content_type:
-                    self.content_type = 'application/x-www-form-urlencoded'
-            # Otherwise keep as raw data
-
-    def _parse_auth(self, auth):
-        """Parse authentication string."""
-        if ':' in auth:
-            username, password = auth.split(':', 1)
-            self.auth = (username, password)
-
-    def _parse_cookies(self, cookies):
-        """Parse cookies string."""
-        for cookie in cookies.split(';'):
-            if '=' in cookie:
-                key, value = cookie.split('=', 1)
-                self.cookies[key.strip()] = value.strip()
-
-    def _parse_form_data(self, form_data):
-        """Parse form data for file uploads or form fields."""
-        if '=' in form_data:
-            key, value = form_data.split('=', 1)
-            if value.startswith('@'):
-                # File upload
-                filename = value[1:]
-                self.files[key] = filename
-            else:
-                # Regular form field
-                if not self.data:
-                    self.data = {}
-                if isinstance(self.data, dict):
-                    self.data[key] = value
-
-    def _parse_proxy(self, proxy):
-        """Parse proxy configuration."""
-        self.proxies = {'http': proxy, 'https': proxy}
-
     def _escape_csharp_string(self, s):
         """Escape a string for C# string literals."""
         return s.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
 
-    def _build_query_string(self):
+    def _build_query_string(self, params):
         """Build query string from parameters."""
-        if not self.params:
+        if not params:
             return ""
         
         query_parts = []
-        for key, values in self.params.items():
+        for key, values in params.items():
             if isinstance(values, list):
                 for value in values:
                     query_parts.append(f"{key}={value}")
@@ -223,160 +235,369 @@ class CurlToCSharp:
         
         return "?" + "&".join(query_parts) if query_parts else ""
 
-    def generate_csharp_code(self):
-        """Generate C# code using HttpClient."""
-        if not self.url:
-            return "// Error: No URL found in curl command"
+    def _string_content_type(self, content_type):
+        """Return (StringContent arguments after the text, Content-Type statement or None).
+
+        StringContent takes a bare media type and adds charset=utf-8 itself;
+        a declared type with parameters of its own replaces that header instead.
+        """
+        escaped = self._escape_csharp_string(content_type)
+        if ';' in content_type:
+            return (", Encoding.UTF8",
+                    f"        content.Headers.ContentType = System.Net.Http.Headers.MediaTypeHeaderValue.Parse(\"{escaped}\");")
+        return f", Encoding.UTF8, \"{escaped}\"", None
+
+    def _write_string_literal(self, writer, prefix, text, suffix):
+        """Write a C# string literal for text between prefix and suffix.
+
+        Large text is split into a string.Concat of bounded literals so no
+        single escaped copy of the whole body is built.
+        """
+        from CurlRequest import BODY_CHUNK_SIZE
+        if len(text) <= BODY_CHUNK_SIZE:
+            writer.line(f"{prefix}\"{self._escape_csharp_string(text)}\"{suffix}")
+            return
+        
+        writer.line(f"{prefix}string.Concat(")
+        separator = ""
+        for chunk in writer.chunks(text):
+            writer.write(separator)
+            writer.line(f"            \"{self._escape_csharp_string(chunk)}\"")
+            separator = ","
+        writer.line(f"        ){suffix}")
+
+    def _write_handler(self, writer, indent, prefix, suffix):
+        """Write the pooled SocketsHttpHandler initializer between prefix and suffix."""
+        req = self.request
+        writer.line(f"{indent}{prefix}new SocketsHttpHandler")
+        writer.line(f"{indent}{{")
+        writer.line(f"{indent}    PooledConnectionLifetime = TimeSpan.FromMinutes({POOLED_CONNECTION_LIFETIME_MINUTES}),")
+        writer.line(f"{indent}    MaxConnectionsPerServer = {self.max_connections},")
+        writer.line(f"{indent}    EnableMultipleHttp2Connections = true,")
+        if not req.verify:
+            writer.line(f"{indent}    SslOptions = new System.Net.Security.SslClientAuthenticationOptions")
+            writer.line(f"{indent}    {{")
+            writer.line(f"{indent}        RemoteCertificateValidationCallback = (sender, cert, chain, sslPolicyErrors) => true,")
+            writer.line(f"{indent}    }},")
+        if req.proxies:
+            proxy_url = list(req.proxies.values())[0]
+            writer.line(f"{indent}    Proxy = new System.Net.WebProxy(\"{self._escape_csharp_string(proxy_url)}\"),")
+        writer.line(f"{indent}}}{suffix}")
+
+    def generate_csharp_code(self, out=None):
+        """Generate C# code using HttpClient.
+
+        The code is streamed to out (a file object or write callable) as it
+        is produced; without one it is returned as a string.
+        """
+        if out is None:
+            buffer = io.StringIO()
+            self.generate_csharp_code(buffer)
+            return buffer.getvalue()
+        
+        from CurlRequest import CodeWriter
+        writer = CodeWriter(out)
+        req = self.request
+        if not req.url:
+            writer.line("// Error: No URL found in curl command")
+            return
         
-        code_lines = []
+        # Form-encoded bodies are sent as FormUrlEncodedContent, anything else
+        # (JSON included) as the raw string, so the body is never decoded
+        data = req.form_fields() or req.body
+        if req.form and not data:
+            data = dict(req.form)
+        content_type = req.body_content_type()
+        
+        # With typed_json a JSON object or array body is built from inferred
+        # records; anything else is still sent as written
+        dtos = None
+        dto_error = None
+        if self.typed_json and isinstance(req.structured_json(), (dict, list)):
+            try:
+                dtos = CSharpDtos(req.structured_json(), self._escape_csharp_string)
+            except ValueError as e:
+                dto_error = str(e)
         
         # Using statements
-        code_lines.append("using System;")
-        code_lines.append("using System.Net.Http;")
-        code_lines.append("using System.Text;")
-        code_lines.append("using System.Threading.Tasks;")
-        if self.json_data or self.content_type == 'application/json':
-            code_lines.append("using Newtonsoft.Json;")
-        if self.files:
-            code_lines.append("using System.IO;")
-        if self.auth:
-            code_lines.append("using System.Net.Http.Headers;")
-        code_lines.append("")
+        if dtos and dtos.nullable_references:
+            writer.line("#nullable enable")
+        writer.line("using System;")
+        if isinstance(data, dict) or dtos:
+            writer.line("using System.Collections.Generic;")
+        writer.line("using System.Net.Http;")
+        if self.typed_json:
+            writer.line("using System.Net.Http.Json;")
+        writer.line("using System.Text;")
+        if self.typed_json:
+            writer.line("using System.Text.Json;")
+            writer.line("using System.Text.Json.Serialization;")
+        if self.client_factory:
+            writer.line("using System.Threading;")
+        writer.line("using System.Threading.Tasks;")
+        if req.files or req.body_file:
+            writer.line("using System.IO;")
+        if req.auth:
+            writer.line("using System.Net.Http.Headers;")
+        if self.client_factory:
+            # From the Microsoft.Extensions.Http package
+            writer.line("using Microsoft.Extensions.DependencyInjection;")
+        writer.line("")
         
         # Class declaration
-        code_lines.append("public class HttpClientExample")
-        code_lines.append("{")
-        code_lines.append("    public static async Task Main(string[] args)")
-        code_lines.append("    {")
-        
-        # HttpClient setup
-        if not self.verify or self.proxies:
-            code_lines.append("        var handler = new HttpClientHandler();")
-            if not self.verify:
-                code_lines.append("        handler.ServerCertificateCustomValidationCallback = (sender, cert, chain, sslPolicyErrors) => true;")
-            if self.proxies:
-                proxy_url = list(self.proxies.values())[0]
-                code_lines.append(f"        handler.Proxy = new System.Net.WebProxy(\"{self._escape_csharp_string(proxy_url)}\");")
-            code_lines.append("        using var client = new HttpClient(handler);")
+        writer.line("public class HttpClientExample")
+        writer.line("{")
+        if self.client_factory:
+            client = "client"
         else:
-            code_lines.append("        using var client = new HttpClient();")
+            client = "Client"
+            writer.line("    // Shared for the life of the process so connections are pooled and reused;")
+            writer.line("    // each is replaced after PooledConnectionLifetime to pick up DNS changes")
+            self._write_handler(writer, "    ", "private static readonly SocketsHttpHandler Handler = ", ";")
+            writer.line("")
+            if req.timeout:
+                writer.line("    private static readonly HttpClient Client = new HttpClient(Handler)")
+                writer.line("    {")
+                writer.line(f"        Timeout = TimeSpan.FromSeconds({req.timeout}),")
+                writer.line("    };")
+            else:
+                writer.line("    private static readonly HttpClient Client = new HttpClient(Handler);")
+            writer.line("")
+        writer.line("    public static async Task Main(string[] args)")
+        writer.line("    {")
+        
+        # HttpClient setup through IHttpClientFactory, as an application would
+        # register it; the handler recycles its own connections, so the factory
+        # keeps it for good
+        if self.client_factory:
+            writer.line("        var services = new ServiceCollection();")
+            if req.timeout:
+                writer.line(f"        services.AddHttpClient(\"{HTTP_CLIENT_NAME}\", httpClient =>")
+                writer.line("            {")
+                writer.line(f"                httpClient.Timeout = TimeSpan.FromSeconds({req.timeout});")
+                writer.line("            })")
+            else:
+                writer.line(f"        services.AddHttpClient(\"{HTTP_CLIENT_NAME}\")")
+            self._write_handler(writer, "            ", ".ConfigurePrimaryHttpMessageHandler(() => ", ")")
+            writer.line("            .SetHandlerLifetime(Timeout.InfiniteTimeSpan);")
+            writer.line("        using var provider = services.BuildServiceProvider();")
+            writer.line(f"        var client = provider.GetRequiredService<IHttpClientFactory>().CreateClient(\"{HTTP_CLIENT_NAME}\");")
+            writer.line("")
         
-        # Timeout
-        if self.timeout:
-            code_lines.append(f"        client.Timeout = TimeSpan.FromSeconds({self.timeout});")
+        # URL with query parameters
+        full_url = req.url + self._build_query_string(req.params)
+        writer.line(f"        var url = \"{self._escape_csharp_string(full_url)}\";")
+        if req.method.upper() in HTTP_METHODS:
+            method = f"HttpMethod.{req.method.title()}"
+        else:
+            method = f"new HttpMethod(\"{self._escape_csharp_string(req.method)}\")"
+        writer.line(f"        using var request = new HttpRequestMessage({method}, url);")
         
-        # Default headers
-        if self.headers:
-            code_lines.append("")
-            for key, value in self.headers.items():
-                if key.lower() not in ['content-type', 'authorization']:
-                    code_lines.append(f"        client.DefaultRequestHeaders.Add(\"{self._escape_csharp_string(key)}\", \"{self._escape_csharp_string(value)}\");")
+        # Headers go on this request only; content headers are set on the content below
+        for key, value in req.headers.items():
+            if key.lower().startswith('content-') or key.lower() == 'authorization' and req.auth:
+                continue
+            writer.line(f"        request.Headers.TryAddWithoutValidation(\"{self._escape_csharp_string(key)}\", \"{self._escape_csharp_string(value)}\");")
         
         # Authentication
-        if self.auth:
-            code_lines.append("")
-            username, password = self.auth
-            code_lines.append(f"        var authToken = Convert.ToBase64String(Encoding.ASCII.GetBytes(\"{self._escape_csharp_string(username)}:{self._escape_csharp_string(password)}\"));")
-            code_lines.append("        client.DefaultRequestHeaders.Authorization = new AuthenticationHeaderValue(\"Basic\", authToken);")
-        
-        # URL with query parameters
-        full_url = self.url + self._build_query_string()
-        code_lines.append("")
-        code_lines.append(f"        var url = \"{self._escape_csharp_string(full_url)}\";")
+        if req.auth:
+            username, password = req.auth
+            writer.line(f"        var authToken = Convert.ToBase64String(Encoding.ASCII.GetBytes(\"{self._escape_csharp_string(username)}:{self._escape_csharp_string(password)}\"));")
+            writer.line("        request.Headers.Authorization = new AuthenticationHeaderValue(\"Basic\", authToken);")
         
         # Content preparation
         content_var = None
-        if self.json_data:
-            code_lines.append("")
-            json_string = json.dumps(self.json_data, indent=12).replace('\n', '\n        ')
-            code_lines.append(f"        var jsonData = @\"{self._escape_csharp_string(json.dumps(self.json_data))}\";")
-            code_lines.append("        var content = new StringContent(jsonData, Encoding.UTF8, \"application/json\");")
+        if dtos:
+            writer.line("")
+            writer.line(f"        var body = {dtos.expression('        ')};")
+            writer.line("        // Serialized up front, without reflection, so the request has a Content-Length")
+            writer.line(f"        var content = new ByteArrayContent(JsonSerializer.SerializeToUtf8Bytes(body, {JSON_CONTEXT_NAME}.Default.{ROOT_DTO_NAME}));")
+            writer.line(f"        content.Headers.ContentType = System.Net.Http.Headers.MediaTypeHeaderValue.Parse(\"{self._escape_csharp_string(content_type)}\");")
+            content_var = "content"
+        elif req.body_kind == 'json' and req.body is not None:
+            writer.line("")
+            if dto_error:
+                writer.line(f"        // No records inferred ({dto_error}); the body is sent as written")
+            self._write_string_literal(writer, "        var jsonData = ", req.body, ";")
+            arguments, set_content_type = self._string_content_type(content_type)
+            writer.line(f"        var content = new StringContent(jsonData{arguments});")
+            if set_content_type:
+                writer.line(set_content_type)
             content_var = "content"
-        elif isinstance(self.data, dict):
-            code_lines.append("")
-            code_lines.append("        var formData = new List<KeyValuePair<string, string>>");
-            code_lines.append("        {")
-            for key, value in self.data.items():
-                code_lines.append(f"            new KeyValuePair<string, string>(\"{self._escape_csharp_string(key)}\", \"{self._escape_csharp_string(str(value))}\"),")
-            code_lines.append("        };")
-            code_lines.append("        var content = new FormUrlEncodedContent(formData);")
+        elif isinstance(data, dict):
+            writer.line("")
+            writer.line("        var formData = new List<KeyValuePair<string, string>>");
+            writer.line("        {")
+            for key, value in data.items():
+                writer.line(f"            new KeyValuePair<string, string>(\"{self._escape_csharp_string(key)}\", \"{self._escape_csharp_string(str(value))}\"),")
+            writer.line("        };")
+            writer.line("        var content = new FormUrlEncodedContent(formData);")
             content_var = "content"
-        elif self.data:
-            code_lines.append("")
-            content_type = self.content_type or "text/plain"
-            code_lines.append(f"        var content = new StringContent(\"{self._escape_csharp_string(self.data)}\", Encoding.UTF8, \"{content_type}\");")
+        elif data:
+            writer.line("")
+            arguments, set_content_type = self._string_content_type(content_type or 'text/plain')
+            self._write_string_literal(writer, "        var content = new StringContent(", data, f"{arguments});")
+            if set_content_type:
+                writer.line(set_content_type)
             content_var = "content"
-        elif self.files:
-            code_lines.append("")
-            code_lines.append("        var content = new MultipartFormDataContent();")
-            for key, filename in self.files.items():
-                code_lines.append(f"        var fileContent = new ByteArrayContent(File.ReadAllBytes(\"{self._escape_csharp_string(filename)}\"));")
-                code_lines.append(f"        content.Add(fileContent, \"{self._escape_csharp_string(key)}\", \"{self._escape_csharp_string(filename)}\");")
+        elif req.body_file:
+            # Stream the file rather than embedding it in the source
+            writer.line("")
+            writer.line(f"        var content = new StreamContent(File.OpenRead(\"{self._escape_csharp_string(req.body_file)}\"));")
+            writer.line(f"        content.Headers.ContentType = System.Net.Http.Headers.MediaTypeHeaderValue.Parse(\"{self._escape_csharp_string(content_type or 'application/octet-stream')}\");")
+            content_var = "content"
+        elif req.files:
+            writer.line("")
+            writer.line("        var content = new MultipartFormDataContent();")
+            for key, filename in req.files.items():
+                writer.line(f"        var fileContent = new ByteArrayContent(File.ReadAllBytes(\"{self._escape_csharp_string(filename)}\"));")
+                writer.line(f"        content.Add(fileContent, \"{self._escape_csharp_string(key)}\", \"{self._escape_csharp_string(filename)}\");")
             content_var = "content"
         
-        # Additional headers for content
-        if content_var and self.headers:
-            for key, value in self.headers.items():
-                if key.lower() == 'content-type' and not self.files:  # Don't set content-type for multipart
-                    continue  # Already set in StringContent constructor
-                elif key.lower() not in ['authorization']:
-                    code_lines.append(f"        content.Headers.Add(\"{self._escape_csharp_string(key)}\", \"{self._escape_csharp_string(value)}\");")
+        if content_var:
+            writer.line(f"        request.Content = {content_var};")
+            # Content-Type is already set by the content itself
+            for key, value in req.headers.items():
+                if key.lower().startswith('content-') and key.lower() != 'content-type':
+                    writer.line(f"        {content_var}.Headers.TryAddWithoutValidation(\"{self._escape_csharp_string(key)}\", \"{self._escape_csharp_string(value)}\");")
         
         # HTTP request
-        code_lines.append("")
-        code_lines.append("        try")
-        code_lines.append("        {")
-        
-        if self.method.upper() == 'GET':
-            code_lines.append("            var response = await client.GetAsync(url);")
-        elif self.method.upper() == 'POST':
-            if content_var:
-                code_lines.append(f"            var response = await client.PostAsync(url, {content_var});")
-            else:
-                code_lines.append("            var response = await client.PostAsync(url, null);")
-        elif self.method.upper() == 'PUT':
-            if content_var:
-                code_lines.append(f"            var response = await client.PutAsync(url, {content_var});")
-            else:
-                code_lines.append("            var response = await client.PutAsync(url, null);")
-        elif self.method.upper() == 'DELETE':
-            code_lines.append("            var response = await client.DeleteAsync(url);")
-        else:
-            # Generic method
-            if content_var:
-                code_lines.append(f"            var request = new HttpRequestMessage(HttpMethod.{self.method.title()}, url);")
-                code_lines.append(f"            request.Content = {content_var};")
-                code_lines.append("            var response = await client.SendAsync(request);")
-            else:
-                code_lines.append(f"            var response = await client.SendAsync(new HttpRequestMessage(HttpMethod.{self.method.title()}, url));")
+        writer.line("")
+        writer.line("        try")
+        writer.line("        {")
+        writer.line(f"            using var response = await {client}.SendAsync(request);")
         
         # Response handling
-        code_lines.append("")
-        code_lines.append("            Console.WriteLine($\"Status Code: {response.StatusCode}\");")
-        code_lines.append("            Console.WriteLine($\"Response Headers: {response.Headers}\");")
-        code_lines.append("            ")
-        code_lines.append("            var responseContent = await response.Content.ReadAsStringAsync();")
-        code_lines.append("            Console.WriteLine($\"Response Content: {responseContent}\");")
-        code_lines.append("        }")
-        code_lines.append("        catch (HttpRequestException ex)")
-        code_lines.append("        {")
-        code_lines.append("            Console.WriteLine($\"Request error: {ex.Message}\");")
-        code_lines.append("        }")
-        code_lines.append("        catch (Exception ex)")
-        code_lines.append("        {")
-        code_lines.append("            Console.WriteLine($\"General error: {ex.Message}\");")
-        code_lines.append("        }")
+        writer.line("")
+        writer.line("            Console.WriteLine($\"Status Code: {response.StatusCode}\");")
+        writer.line("            Console.WriteLine($\"Response Headers: {response.Headers}\");")
+        writer.line("            ")
+        if self.typed_json:
+            writer.line("            if (response.Content.Headers.ContentType?.MediaType == \"application/json\")")
+            writer.line("            {")
+            writer.line(f"                var responseJson = await response.Content.ReadFromJsonAsync({JSON_CONTEXT_NAME}.Default.JsonElement);")
+            writer.line("                Console.WriteLine($\"Response Content: {responseJson}\");")
+            writer.line("            }")
+            writer.line("            else")
+            writer.line("            {")
+            writer.line("                var responseContent = await response.Content.ReadAsStringAsync();")
+            writer.line("                Console.WriteLine($\"Response Content: {responseContent}\");")
+            writer.line("            }")
+        else:
+            writer.line("            var responseContent = await response.Content.ReadAsStringAsync();")
+            writer.line("            Console.WriteLine($\"Response Content: {responseContent}\");")
+        writer.line("        }")
+        writer.line("        catch (HttpRequestException ex)")
+        writer.line("        {")
+        writer.line("            Console.WriteLine($\"Request error: {ex.Message}\");")
+        writer.line("        }")
+        writer.line("        catch (Exception ex)")
+        writer.line("        {")
+        writer.line("            Console.WriteLine($\"General error: {ex.Message}\");")
+        writer.line("        }")
         
-        code_lines.append("    }")
-        code_lines.append("}")
+        writer.line("    }")
+        writer.line("}")
         
-        return "\n".join(code_lines)
+        if self.typed_json:
+            self._write_json_context(writer, dtos)
+
+    def _write_json_context(self, writer, dtos):
+        """Write the inferred records and the source-generated serializer context for them."""
+        if dtos:
+            dtos.write_records(writer)
+        writer.line("")
+        if dtos and dtos.root_type != ROOT_DTO_NAME:
+            # A list body: name its metadata property like an object body's
+            writer.line(f"[JsonSerializable(typeof({dtos.root_type}), TypeInfoPropertyName = \"{ROOT_DTO_NAME}\")]")
+        elif dtos:
+            writer.line(f"[JsonSerializable(typeof({ROOT_DTO_NAME}))]")
+        writer.line("[JsonSerializable(typeof(JsonElement))]")
+        writer.line(f"internal partial class {JSON_CONTEXT_NAME} : JsonSerializerContext")
+        writer.line("{")
+        writer.line("}")
+
+
+def _json_shape(value):
+    """Return the inferred shape of a decoded JSON value."""
+    if value is None:
+        return {'kind': 'null', 'nullable': True}
+    if isinstance(value, bool):
+        kind = 'bool'
+    elif isinstance(value, int):
+        if -2 ** 31 <= value < 2 ** 31:
+            kind = 'int'
+        elif -2 ** 63 <= value < 2 ** 63:
+            kind = 'long'
+        else:
+            kind = 'double'
+    elif isinstance(value, float):
+        kind = 'double'
+    elif isinstance(value, str):
+        kind = 'string'
+    elif isinstance(value, dict):
+        return {'kind': 'object', 'nullable': False,
+                'fields': {key: _json_shape(field) for key, field in value.items()}}
+    else:
+        item = None
+        for element in value:
+            item = _merge_shapes(item, _json_shape(element))
+        return {'kind': 'list', 'nullable': False, 'item': item}
+    return {'kind': kind, 'nullable': False}
+
+
+def _merge_shapes(a, b):
+    """Return one shape that values of shape a and of shape b both fit."""
+    if a is None or b is None:
+        return a or b
+    if a['kind'] == 'null' or b['kind'] == 'null':
+        merged = dict(b if a['kind'] == 'null' else a)
+    elif a['kind'] in NUMBER_KINDS and b['kind'] in NUMBER_KINDS:
+        merged = {'kind': max(a['kind'], b['kind'], key=NUMBER_KINDS.index)}
+    elif a['kind'] != b['kind']:
+        raise ValueError(f"array mixes {a['kind']} and {b['kind']} values")
+    elif a['kind'] == 'list':
+        merged = {'kind': 'list', 'item': _merge_shapes(a['item'], b['item'])}
+    elif a['kind'] == 'object':
+        fields = {}
+        for key in {**a['fields'], **b['fields']}:
+            if key in a['fields'] and key in b['fields']:
+                fields[key] = _merge_shapes(a['fields'][key], b['fields'][key])
+            else:
+                fields[key] = dict(a['fields'].get(key) or b['fields'][key], nullable=True, missing=True)
+        merged = {'kind': 'object', 'fields': fields}
+    else:
+        merged = {'kind': a['kind']}
+    merged['nullable'] = a['nullable'] or b['nullable']
+    # Missing keys are left out when serializing, unlike explicit nulls
+    merged['missing'] = a.get('missing', False) or b.get('missing', False)
+    merged['explicit_null'] = any(shape['kind'] == 'null' or shape.get('explicit_null', False)
+                                  for shape in (a, b))
+    return merged
+
+
+def _pascal_case(key):
+    """Return a C# property or type name for a JSON key."""
+    import re
+    name = "".join(part[0].upper() + part[1:] for part in re.split(r'[\W_]+', key) if part)
+    if not name:
+        return "Property"
+    return "_" + name if name[0].isdigit() else name
+
+
+def _singular(name):
+    """Return the record name for the items of an array property called name."""
+    if name.endswith('ies') and len(name) > 3:
+        return name[:-3] + 'y'
+    if name.endswith('s') and not name.endswith('ss') and len(name) > 1:
+        return name[:-1]
+    return name + "Item"
 
 
 def get_curl_input():
     """Get curl command from various input sources."""
-    if len(sys.argv) > 1:
-        # Command line argument
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('-'):
+        # Command line argument (options such as --timings are not part of it)
         return " ".join(sys.argv[1:])
     elif not sys.stdin.isatty():
         # Piped input
@@ -401,34 +622,51 @@ def main():
     parser = argparse.ArgumentParser(description="Convert cURL commands to C# HttpClient code")
     parser.add_argument('curl_command', nargs='*', help='cURL command to convert')
     parser.add_argument('--output', '-o', help='Output file to save C# code')
+    parser.add_argument('--no-pretty', action='store_true',
+                        help='Accepted for compatibility; C# output always embeds JSON bodies verbatim')
+    parser.add_argument('--client-factory', action='store_true',
+                        help='Register the pooled handler with IHttpClientFactory instead of a static HttpClient')
+    parser.add_argument('--max-connections', type=int, default=DEFAULT_MAX_CONNECTIONS, metavar='N',
+                        help='MaxConnectionsPerServer of the generated handler (default: %(default)s)')
+    parser.add_argument('--typed-json', action='store_true',
+                        help='Build JSON bodies from inferred records and use a source-generated '
+                             'System.Text.Json context for them and the response')
+    parser.add_argument('--timings', action='store_true',
+                        help='Print wall time per conversion phase as JSON on stderr')
     
     args = parser.parse_args()
+    timings = Timings() if args.timings else None
     
     if args.curl_command:
         curl_command = " ".join(args.curl_command)
     else:
         curl_command = get_curl_input()
+    if timings:
+        timings.mark('read')
     
     if not curl_command.strip():
         print("No curl command provided")
         return 1
     
-    converter = CurlToCSharp()
-    if converter.parse_curl_command(curl_command):
-        csharp_code = converter.generate_csharp_code()
-        
+    converter = CurlToCSharp(client_factory=args.client_factory, max_connections=args.max_connections,
+                             typed_json=args.typed_json)
+    if converter.parse_curl_command(curl_command, timings):
         if args.output:
             with open(args.output, 'w') as f:
-                f.write(csharp_code)
+                timed_output(converter.generate_csharp_code, f, timings)
             print(f"C# code saved to {args.output}")
         else:
-            print(csharp_code)
+            timed_output(converter.generate_csharp_code, sys.stdout, timings)
+            print()
     else:
         print("Failed to parse curl command")
         return 1
     
+    if timings:
+        timings.count += 1
+        timings.report('Curl2CSharp')
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(run_profiled(main))
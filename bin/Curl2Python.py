@@ -6,318 +6,644 @@ It can be used in several ways:
 1. As a command-line tool: `python Curl2Python.py 'curl ...'`
 2. By piping input: `echo "curl ..." | python Curl2Python.py`
 3. Asking user for input: `python Curl2Python.py` and then entering the cURL command, ending with a blank line.
+
+With `--flavor session` the code sends the request through a requests.Session
+with a pooled HTTPAdapter, from a send_request(session) function that can be
+called repeatedly without opening a new connection each time. `--flavor async`
+generates an httpx.AsyncClient version instead, with a runner that sends the
+request --repeat times, at most --concurrency at once, to reproduce load.
+`--flavor stdlib` needs nothing outside the standard library: the request is
+sent on a persistent http.client connection and the response read in chunks,
+so the script starts without the cost of importing requests.
+`--batch FILE` converts every command in FILE into one such module sharing
+the session, client or connections.
 """
 
 import sys
-import re
+import io
 import argparse
-import shlex
 import json
-from urllib.parse import urlparse, parse_qs
+
+# The parser and urllib are imported where they are used, so a conversion
+# answered by a running daemon never loads them
+from CurlDaemon import reads_local_input, send_request
+from CurlTimings import Timings, profile_mode, run_profiled, timed_output
+
+# 'requests' calls requests.get() and friends directly; 'session' wraps each
+# request in a function sharing one pooled requests.Session, 'async' in a
+# coroutine sharing one httpx.AsyncClient, and 'stdlib' in a function sending
+# it on a persistent http.client connection
+FLAVORS = ('requests', 'session', 'async', 'stdlib')
+
+# Connections the generated session keeps open per host (requests' default)
+DEFAULT_POOL_SIZE = 10
+
+# Times the async runner sends each request, and how many it keeps in flight
+DEFAULT_REPEAT = 100
+DEFAULT_CONCURRENCY = 10
+
+# Methods requests.Session and httpx.AsyncClient have a shortcut for; others
+# go through .request()
+SESSION_METHODS = ('get', 'post', 'put', 'patch', 'delete', 'head', 'options')
+
+# Written once into stdlib modules with -F fields or files, as http.client
+# has no multipart support of its own
+MULTIPART_ENCODER = r'''def encode_multipart(fields, files):
+    """Return a multipart/form-data body and its Content-Type."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                     f'{value}\r\n'.encode())
+    for name, path in files.items():
+        with open(path, 'rb') as f:
+            content = f.read()
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+                     f'filename="{os.path.basename(path)}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+'''
 
 
 class CurlToPython:
-    def __init__(self):
-        self.method = 'GET'
-        self.url = ''
-        self.headers = {}
-        self.data = None
-        self.json_data = None
-        self.params = {}
-        self.auth = None
-        self.cookies = {}
-        self.files = {}
-        self.verify = True
-        self.allow_redirects = True
-        self.timeout = None
-        self.proxies = {}
-
-    def parse_curl_command(self, curl_command):
-        """Parse a cURL command and extract relevant information."""
-        # Remove 'curl' from the beginning and clean up the command
-        curl_command = curl_command.strip()
-        if curl_command.startswith('curl'):
-            curl_command = curl_command[4:].strip()
-        
-        # Use shlex to properly split the command while respecting quotes
+    def __init__(self, request=None, pretty_json=True, deterministic=False, flavor='requests',
+                 pool_size=DEFAULT_POOL_SIZE, repeat=DEFAULT_REPEAT, concurrency=DEFAULT_CONCURRENCY):
+        # Python output never embeds anything run-specific, so deterministic
+        # is only accepted for a constructor matching the other converters
+        self.request = request
+        self.pretty_json = pretty_json
+        self.deterministic = deterministic
+        self.flavor = flavor
+        self.pool_size = pool_size
+        self.repeat = repeat
+        self.concurrency = concurrency
+
+    def parse_curl_command(self, curl_command, timings=None):
+        """Parse a cURL command into the shared request model."""
+        from CurlRequest import parse_curl_command
         try:
-            tokens = shlex.split(curl_command)
+            self.request = parse_curl_command(curl_command, timings)
         except ValueError as e:
             print(f"Error parsing curl command: {e}")
             return False
-
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-            
-            if token in ['-X', '--request']:
-                i += 1
-                if i < len(tokens):
-                    self.method = tokens[i].upper()
-            
-            elif token in ['-H', '--header']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_header(tokens[i])
-            
-            elif token in ['-d', '--data', '--data-raw']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_data(tokens[i])
-            
-            elif token in ['--data-binary']:
-                i += 1
-                if i < len(tokens):
-                    self.data = tokens[i]
-            
-            elif token in ['-u', '--user']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_auth(tokens[i])
-            
-            elif token in ['-b', '--cookie']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_cookies(tokens[i])
-            
-            elif token in ['-F', '--form']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_form_data(tokens[i])
-            
-            elif token in ['-k', '--insecure']:
-                self.verify = False
-            
-            elif token in ['-L', '--location']:
-                self.allow_redirects = True
-            
-            elif token in ['--max-time']:
-                i += 1
-                if i < len(tokens):
-                    self.timeout = float(tokens[i])
-            
-            elif token in ['--proxy']:
-                i += 1
-                if i < len(tokens):
-                    self._parse_proxy(tokens[i])
-            
-            elif token.startswith('http://') or token.startswith('https://'):
-                self.url = token
-                # Parse query parameters from URL
-                parsed_url = urlparse(token)
-                if parsed_url.query:
-                    self.params.update(parse_qs(parsed_url.query, keep_blank_values=True))
-                    # Remove query string from URL
-                    self.url = token.split('?')[0]
-            
-            elif token.startswith('-'):
-                # Skip unknown options
-                pass
-            
-            else:
-                # Assume it's the URL if we haven't found one yet
-                if not self.url:
-                    self.url = token
-                    parsed_url = urlparse(token)
-                    if parsed_url.query:
-                        self.params.update(parse_qs(parsed_url.query, keep_blank_values=True))
-                        self.url = token.split('?')[0]
-            
-            i += 1
         
+        warning = self.request.unhandled_warning()
+        if warning:
+            print(warning, file=sys.stderr)
         return True
 
-    def _parse_header(self, header):
-        """Parse a header string and add it to headers dict."""
-        if ':' in header:
-            key, value = header.split(':', 1)
-            key = key.strip()
-            value = value.strip()
-            
-            # Handle special headers
-            if key.lower() == 'content-type' and value == 'application/json' and self.data:
-                try:
-                    self.json_data = json.loads(self.data)
-                    self.data = None
-                except json.JSONDecodeError:
-                    pass
-            
-            self.headers[key] = value
+    def generate_python_code(self, out=None):
+        """Generate Python code using requests library.
 
-    def _parse_data(self, data):
-        """Parse data and determine if it's JSON, form data, or raw data."""
-        self.data = data
+        The code is streamed to out (a file object or write callable) as it
+        is produced; without one it is returned as a string.
+        """
+        if out is None:
+            buffer = io.StringIO()
+            self.generate_python_code(buffer)
+            return buffer.getvalue()
         
-        # Try to parse as JSON
-        try:
-            self.json_data = json.loads(data)
-            self.data = None
-        except json.JSONDecodeError:
-            # Check if it looks like form data
-            if '=' in data and '&' in data:
-                # Parse as form data
-                params = data.split('&')
-                form_data = {}
-                for param in params:
-                    if '=' in param:
-                        key, value = param.split('=', 1)
-                        form_data[key] = value
-                self.data = form_data
-            # Otherwise keep as raw data
-
-    def _parse_auth(self, auth):
-        """Parse authentication string."""
-        if ':' in auth:
-            username, password = auth.split(':', 1)
-            self.auth = (username, password)
-
-    def _parse_cookies(self, cookies):
-        """Parse cookies string."""
-        for cookie in cookies.split(';'):
-            if '=' in cookie:
-                key, value = cookie.split('=', 1)
-                self.cookies[key.strip()] = value.strip()
-
-    def _parse_form_data(self, form_data):
-        """Parse form data for file uploads or form fields."""
-        if '=' in form_data:
-            key, value = form_data.split('=', 1)
-            if value.startswith('@'):
-                # File upload
-                filename = value[1:]
-                self.files[key] = filename
+        if self.flavor != 'requests':
+            self.generate_python_module([self.request], out)
+            return
+        
+        from CurlRequest import CodeWriter
+        writer = CodeWriter(out)
+        req = self.request
+        if not req.url:
+            writer.line("# Error: No URL found in curl command")
+            return
+        
+        json_data, data, headers = self._request_body(req)
+        
+        writer.line("import requests")
+        
+        if json_data is not None:
+            writer.line("import json")
+        
+        writer.line("")
+        self._write_request_variables(writer, req, json_data, data, headers)
+        
+        # Request call, inside a with statement if it sends files
+        indent = self._write_file_handles(writer, req)
+        request_args = ["url"] + [f"{name}={value}" for name, value in
+                                  self._request_arguments(req, json_data, data, headers)]
+        method_call = f"response = requests.{req.method.lower()}(\n    " + ",\n    ".join(request_args) + "\n)"
+        writer.line(indent + method_call.replace("\n", "\n" + indent))
+        
+        # Response handling
+        writer.line("")
+        self._write_response_handling(writer)
+
+    def generate_python_module(self, requests, out=None):
+        """Generate a module sending each request through one shared, pooled client.
+
+        The client is a requests.Session, an httpx.AsyncClient for the async
+        flavor, or one http.client connection per host for stdlib. A single
+        request becomes send_request(client, **kwargs), several become
+        send_request_1, send_request_2 and so on; keyword arguments are passed
+        on to the client call, replacing any the command set (stdlib functions
+        take only the connection). Running the module sends each request
+        once, or repeatedly and concurrently for async.
+        """
+        if out is None:
+            buffer = io.StringIO()
+            self.generate_python_module(requests, buffer)
+            return buffer.getvalue()
+        
+        from urllib.parse import urlparse
+        from CurlRequest import CodeWriter
+        writer = CodeWriter(out)
+        if not all(req.url for req in requests):
+            writer.line("# Error: No URL found in curl command")
+            return
+        
+        if len(requests) == 1:
+            names = ["send_request"]
+        else:
+            names = [f"send_request_{number}" for number in range(1, len(requests) + 1)]
+        
+        if self.flavor == 'stdlib':
+            self._write_stdlib_module(writer, requests, names)
+            return
+        
+        is_async = self.flavor == 'async'
+        if is_async:
+            client = "client"
+            writer.line("import asyncio")
+            writer.line("import time")
+            writer.line("")
+            writer.line("import httpx")
+            writer.line("")
+            writer.line("# Each request is sent REPEAT times, with at most CONCURRENCY in flight")
+            writer.line(f"REPEAT = {self.repeat}")
+            writer.line(f"CONCURRENCY = {self.concurrency}")
+        else:
+            client = "session"
+            # One pool per scheme and host, each keeping up to pool_size connections
+            hosts = {urlparse(req.url)[:2] for req in requests}
+            writer.line("import requests")
+            writer.line("from requests.adapters import HTTPAdapter")
+            writer.line("")
+            writer.line("# Shared by every request so connections are kept alive and reused")
+            writer.line("session = requests.Session()")
+            writer.line(f"adapter = HTTPAdapter(pool_connections={len(hosts)}, pool_maxsize={self.pool_size})")
+            writer.line("session.mount('http://', adapter)")
+            writer.line("session.mount('https://', adapter)")
+        
+        for name, req in zip(names, requests):
+            json_data, data, headers = self._request_body(req)
+            writer.line("")
+            writer.line("")
+            writer.line(f"# {req.method} {req.url}")
+            writer.line(f"{'async def' if is_async else 'def'} {name}({client}, **kwargs):")
+            self._write_request_variables(writer, req, json_data, data, headers, indent="    ")
+            indent = self._write_file_handles(writer, req, "    ")
+            
+            # The caller's keyword arguments replace the ones from the command
+            # rather than being passed twice
+            request_args = self._request_arguments(req, json_data, data, headers)
+            if request_args:
+                writer.line(f"{indent}arguments = {{")
+                for key, value in request_args:
+                    writer.line(f"{indent}    '{key}': {value},")
+                writer.line(f"{indent}    **kwargs,")
+                writer.line(f"{indent}}}")
+            call_args = ["url", "**arguments" if request_args else "**kwargs"]
+            method = req.method.lower()
+            if method in SESSION_METHODS:
+                call = f"{client}.{method}("
             else:
-                # Regular form field
-                if not self.data:
-                    self.data = {}
-                if isinstance(self.data, dict):
-                    self.data[key] = value
+                call = f"{client}.request("
+                call_args.insert(0, repr(req.method))
+            if is_async:
+                call = "await " + call
+            writer.line(f"{indent}return {call}{', '.join(call_args)})")
+        
+        if len(names) > 1:
+            writer.line("")
+            writer.line("")
+            writer.line("# Every request in the module, in order")
+            writer.line("SENDERS = [")
+            for name in names:
+                writer.line(f"    {name},")
+            writer.line("]")
+        
+        if is_async:
+            self._write_async_runner(writer, requests, names)
+            return
+        
+        writer.line("")
+        writer.line("")
+        writer.line("if __name__ == '__main__':")
+        if len(names) == 1:
+            writer.line("    response = send_request(session)")
+            self._write_response_handling(writer, "    ")
+        else:
+            writer.line("    for send in SENDERS:")
+            writer.line("        response = send(session)")
+            self._write_response_handling(writer, "        ")
+
+    def _write_async_runner(self, writer, requests, names):
+        """Write main(), which sends every request REPEAT times at CONCURRENCY and sums up the results."""
+        # httpx sets these on the client rather than per request
+        client_args = ["limits=limits"]
+        if any(req.allow_redirects for req in requests):
+            # requests follows redirects by default, httpx doesn't
+            client_args.append("follow_redirects=True")
+        if not all(req.verify for req in requests):
+            client_args.append("verify=False")
+        proxy = next((req.proxies.get('https') or req.proxies.get('http')
+                      for req in requests if req.proxies), None)
+        if proxy:
+            client_args.append(f"proxy='{proxy}'")
+        
+        writer.line("")
+        writer.line("")
+        writer.line("async def main(repeat=REPEAT, concurrency=CONCURRENCY):")
+        writer.line("    semaphore = asyncio.Semaphore(concurrency)")
+        writer.line("    # Enough pooled keep-alive connections that no request waits for one")
+        writer.line("    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)")
+        writer.line(f"    async with httpx.AsyncClient({', '.join(client_args)}) as client:")
+        writer.line("")
+        writer.line("        async def bounded(send):")
+        writer.line("            async with semaphore:")
+        writer.line("                return await send(client)")
+        writer.line("")
+        writer.line("        start = time.perf_counter()")
+        writer.line("        responses = await asyncio.gather(")
+        if len(names) == 1:
+            writer.line("            *(bounded(send_request) for _ in range(repeat)),")
+        else:
+            writer.line("            *(bounded(send) for send in SENDERS for _ in range(repeat)),")
+        writer.line("            return_exceptions=True")
+        writer.line("        )")
+        writer.line("        elapsed = time.perf_counter() - start")
+        writer.line("")
+        writer.line("    results = {}")
+        writer.line("    for response in responses:")
+        writer.line("        key = type(response).__name__ if isinstance(response, Exception) else response.status_code")
+        writer.line("        results[key] = results.get(key, 0) + 1")
+        writer.line("    print(f'{len(responses)} requests in {elapsed:.2f}s ({len(responses) / elapsed:.1f}/s), '")
+        writer.line("          f'concurrency {concurrency}')")
+        writer.line("    print(f'Results: {results}')")
+        writer.line("")
+        writer.line("")
+        writer.line("if __name__ == '__main__':")
+        writer.line("    asyncio.run(main())")
 
-    def _parse_proxy(self, proxy):
-        """Parse proxy configuration."""
-        self.proxies = {'http': proxy, 'https': proxy}
+    def _write_stdlib_module(self, writer, requests, names):
+        """Write an http.client module: one persistent connection per host and a send function per request."""
+        bodies = [self._request_body(req) for req in requests]
+        
+        # Requests to the same scheme and host share a connection, which
+        # takes the first timeout, proxy and certificate check asking for one
+        origins = {}
+        for req in requests:
+            origin = origins.setdefault(_origin(req.url), {'timeout': None, 'proxy': None, 'verify': True})
+            origin['timeout'] = origin['timeout'] or req.timeout
+            origin['proxy'] = origin['proxy'] or _proxy_host(req)
+            origin['verify'] = origin['verify'] and req.verify
+        if len(origins) == 1:
+            connections = {next(iter(origins)): "connection"}
+        else:
+            connections = {origin: f"connection_{number}" for number, origin in enumerate(origins, 1)}
+        insecure = any(scheme == 'https' and not options['verify']
+                       for (scheme, _), options in origins.items())
+        multipart = any(req.form or req.files for req in requests)
+        
+        # Only import what the requests use, keeping the module quick to start
+        imports = ["http.client"]
+        if any(json_data is not None for json_data, _, _ in bodies):
+            imports.append("json")
+        if multipart or any(req.body_file for req in requests):
+            imports.append("os")
+        if insecure:
+            imports.append("ssl")
+        imports.append("sys")
+        if multipart:
+            imports.append("uuid")
+        for module in imports:
+            writer.line(f"import {module}")
+        if any(req.auth for req in requests):
+            writer.line("from base64 import b64encode")
+        if any(req.params or isinstance(data, dict) and not (req.form or req.files)
+               for req, (_, data, _) in zip(requests, bodies)):
+            writer.line("from urllib.parse import urlencode")
+        
+        if insecure:
+            writer.line("")
+            writer.line("# Certificates aren't checked, like curl -k")
+            writer.line("insecure = ssl.create_default_context()")
+            writer.line("insecure.check_hostname = False")
+            writer.line("insecure.verify_mode = ssl.CERT_NONE")
+        
+        writer.line("")
+        writer.line("# Kept open and reused by every request to the same host")
+        for (scheme, host), name in connections.items():
+            options = origins[(scheme, host)]
+            connection_args = [repr(options['proxy'] or host)]
+            if options['timeout']:
+                connection_args.append(f"timeout={options['timeout']}")
+            if scheme == 'https' and not options['verify']:
+                connection_args.append("context=insecure")
+            connection_class = "HTTPSConnection" if scheme == 'https' else "HTTPConnection"
+            writer.line(f"{name} = http.client.{connection_class}({', '.join(connection_args)})")
+            if options['proxy'] and scheme == 'https':
+                writer.line(f"{name}.set_tunnel({host!r})")
+        
+        if multipart:
+            writer.line("")
+            writer.line("")
+            for line in MULTIPART_ENCODER.splitlines():
+                writer.line(line)
+        
+        for name, req, (json_data, data, headers) in zip(names, requests, bodies):
+            writer.line("")
+            writer.line("")
+            writer.line(f"# {req.method} {req.url}")
+            writer.line(f"def {name}(connection):")
+            self._write_stdlib_request(writer, req, json_data, data, headers, origins[_origin(req.url)])
+        
+        if len(names) > 1:
+            writer.line("")
+            writer.line("")
+            writer.line("# Every request in the module, in order, with the connection it is sent on")
+            writer.line("SENDERS = [")
+            for name, req in zip(names, requests):
+                writer.line(f"    ({name}, {connections[_origin(req.url)]}),")
+            writer.line("]")
+        
+        writer.line("")
+        writer.line("")
+        writer.line("if __name__ == '__main__':")
+        if len(names) == 1:
+            writer.line(f"    response = send_request({connections[_origin(requests[0].url)]})")
+            indent = "    "
+        else:
+            writer.line("    for send, connection in SENDERS:")
+            writer.line("        response = send(connection)")
+            indent = "        "
+        writer.line(indent + "print(f'Status Code: {response.status}')")
+        writer.line(indent + "print(f'Response Headers: {dict(response.getheaders())}')")
+        writer.line(indent + "print('Response Content:', flush=True)")
+        writer.line(indent + "# Streamed in chunks; it must be read to the end before the connection is reused")
+        writer.line(indent + "while chunk := response.read(65536):")
+        writer.line(indent + "    sys.stdout.buffer.write(chunk)")
+        writer.line(indent + "print()")
 
-    def generate_python_code(self):
-        """Generate Python code using requests library."""
-        if not self.url:
-            return "# Error: No URL found in curl command"
+    def _write_stdlib_request(self, writer, req, json_data, data, headers, origin):
+        """Write the body of an http.client send function: path, headers, body and the request itself."""
+        from urllib.parse import urlparse
+        # A plain HTTP proxy is sent the whole URL instead of the path
+        if origin['proxy'] and req.url.startswith('http://'):
+            writer.line(f"    path = '{req.url}'")
+        else:
+            writer.line(f"    path = '{urlparse(req.url).path or '/'}'")
+        
+        multipart = bool(req.form or req.files)
+        inline_body = json_data is not None or bool(data) or multipart
+        if (inline_body or req.body_file) and not multipart and not any(key.lower() == 'content-type' for key in headers):
+            # http.client never adds one; send what curl would
+            if json_data is not None:
+                headers['Content-Type'] = 'application/json'
+            elif req.body_content_type():
+                headers['Content-Type'] = req.body_content_type()
         
-        code_lines = []
-        code_lines.append("import requests")
+        writer.line("")
+        if headers:
+            writer.line("    headers = {")
+            for key, value in headers.items():
+                writer.line(f"        '{key}': '{value}',")
+            writer.line("    }")
+        else:
+            writer.line("    headers = {}")
+        
+        if req.params:
+            writer.line("")
+            writer.line("    params = {")
+            for key, values in req.params.items():
+                if isinstance(values, list) and len(values) == 1:
+                    writer.line(f"        '{key}': '{values[0]}',")
+                else:
+                    writer.line(f"        '{key}': {values},")
+            writer.line("    }")
+            writer.line("    path += '?' + urlencode(params, doseq=True)")
         
-        if self.json_data:
-            code_lines.append("import json")
+        if json_data is not None or data:
+            self._write_body_variable(writer, json_data, data, "    ")
+        if multipart:
+            writer.line("")
+            writer.line("    files = {")
+            for key, filename in req.files.items():
+                writer.line(f"        '{key}': '{filename}',")
+            writer.line("    }")
+            writer.line(f"    body, content_type = encode_multipart({'data' if data else '{}'}, files)")
+            writer.line("    headers['Content-Type'] = content_type")
+        elif json_data is not None:
+            writer.line("    body = json.dumps(json_data).encode()")
+        elif isinstance(data, dict):
+            writer.line("    body = urlencode(data).encode()")
+        elif data:
+            writer.line("    body = data.encode()")
         
-        code_lines.append("")
+        if req.auth:
+            writer.line("")
+            writer.line(f"    auth = ('{req.auth[0]}', '{req.auth[1]}')")
+            writer.line("    headers['Authorization'] = 'Basic ' + b64encode(':'.join(auth).encode()).decode()")
+        
+        writer.line("")
+        if inline_body:
+            writer.line("    headers['Content-Length'] = str(len(body))")
+            writer.line(f"    connection.request('{req.method}', path, body=body, headers=headers)")
+        elif req.body_file:
+            # Streamed from the file rather than loaded into memory
+            writer.line(f"    with open({req.body_file!r}, 'rb') as body:")
+            writer.line("        headers['Content-Length'] = str(os.fstat(body.fileno()).st_size)")
+            writer.line(f"        connection.request('{req.method}', path, body=body, headers=headers)")
+        else:
+            writer.line(f"    connection.request('{req.method}', path, headers=headers)")
+        writer.line("    return connection.getresponse()")
+
+    def _request_body(self, req):
+        """Return (json_data, data, headers) for the request's body and headers."""
+        # Small JSON bodies are emitted as a dict, form-encoded bodies as a
+        # dict of fields, and anything else (including large or unformatted
+        # JSON) as the raw string
+        json_data = req.structured_json(self.pretty_json)
+        data = req.form_fields() or (req.body if json_data is None else None)
+        if req.form and not data:
+            data = dict(req.form)
         
+        headers = dict(req.headers)
+        if json_data is None and req.body_kind == 'json' and not req.content_type:
+            # Raw JSON sent as data= needs the header requests' json= would add
+            headers['Content-Type'] = 'application/json'
+        if self.flavor in ('async', 'stdlib') and req.cookies:
+            # httpx deprecates per-request cookies, and http.client has none
+            headers['Cookie'] = '; '.join(f"{key}={value}" for key, value in req.cookies.items())
+        return json_data, data, headers
+
+    def _write_request_variables(self, writer, req, json_data, data, headers, indent=""):
+        """Write the url, headers, params, body, files, cookies, auth and proxies assignments."""
         # URL
-        code_lines.append(f"url = '{self.url}'")
+        writer.line(f"{indent}url = '{req.url}'")
         
         # Headers
-        if self.headers:
-            code_lines.append("")
-            code_lines.append("headers = {")
-            for key, value in self.headers.items():
-                code_lines.append(f"    '{key}': '{value}',")
-            code_lines.append("}")
+        if headers:
+            writer.line("")
+            writer.line(f"{indent}headers = {{")
+            for key, value in headers.items():
+                writer.line(f"{indent}    '{key}': '{value}',")
+            writer.line(f"{indent}}}")
         
         # Parameters
-        if self.params:
-            code_lines.append("")
-            code_lines.append("params = {")
-            for key, values in self.params.items():
+        if req.params:
+            writer.line("")
+            writer.line(f"{indent}params = {{")
+            for key, values in req.params.items():
                 if isinstance(values, list) and len(values) == 1:
-                    code_lines.append(f"    '{key}': '{values[0]}',")
+                    writer.line(f"{indent}    '{key}': '{values[0]}',")
                 else:
-                    code_lines.append(f"    '{key}': {values},")
-            code_lines.append("}")
+                    writer.line(f"{indent}    '{key}': {values},")
+            writer.line(f"{indent}}}")
         
         # Data
-        if self.json_data:
-            code_lines.append("")
-            code_lines.append("json_data = " + json.dumps(self.json_data, indent=4))
-        elif self.data:
-            code_lines.append("")
-            if isinstance(self.data, dict):
-                code_lines.append("data = {")
-                for key, value in self.data.items():
-                    code_lines.append(f"    '{key}': '{value}',")
-                code_lines.append("}")
-            else:
-                code_lines.append(f"data = '{self.data}'")
-        
-        # Files
-        if self.files:
-            code_lines.append("")
-            code_lines.append("files = {")
-            for key, filename in self.files.items():
-                code_lines.append(f"    '{key}': open('{filename}', 'rb'),")
-            code_lines.append("}")
-        
-        # Cookies
-        if self.cookies:
-            code_lines.append("")
-            code_lines.append("cookies = {")
-            for key, value in self.cookies.items():
-                code_lines.append(f"    '{key}': '{value}',")
-            code_lines.append("}")
+        if json_data is not None or data:
+            self._write_body_variable(writer, json_data, data, indent)
+        elif req.body_file and self.flavor == 'async':
+            # httpx.AsyncClient can't stream from a blocking file object
+            writer.line("")
+            writer.line(f"{indent}with open({req.body_file!r}, 'rb') as f:")
+            writer.line(f"{indent}    data = f.read()")
+        
+        # Cookies (sent as a header by the async flavor)
+        if req.cookies and self.flavor != 'async':
+            writer.line("")
+            writer.line(f"{indent}cookies = {{")
+            for key, value in req.cookies.items():
+                writer.line(f"{indent}    '{key}': '{value}',")
+            writer.line(f"{indent}}}")
         
         # Auth
-        if self.auth:
-            code_lines.append("")
-            code_lines.append(f"auth = ('{self.auth[0]}', '{self.auth[1]}')")
-        
-        # Proxies
-        if self.proxies:
-            code_lines.append("")
-            code_lines.append("proxies = {")
-            for key, value in self.proxies.items():
-                code_lines.append(f"    '{key}': '{value}',")
-            code_lines.append("}")
-        
-        # Request call
-        code_lines.append("")
-        request_args = ["url"]
-        
-        if self.headers:
-            request_args.append("headers=headers")
-        if self.params:
-            request_args.append("params=params")
-        if self.json_data:
-            request_args.append("json=json_data")
-        elif self.data:
-            request_args.append("data=data")
-        if self.files:
-            request_args.append("files=files")
-        if self.cookies:
-            request_args.append("cookies=cookies")
-        if self.auth:
-            request_args.append("auth=auth")
-        if self.proxies:
-            request_args.append("proxies=proxies")
-        if not self.verify:
-            request_args.append("verify=False")
-        if not self.allow_redirects:
-            request_args.append("allow_redirects=False")
-        if self.timeout:
-            request_args.append(f"timeout={self.timeout}")
-        
-        method_call = f"response = requests.{self.method.lower()}(\n    " + ",\n    ".join(request_args) + "\n)"
-        code_lines.append(method_call)
+        if req.auth:
+            writer.line("")
+            writer.line(f"{indent}auth = ('{req.auth[0]}', '{req.auth[1]}')")
         
-        # Response handling
-        code_lines.append("")
-        code_lines.append("print(f'Status Code: {response.status_code}')")
-        code_lines.append("print(f'Response Headers: {response.headers}')")
-        code_lines.append("print(f'Response Content: {response.text}')")
+        # Proxies (set on the client by the async flavor)
+        if req.proxies and self.flavor != 'async':
+            writer.line("")
+            writer.line(f"{indent}proxies = {{")
+            for key, value in req.proxies.items():
+                writer.line(f"{indent}    '{key}': '{value}',")
+            writer.line(f"{indent}}}")
+
+    def _write_file_handles(self, writer, req, indent=""):
+        """Open a streamed body and uploaded files in a with statement before the request call.
+
+        Returns the indent for the call, which goes inside the with block
+        so the files are closed once the request has been sent.
+        """
+        writer.line("")
+        handles = []
+        if req.body_file and self.flavor != 'async':
+            # requests streams file objects instead of loading them
+            handles.append(f"open({req.body_file!r}, 'rb') as data")
+        uploads = {key: f"file_{number}" for number, key in enumerate(req.files, 1)}
+        for key, filename in req.files.items():
+            handles.append(f"open({filename!r}, 'rb') as {uploads[key]}")
+        if not handles:
+            return indent
         
-        return "\n".join(code_lines)
+        writer.line(f"{indent}with {', '.join(handles)}:")
+        indent += "    "
+        if uploads:
+            writer.line(f"{indent}files = {{")
+            for key, name in uploads.items():
+                writer.line(f"{indent}    '{key}': {name},")
+            writer.line(f"{indent}}}")
+        return indent
+
+    def _write_body_variable(self, writer, json_data, data, indent=""):
+        """Write the json_data or data assignment holding an inline body."""
+        from CurlRequest import BODY_CHUNK_SIZE
+        writer.line("")
+        if json_data is not None:
+            # JSON strings never contain raw newlines, so this only indents lines
+            writer.line(indent + ("json_data = " + json.dumps(json_data, indent=4)).replace("\n", "\n" + indent))
+        elif isinstance(data, dict):
+            writer.line(f"{indent}data = {{")
+            for key, value in data.items():
+                writer.line(f"{indent}    '{key}': '{value}',")
+            writer.line(f"{indent}}}")
+        elif len(data) <= BODY_CHUNK_SIZE:
+            writer.line(f"{indent}data = {data!r}")
+        else:
+            # Implicitly concatenated literals keep each piece small
+            writer.line(f"{indent}data = (")
+            for chunk in writer.chunks(data):
+                writer.line(f"{indent}    {chunk!r}")
+            writer.line(f"{indent})")
+
+    def _request_arguments(self, req, json_data, data, headers):
+        """Return (keyword, expression) pairs passing the written variables to requests or httpx."""
+        is_async = self.flavor == 'async'
+        request_args = []
+        if headers:
+            request_args.append(("headers", "headers"))
+        if req.params:
+            request_args.append(("params", "params"))
+        if json_data is not None:
+            request_args.append(("json", "json_data"))
+        elif is_async and (req.body_file or data and not isinstance(data, dict)):
+            # httpx takes raw bodies as content=, only form fields as data=
+            request_args.append(("content", "data"))
+        elif data or req.body_file:
+            request_args.append(("data", "data"))
+        if req.files:
+            request_args.append(("files", "files"))
+        if req.cookies and not is_async:
+            request_args.append(("cookies", "cookies"))
+        if req.auth:
+            request_args.append(("auth", "auth"))
+        if req.proxies and not is_async:
+            request_args.append(("proxies", "proxies"))
+        if not req.verify and not is_async:
+            request_args.append(("verify", "False"))
+        if not req.allow_redirects:
+            request_args.append(("follow_redirects", "False") if is_async else ("allow_redirects", "False"))
+        if req.timeout:
+            request_args.append(("timeout", f"{req.timeout}"))
+        return request_args
+
+    def _write_response_handling(self, writer, indent=""):
+        """Print the response's status, headers and body."""
+        writer.line(indent + "print(f'Status Code: {response.status_code}')")
+        writer.line(indent + "print(f'Response Headers: {response.headers}')")
+        writer.line(indent + "print(f'Response Content: {response.text}')")
+
+
+def _origin(url):
+    """Return (scheme, host[:port]) of url, which http.client connects to."""
+    from urllib.parse import urlparse
+    parsed_url = urlparse(url)
+    return parsed_url.scheme, parsed_url.netloc.rpartition('@')[2]
+
+
+def _proxy_host(req):
+    """Return host[:port] of the request's proxy, or None."""
+    proxy = req.proxies.get('https') or req.proxies.get('http')
+    if not proxy:
+        return None
+    # curl -x accepts a bare host:port
+    return _origin(proxy if '://' in proxy else 'http://' + proxy)[1]
 
 
 def get_curl_input():
     """Get curl command from various input sources."""
-    if len(sys.argv) > 1:
-        # Command line argument
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('-'):
+        # Command line argument (options such as --timings are not part of it)
         return " ".join(sys.argv[1:])
     elif not sys.stdin.isatty():
         # Piped input
@@ -342,35 +668,138 @@ def main():
     parser = argparse.ArgumentParser(description="Convert cURL commands to Python requests code")
     parser.add_argument('curl_command', nargs='*', help='cURL command to convert')
     parser.add_argument('--output', '-o', help='Output file to save Python code')
+    parser.add_argument('--no-pretty', action='store_true',
+                        help='Embed JSON bodies verbatim instead of re-formatting them as a dict')
+    parser.add_argument('--flavor', choices=FLAVORS,
+                        help="Code to generate: plain requests calls, send_request functions sharing "
+                             "a pooled requests.Session, coroutines sharing an httpx.AsyncClient with "
+                             "a concurrent runner, or functions using only http.client "
+                             "(default: requests, or session with --batch)")
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE, metavar='N',
+                        help='Connections the generated session keeps per host (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, metavar='N',
+                        help='Times the async runner sends each request (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, metavar='C',
+                        help='Requests the async runner keeps in flight (default: %(default)s)')
+    parser.add_argument('--batch', metavar='FILE',
+                        help='Convert every curl command in FILE (use - for stdin) into one module')
+    parser.add_argument('--socket', metavar='PATH',
+                        help='Conversion daemon socket started by Curl2All.py --serve')
+    parser.add_argument('--no-daemon', action='store_true',
+                        help='Always convert in this process, even if a daemon is running')
+    parser.add_argument('--timings', action='store_true',
+                        help='Print wall time per conversion phase as JSON on stderr')
     
     args = parser.parse_args()
+    timings = Timings() if args.timings else None
+    flavor = args.flavor or ('session' if args.batch else 'requests')
+    
+    if args.batch:
+        if flavor == 'requests':
+            print("Error: --batch needs a flavor with a shared client, such as --flavor session")
+            return 1
+        return convert_batch(args.batch, args, flavor, timings)
     
     if args.curl_command:
         curl_command = " ".join(args.curl_command)
     else:
         curl_command = get_curl_input()
+    if timings:
+        timings.mark('read')
     
     if not curl_command.strip():
         print("No curl command provided")
         return 1
     
-    converter = CurlToPython()
-    if converter.parse_curl_command(curl_command):
-        python_code = converter.generate_python_code()
-        
-        if args.output:
-            with open(args.output, 'w') as f:
-                f.write(python_code)
-            print(f"Python code saved to {args.output}")
-        else:
-            print(python_code)
+    # A running daemon already has everything loaded; otherwise convert here.
+    # Timed and profiled runs measure this process's own conversion, the
+    # daemon only generates the default flavor, and @file or stdin data has
+    # to be read from this process's working directory and stdin
+    reply = None
+    if (not args.no_daemon and not timings and not profile_mode() and flavor == 'requests'
+            and not reads_local_input(curl_command)):
+        reply = send_request({'op': 'convert', 'target': 'python', 'command': curl_command,
+                              'pretty_json': not args.no_pretty}, args.socket)
+    
+    if reply is not None:
+        if not reply['ok']:
+            print(reply['error'])
+            print("Failed to parse curl command")
+            return 1
+        if reply['warning']:
+            print(reply['warning'], file=sys.stderr)
+        generate = lambda out: out.write(reply['output'])
+    else:
+        converter = CurlToPython(pretty_json=not args.no_pretty, flavor=flavor, pool_size=args.pool_size,
+                                 repeat=args.repeat, concurrency=args.concurrency)
+        if not converter.parse_curl_command(curl_command, timings):
+            print("Failed to parse curl command")
+            return 1
+        generate = converter.generate_python_code
+    
+    write_output(generate, args.output, timings)
+    
+    if timings:
+        timings.count += 1
+        timings.report('Curl2Python')
+    return 0
+
+
+def write_output(generate, output, timings=None):
+    """Write generated code to the output file, or to stdout without one."""
+    if output:
+        with open(output, 'w') as f:
+            timed_output(generate, f, timings)
+        print(f"Python code saved to {output}")
     else:
-        print("Failed to parse curl command")
+        timed_output(generate, sys.stdout, timings)
+        print()
+
+
+def convert_batch(batch_file, args, flavor, timings=None):
+    """Convert every curl command in batch_file ('-' for stdin) into one module sharing a session."""
+    from CurlRequest import parse_curl_command, split_curl_commands
+    try:
+        if batch_file == '-':
+            commands = list(split_curl_commands(sys.stdin))
+        else:
+            with open(batch_file) as f:
+                commands = list(split_curl_commands(f))
+    except OSError as e:
+        print(f"Error reading batch file: {e}")
         return 1
+    if timings:
+        timings.mark('read')
+    
+    requests = []
+    for number, curl_command in enumerate(commands, 1):
+        try:
+            request = parse_curl_command(curl_command, timings)
+        except ValueError as e:
+            print(f"Error parsing curl command #{number}: {e}")
+            return 1
+        if not request.url:
+            print(f"Error: No URL found in curl command #{number}")
+            return 1
+        warning = request.unhandled_warning()
+        if warning:
+            print(f"#{number}: {warning}", file=sys.stderr)
+        requests.append(request)
+    
+    if not requests:
+        print("Error: No curl commands found in batch input")
+        return 1
+    
+    converter = CurlToPython(pretty_json=not args.no_pretty, flavor=flavor, pool_size=args.pool_size,
+                             repeat=args.repeat, concurrency=args.concurrency)
+    write_output(lambda out: converter.generate_python_module(requests, out), args.output, timings)
     
+    if timings:
+        timings.count += len(requests)
+        timings.report('Curl2Python')
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(run_profiled(main))
 
@@ -0,0 +1,251 @@
+"""
+Single-file containers for Curl2All output.
+
+Writing three small files per command is slow on network filesystems, so
+`Curl2All.py --bundle` can put every generated file into one ZIP archive
+or SQLite database instead. Each member is indexed by the request method,
+URL, conversion time and output format:
+
+- In a SQLite bundle the index is the `entries` table, filled in batched
+  transactions.
+- In a ZIP bundle the index lives in the per-member comments of the
+  central directory, which is written once when the archive is closed.
+
+`Curl2All.py list BUNDLE` and `Curl2All.py extract BUNDLE` read them back.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import sqlite3
+import zipfile
+from dataclasses import dataclass
+
+# Rows inserted per SQLite transaction
+COMMIT_EVERY = 500
+
+ZIP_EXTENSIONS = ('.zip',)
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+
+
+class BundleError(ValueError):
+    """The bundle path has an unknown extension or the file is not a bundle."""
+
+
+@dataclass
+class BundleEntry:
+    name: str
+    method: str
+    url: str
+    timestamp: str
+    format: str
+    size: int
+
+
+class ZipBundle:
+    def __init__(self, path, mode='r'):
+        # Appending to a file that isn't a ZIP archive would silently tack
+        # one onto the end of it
+        if mode != 'r' and os.path.exists(path) and not zipfile.is_zipfile(path):
+            raise BundleError(f"{path} is not a ZIP bundle")
+        try:
+            self.zip = zipfile.ZipFile(path, mode, compression=zipfile.ZIP_DEFLATED)
+        except zipfile.BadZipFile as e:
+            raise BundleError(f"{path} is not a ZIP bundle: {e}") from None
+        self._names = set(self.zip.namelist())
+
+    def add(self, name, method, url, timestamp, format, content):
+        """Add one generated file with its index fields."""
+        # Names carry a content hash, so a repeated name is the same file
+        if name in self._names:
+            return
+        self._names.add(name)
+        info = zipfile.ZipInfo(name, date_time=_zip_date_time(timestamp))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        info.comment = json.dumps({'method': method, 'url': url, 'timestamp': timestamp,
+                                   'format': format}).encode()
+        self.zip.writestr(info, content)
+
+    def entries(self):
+        """Yield a BundleEntry for every file, read from the central directory only."""
+        for info in self.zip.infolist():
+            try:
+                index = json.loads(info.comment or b'{}')
+            except ValueError:
+                index = {}
+            yield BundleEntry(info.filename, index.get('method'), index.get('url'),
+                              index.get('timestamp'), index.get('format'), info.file_size)
+
+    def read(self, name):
+        """Return the content of one file; KeyError if it isn't in the bundle."""
+        return self.zip.read(name).decode('utf-8')
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SqliteBundle:
+    def __init__(self, path, mode='r'):
+        if mode == 'r':
+            if not os.path.exists(path):
+                raise BundleError(f"No such bundle: {path}")
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            self.db = sqlite3.connect(path)
+        try:
+            if mode != 'r':
+                # A rollback journal, unlike WAL, is safe on network filesystems;
+                # batching rows per transaction keeps its syncs rare
+                self.db.execute("PRAGMA synchronous = NORMAL")
+                self.db.execute("""
+                    CREATE TABLE IF NOT EXISTS entries (
+                        name TEXT PRIMARY KEY,
+                        method TEXT,
+                        url TEXT,
+                        timestamp TEXT,
+                        format TEXT,
+                        content TEXT NOT NULL
+                    )""")
+            self.db.execute("SELECT name FROM entries LIMIT 1")
+        except sqlite3.DatabaseError as e:
+            self.db.close()
+            raise BundleError(f"{path} is not a SQLite bundle: {e}") from None
+        self.pending = 0
+
+    def add(self, name, method, url, timestamp, format, content):
+        """Add one generated file with its index fields, committing every COMMIT_EVERY rows."""
+        self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                        (name, method, url, timestamp, format, content))
+        self.pending += 1
+        if self.pending >= COMMIT_EVERY:
+            self.db.commit()
+            self.pending = 0
+
+    def entries(self):
+        """Yield a BundleEntry for every file, in insertion order."""
+        yield from (BundleEntry(*row) for row in self.db.execute(
+            "SELECT name, method, url, timestamp, format, length(content) FROM entries ORDER BY rowid"))
+
+    def read(self, name):
+        """Return the content of one file; KeyError if it isn't in the bundle."""
+        row = self.db.execute("SELECT content FROM entries WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _zip_date_time(timestamp):
+    """Turn a 'YYYY-MM-DD HH:MM:SS' timestamp into a ZIP date_time tuple."""
+    date, _, clock = timestamp.partition(' ')
+    return tuple(int(part) for part in date.split('-') + clock.split(':'))
+
+
+def open_bundle(path, mode='r'):
+    """Open a ZIP or SQLite bundle, chosen by extension, for reading ('r') or appending ('a')."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ZIP_EXTENSIONS:
+        return ZipBundle(path, mode)
+    if extension in SQLITE_EXTENSIONS:
+        return SqliteBundle(path, mode)
+    known = ', '.join(ZIP_EXTENSIONS + SQLITE_EXTENSIONS)
+    raise BundleError(f"Unknown bundle type for {path} (expected one of {known})")
+
+
+def _matching(bundle, patterns, format=None):
+    """Yield entries whose name or URL matches any of the glob patterns (all if none)."""
+    for entry in bundle.entries():
+        if format and entry.format != format:
+            continue
+        if patterns and not any(fnmatch.fnmatchcase(entry.name, pattern)
+                                or fnmatch.fnmatchcase(entry.url or '', pattern)
+                                for pattern in patterns):
+            continue
+        yield entry
+
+
+def list_bundle(path, patterns=(), format=None):
+    """Print the index of a bundle."""
+    with open_bundle(path) as bundle:
+        count = 0
+        for entry in _matching(bundle, patterns, format):
+            print(f"{entry.timestamp or '-':19}  {entry.format or '-':4}  {entry.method or '-':7}  "
+                  f"{entry.size:>8}  {entry.name}  {entry.url or ''}")
+            count += 1
+    print(f"{count} file(s)")
+    return True
+
+
+def extract_bundle(path, patterns=(), format=None, output_dir='.', to_stdout=False):
+    """Write matching files from a bundle into output_dir, or to stdout."""
+    with open_bundle(path) as bundle:
+        count = 0
+        for entry in _matching(bundle, patterns, format):
+            content = bundle.read(entry.name)
+            count += 1
+            if to_stdout:
+                print(content)
+                continue
+            # Member names are relative; never write outside output_dir
+            root = os.path.abspath(output_dir)
+            target = os.path.abspath(os.path.join(root, entry.name))
+            if os.path.commonpath([root, target]) != root:
+                print(f"Skipping unsafe member name: {entry.name}")
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'w') as f:
+                f.write(content)
+            print(target)
+    if not count:
+        print("No matching files in bundle")
+        return False
+    return True
+
+
+def bundle_main(argv):
+    """Run the list and extract subcommands."""
+    parser = argparse.ArgumentParser(prog='Curl2All.py', description="Read files back out of a Curl2All bundle")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help='Show the index of a bundle')
+    extract_parser = subparsers.add_parser('extract', help='Extract files from a bundle')
+    for subparser in (list_parser, extract_parser):
+        subparser.add_argument('bundle', help='Bundle file (.zip, .sqlite)')
+        subparser.add_argument('patterns', nargs='*', metavar='PATTERN',
+                               help='Only files whose name or URL matches one of these globs')
+        subparser.add_argument('--format', '-f', help='Only files of this format (py, cs, http)')
+    extract_parser.add_argument('--dir', '-d', default='.',
+                                help='Directory to extract into (default: current directory)')
+    extract_parser.add_argument('--stdout', action='store_true',
+                                help='Print file contents instead of writing them')
+
+    # Patterns may also come after --format and friends
+    args, extra = parser.parse_known_args(argv)
+    for arg in extra:
+        if arg.startswith('-'):
+            parser.error(f"unrecognized arguments: {arg}")
+        args.patterns.append(arg)
+    try:
+        if args.command == 'list':
+            return 0 if list_bundle(args.bundle, args.patterns, args.format) else 1
+        return 0 if extract_bundle(args.bundle, args.patterns, args.format, args.dir, args.stdout) else 1
+    except (OSError, BundleError, sqlite3.Error) as e:
+        print(f"Error reading bundle: {e}")
+        return 1
@@ -0,0 +1,224 @@
+"""
+Content-addressed cache of Curl2All conversions.
+
+Each entry is keyed by a hash of the normalized cURL command, the options
+that affect generated output and the converter version, so a hit can skip
+tokenizing and code generation entirely. Entries live under
+$XDG_CACHE_HOME/curl2all (~/.cache/curl2all by default) and are evicted
+least-recently-used first once the cache grows past its byte budget. A
+running size total is kept with the hit/miss statistics so the directory
+only has to be scanned when that budget is actually exceeded.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Files whose contents change what the converters generate
+_SOURCE_FILES = ('CurlRequest.py', 'Curl2Python.py', 'Curl2CSharp.py', 'Curl2Http.py')
+
+_CONTINUATION_RE = re.compile(r'\\\r?\n')
+
+_converter_version = None
+
+
+def converter_version():
+    """Return a digest of the converter sources, computed once per process."""
+    global _converter_version
+    if _converter_version is None:
+        script_dir = os.path.dirname(os.path.realpath(__file__))
+        digest = hashlib.sha256()
+        for name in _SOURCE_FILES:
+            with open(os.path.join(script_dir, name), 'rb') as f:
+                digest.update(f.read())
+        _converter_version = digest.hexdigest()[:16]
+    return _converter_version
+
+
+def default_cache_dir():
+    """Return the cache directory, following the XDG base directory spec."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'curl2all')
+
+
+class ConversionCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Bytes stored by this process since the size total was last saved,
+        # and the exact size found by the last trim() that scanned
+        self.stored_bytes = 0
+        self._scanned_bytes = None
+
+    def key(self, curl_command, options):
+        """Return the cache key for a command.
+
+        options is a dict of settings that change the generated output.
+        Callers must not store requests that read @file or stdin data
+        (CurlRequest.local_input), since their output depends on more than
+        the command.
+        """
+        # Line continuations and surrounding whitespace don't change the request
+        normalized = _CONTINUATION_RE.sub(' ', curl_command.strip())
+        digest = hashlib.sha256()
+        digest.update(converter_version().encode())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        digest.update(b'\0')
+        digest.update(normalized.encode('utf-8', errors='surrogatepass'))
+        return digest.hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key):
+        """Return (meta, {extension: path}) for a cached entry, or None on a miss."""
+        entry_dir = self._entry_dir(key)
+        meta_path = os.path.join(entry_dir, 'meta.json')
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            files = {ext: os.path.join(entry_dir, 'output' + ext) for ext in meta['extensions']}
+            # Touching the entry marks it as recently used for eviction
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return meta, files
+
+    def put(self, key, meta, files):
+        """Store generated files ({extension: path}) with their metadata."""
+        self._store(key, meta, files, shutil.copyfile)
+
+    def put_contents(self, key, meta, contents):
+        """Store generated text ({extension: content}) with its metadata."""
+        def write(content, path):
+            with open(path, 'w') as f:
+                f.write(content)
+        self._store(key, meta, contents, write)
+
+    def _store(self, key, meta, sources, write):
+        entry_dir = self._entry_dir(key)
+        parent = os.path.dirname(entry_dir)
+        os.makedirs(parent, exist_ok=True)
+
+        # Build the entry beside its final location and rename it into place,
+        # so readers never see a half-written entry
+        staging = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+        try:
+            for ext, source in sources.items():
+                write(source, os.path.join(staging, 'output' + ext))
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(dict(meta, extensions=sorted(sources)), f)
+            with os.scandir(staging) as files:
+                size = sum(item.stat().st_size for item in files)
+            os.rename(staging, entry_dir)
+            self.stored_bytes += size
+        except OSError:
+            # Another process stored the same entry first, or the cache is
+            # unwritable; either way the conversion itself succeeded
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _entries(self):
+        """Yield (last_used, size, path) for every entry in the cache."""
+        try:
+            shards = os.scandir(self.cache_dir)
+        except OSError:
+            return
+        with shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.tmp-'):
+                            continue
+                        size = 0
+                        last_used = 0
+                        with os.scandir(entry.path) as files:
+                            for item in files:
+                                stat = item.stat()
+                                size += stat.st_size
+                                if item.name == 'meta.json':
+                                    last_used = stat.st_mtime
+                        yield last_used, size, entry.path
+
+    def trim(self):
+        """Evict least recently used entries until the cache fits its budget.
+
+        The cache is only scanned once the saved size total plus what this
+        process stored passes max_bytes (or no total has been saved yet).
+        """
+        saved_bytes = self.load_stats()['bytes']
+        if saved_bytes is not None and saved_bytes + self.stored_bytes <= self.max_bytes:
+            return 0
+
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            evicted += 1
+        self._scanned_bytes = total
+        self.stored_bytes = 0
+        return evicted
+
+    def record_run(self, hits=0, misses=0, evictions=0):
+        """Add this run's counters and stored bytes to the persistent statistics."""
+        stats = self.load_stats()
+        stats['hits'] += hits
+        stats['misses'] += misses
+        stats['evictions'] += evictions
+        if self._scanned_bytes is not None:
+            stats['bytes'] = self._scanned_bytes + self.stored_bytes
+        elif stats['bytes'] is not None:
+            stats['bytes'] += self.stored_bytes
+        self.stored_bytes = 0
+        self._scanned_bytes = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        stats_path = os.path.join(self.cache_dir, 'stats.json')
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=self.cache_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(stats, f)
+        os.replace(tmp_path, stats_path)
+
+    def load_stats(self):
+        """Return the persistent hit/miss/eviction counters and size total."""
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': None}
+        try:
+            with open(os.path.join(self.cache_dir, 'stats.json')) as f:
+                stats.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return stats
+
+    def print_stats(self):
+        """Print cache size, budget and lifetime hit rate."""
+        entries = list(self._entries())
+        total = sum(size for _, size, _ in entries)
+        stats = self.load_stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = f"{100 * stats['hits'] / lookups:.1f}%" if lookups else "n/a"
+
+        print(f"Cache directory : {self.cache_dir}")
+        print(f"Entries         : {len(entries)}")
+        print(f"Size            : {total / 1024 / 1024:.2f} MB of {self.max_bytes / 1024 / 1024:.2f} MB")
+        print(f"Hits            : {stats['hits']}")
+        print(f"Misses          : {stats['misses']}")
+        print(f"Hit rate        : {hit_rate}")
+        print(f"Evictions       : {stats['evictions']}")
+        if entries:
+            oldest = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(min(entries)[0]))
+            print(f"Least recent    : {oldest}")
@@ -0,0 +1,118 @@
+"""
+Unix domain socket transport for the conversion daemon.
+
+`Curl2All.py --serve` keeps the converters loaded in one long-lived process
+and answers newline-delimited JSON requests, one JSON object per line in each
+direction. The client side here is deliberately small so the Curl2* scripts
+can try the daemon first and fall back to converting in-process when no
+daemon is listening.
+"""
+
+import json
+import os
+
+CLIENT_TIMEOUT = 30
+
+
+def default_socket_path():
+    """Return the daemon socket path, preferring $CURL2ALL_SOCKET then $XDG_RUNTIME_DIR."""
+    if os.environ.get('CURL2ALL_SOCKET'):
+        return os.environ['CURL2ALL_SOCKET']
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'curl2all.sock')
+    return f"/tmp/curl2all-{os.getuid()}.sock"
+
+
+def reads_local_input(curl_command):
+    """Return True if curl_command may read @file or stdin data.
+
+    The daemon would resolve those against its own working directory and
+    stdin, so such commands are converted by the client. Any @ counts; a
+    false positive only costs an in-process conversion.
+    """
+    return '@' in curl_command
+
+
+def send_request(message, socket_path=None, timeout=CLIENT_TIMEOUT):
+    """Send one request to the daemon and return its reply.
+
+    Returns None when no daemon is listening or the exchange fails, so the
+    caller can fall back to converting in-process.
+    """
+    socket_path = socket_path or default_socket_path()
+    # Usually no daemon is running; don't pay for importing socket to find out
+    if not os.path.exists(socket_path):
+        return None
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message).encode() + b'\n')
+        with sock.makefile('rb') as f:
+            line = f.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def _server_class():
+    """Return the server and request handler classes, importing socketserver only for --serve."""
+    import socketserver
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            """Answer every request line on the connection until the client closes it."""
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    reply = self.server.handler(json.loads(line))
+                except ValueError as e:
+                    reply = {'ok': False, 'error': f"Invalid request: {e}"}
+                except Exception as e:
+                    reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(reply).encode() + b'\n')
+                self.wfile.flush()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    return Server, RequestHandler
+
+
+def serve(handler, socket_path=None):
+    """Serve requests on a Unix socket until interrupted.
+
+    handler takes a decoded request dict and returns the reply dict.
+    """
+    socket_path = socket_path or default_socket_path()
+
+    if os.path.exists(socket_path):
+        if send_request({'op': 'ping'}, socket_path, timeout=1) is not None:
+            print(f"Error: a daemon is already listening on {socket_path}")
+            return False
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(socket_path)
+
+    # The socket is only for the current user
+    server_class, handler_class = _server_class()
+    old_umask = os.umask(0o177)
+    try:
+        server = server_class(socket_path, handler_class)
+    finally:
+        os.umask(old_umask)
+    server.handler = handler
+
+    print(f"Listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
+    return True
@@ -0,0 +1,145 @@
+"""
+Streaming reader for HAR (HTTP Archive) exports.
+
+Browser dev tools export HAR files of hundreds of megabytes, most of it
+response bodies. Rather than json.load the whole archive, log.entries is
+walked one entry at a time with JSONDecoder.raw_decode over a window of the
+file, so memory use follows the largest single entry instead of the size of
+the archive. Each entry's request is mapped onto the same CurlRequest model
+that parse_curl_command produces.
+"""
+
+import json
+import re
+import sys
+
+from CurlRequest import request_from_har
+
+READ_SIZE = 1 << 20
+
+# A decode error closer than this to the end of the buffer may just be a
+# token cut off by the read boundary (a partial literal or escape)
+_BOUNDARY_SLACK = 16
+
+_WHITESPACE_RE = re.compile(r'\s*')
+
+
+class HarFormatError(ValueError):
+    """The file is not a HAR archive, or is truncated or malformed."""
+
+
+class _JsonStream:
+    """Incremental JSON decoding over a text file."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size=READ_SIZE):
+        """Read more of the file, dropping text that has been consumed."""
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.offset += self.pos
+            self.pos = 0
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character, or '' at the end of the file."""
+        while True:
+            self.pos = _WHITESPACE_RE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        """Consume the next character, which must be one of chars, and return it."""
+        char = self.peek()
+        if not char or char not in chars:
+            found = repr(char) if char else 'end of file'
+            raise HarFormatError(f"Expected one of {chars!r} but found {found}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next JSON value, reading more of the file until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the very end of the buffer may continue in the next read
+                if end < len(self.buffer) or self.eof or not isinstance(value, (int, float)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                # Anything but an unterminated string or an error at the very
+                # end is malformed input; don't read the rest of the file first
+                truncated = (e.msg.startswith('Unterminated string')
+                             or e.pos >= len(self.buffer) - _BOUNDARY_SLACK)
+                if self.eof or not truncated:
+                    raise HarFormatError(f"Invalid JSON at character {self.offset + e.pos}: {e.msg}") from None
+            # Read at least as much again as is buffered, so an entry larger
+            # than READ_SIZE is re-decoded a logarithmic number of times
+            self._fill(max(READ_SIZE, len(self.buffer) - self.pos))
+
+
+def _find_key(stream, key):
+    """Skip object members until key is found and its value is next; False if absent."""
+    if stream.peek() == '}':
+        return False
+    while True:
+        name = stream.value()
+        stream.expect(':')
+        if name == key:
+            return True
+        stream.value()
+        if stream.expect(',}') == '}':
+            return False
+
+
+def iter_har_entries(f):
+    """Yield every object in log.entries of a HAR file object, one at a time."""
+    stream = _JsonStream(f)
+    stream.expect('{')
+    if not _find_key(stream, 'log'):
+        raise HarFormatError("No 'log' object found")
+    stream.expect('{')
+    if not _find_key(stream, 'entries'):
+        return
+
+    stream.expect('[')
+    if stream.peek() == ']':
+        return
+    while True:
+        yield stream.value()
+        if stream.expect(',]') == ']':
+            return
+
+
+def read_har_requests(har_file):
+    """Yield a CurlRequest for every HTTP(S) request in a HAR file, or stdin for '-'.
+
+    Entries for other schemes (data:, blob:, chrome-extension: and so on)
+    have no cURL equivalent and are skipped.
+    """
+    if har_file == '-':
+        yield from _har_requests(sys.stdin)
+    else:
+        with open(har_file, encoding='utf-8-sig') as f:
+            yield from _har_requests(f)
+
+
+def _har_requests(f):
+    for entry in iter_har_entries(f):
+        har_request = entry.get('request') or {}
+        if har_request.get('url', '').startswith(('http://', 'https://')):
+            yield request_from_har(har_request)
@@ -0,0 +1,1243 @@
+"""
+Shared cURL command parser for the Curl2* converters.
+
+A cURL command is parsed once into a compact CurlRequest, which every
+generator (Curl2Python, Curl2CSharp, Curl2Http) then reads from. Keeping a
+single parser means the converters agree on method, URL, headers and body
+handling, and batch runs only pay for tokenizing each command once.
+Generators stream their output through a CodeWriter.
+"""
+
+import json
+import mmap
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from urllib.parse import urlparse, parse_qs, quote
+
+
+# Bodies larger than this are never parsed and re-serialized for pretty output
+PRETTY_JSON_LIMIT = 1 << 20
+
+# @file bodies up to this size are inlined; larger ones are streamed from
+# the file by the generated code
+INLINE_BODY_LIMIT = 1 << 20
+
+
+class _Unparsed:
+    """Marks a body that hasn't been decoded yet."""
+
+    def __reduce__(self):
+        # Requests are pickled to batch workers; keep the sentinel's identity
+        return '_UNPARSED'
+
+
+_UNPARSED = _Unparsed()
+_JSON_START_RE = re.compile(r'\s*[\[{]')
+_SECONDS_RE = re.compile(r'\d+(?:\.\d*)?|\.\d+')
+_INTEGER_RE = re.compile(r'-?\d+')
+
+
+class CurlParseError(ValueError):
+    """A cURL command that can't be converted."""
+
+
+class CurlQuoteError(CurlParseError):
+    """A quoted string in the command is never closed."""
+
+
+class CurlDataFileError(CurlParseError):
+    """An @file passed to a data option can't be read."""
+
+
+class CurlMissingUrlError(CurlParseError):
+    """The command has no URL to request."""
+
+
+@dataclass(slots=True)
+class CurlRequest:
+    method: str = 'GET'
+    url: str = ''
+    headers: dict = field(default_factory=dict)
+    params: dict = field(default_factory=dict)
+    body: str = None
+    body_file: str = None
+    body_kind: str = None
+    form: dict = field(default_factory=dict)
+    files: dict = field(default_factory=dict)
+    auth: tuple = None
+    cookies: dict = field(default_factory=dict)
+    verify: bool = True
+    allow_redirects: bool = True
+    timeout: float = None
+    proxies: dict = field(default_factory=dict)
+    content_type: str = None
+    unhandled: list = field(default_factory=list)
+    # Set when a data option read an @file or stdin, so the generated code
+    # depends on more than the command line
+    local_input: bool = False
+    _json: object = field(default=_UNPARSED, repr=False, compare=False)
+
+    def has_body(self):
+        """Return True if the request carries any kind of body."""
+        return bool(self.body is not None or self.body_file or self.form or self.files)
+
+    @property
+    def json_data(self):
+        """The body decoded as JSON on first use, or None if it isn't valid JSON."""
+        if self._json is _UNPARSED:
+            self._json = None
+            if self.body_kind == 'json' and self.body is not None:
+                try:
+                    self._json = json.loads(self.body)
+                except json.JSONDecodeError:
+                    # Declared or sniffed as JSON but isn't; send it untouched
+                    self.body_kind = 'raw'
+        return self._json
+
+    def structured_json(self, pretty=True):
+        """Return the parsed JSON body if a generator should re-serialize it, else None.
+
+        Raw JSON is passed through verbatim when pretty output isn't wanted
+        or the body is larger than PRETTY_JSON_LIMIT, so it is never parsed.
+        """
+        if (not pretty or self.body_kind != 'json' or self.body is None
+                or len(self.body) > PRETTY_JSON_LIMIT):
+            return None
+        return self.json_data
+
+    def form_fields(self):
+        """Return a form-encoded body split into fields, or None for other bodies."""
+        if self.body_kind != 'form' or self.body is None:
+            return None
+        form_data = {}
+        for param in self.body.split('&'):
+            if '=' in param:
+                key, value = param.split('=', 1)
+                form_data[key] = value
+        return form_data
+
+    def unhandled_warning(self):
+        """Return a warning listing options that were not translated, or None."""
+        if not self.unhandled:
+            return None
+        return f"Warning: ignoring unsupported curl option(s): {', '.join(self.unhandled)}"
+
+    def body_content_type(self):
+        """Return the declared Content-Type, or the one implied by the body."""
+        if self.content_type:
+            return self.content_type
+        if self.body_kind == 'json':
+            return 'application/json'
+        if self.body_kind == 'form' or self.form:
+            return 'application/x-www-form-urlencoded'
+        return None
+
+
+# Large body literals are emitted in pieces of this many characters
+BODY_CHUNK_SIZE = 1 << 16
+
+
+class CodeWriter:
+    """Emit generated code line by line to a file object or write callable.
+
+    Lines are separated, not terminated, by newlines, matching the
+    "\\n".join() output the generators used to build in memory.
+    """
+
+    def __init__(self, out):
+        self._write = out if callable(out) else out.write
+        self._started = False
+
+    def line(self, text=""):
+        """Start a new line containing text."""
+        if self._started:
+            self._write("\n")
+        self._started = True
+        self._write(text)
+
+    def write(self, text):
+        """Append text to the current line."""
+        self._started = True
+        self._write(text)
+
+    def chunks(self, text, size=BODY_CHUNK_SIZE):
+        """Yield text in slices of at most size characters."""
+        for start in range(0, len(text), size):
+            yield text[start:start + size]
+
+
+_QUOTE_RE = re.compile(r"\\.|['\"]", re.DOTALL)
+
+
+def _scan_quotes(line, quote):
+    """Return the quote character still open at the end of line, starting inside quote."""
+    for match in _QUOTE_RE.finditer(line):
+        char = match.group()
+        if quote == "'":
+            # Backslashes are literal inside single quotes
+            if char == "'" or char.endswith("'"):
+                quote = None
+        elif char[0] == '\\':
+            continue
+        elif quote is None:
+            quote = char
+        elif char == quote:
+            quote = None
+    return quote
+
+
+def split_curl_commands(lines):
+    """Yield individual curl commands from an iterable of lines.
+
+    Commands may span several lines through backslash continuations or
+    quoted strings containing newlines. Blank lines, comments and lines
+    that are not part of a curl command are skipped.
+    """
+    parts = []
+    quote = None
+
+    for line in lines:
+        line = line.rstrip('\r\n')
+
+        if not parts:
+            stripped = line.lstrip()
+            if not stripped.startswith('curl'):
+                continue
+            line = stripped
+
+        quote = _scan_quotes(line, quote)
+
+        if quote is not None:
+            # Newline inside a quoted string is part of the argument
+            parts.append(line + '\n')
+            continue
+
+        if (len(line) - len(line.rstrip('\\'))) % 2:
+            # Backslash-newline continuation; an even run of backslashes
+            # ends in an escaped backslash instead
+            parts.append(line[:-1] + ' ')
+            continue
+
+        parts.append(line)
+        yield ''.join(parts)
+        parts = []
+
+    if parts:
+        yield ''.join(parts)
+
+
+_SPACE_RE = re.compile(r'\s+')
+_PLAIN_RE = re.compile(r'[^\s\'"\\$]+')
+_DOUBLE_QUOTED_SPAN_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_ANSI_C_SPAN_RE = re.compile(r"[^'\\]*(?:\\.[^'\\]*)*'", re.DOTALL)
+_ANSI_C_ESCAPE_RE = re.compile(
+    r"\\(x[0-9a-fA-F]{1,2}|u[0-9a-fA-F]{1,4}|U[0-9a-fA-F]{1,8}|[0-7]{1,3}|c.|.)", re.DOTALL
+)
+_ANSI_C_ESCAPES = {
+    'a': '\a', 'b': '\b', 'e': '\x1b', 'E': '\x1b', 'f': '\f', 'n': '\n',
+    'r': '\r', 't': '\t', 'v': '\v', '\\': '\\', "'": "'", '"': '"', '?': '?',
+}
+# cmd.exe style: a caret continuing the line, or the URL quoted as curl ^"...
+_WINDOWS_HINT_RE = re.compile(r'\^\r?\n|^\s*curl(?:\.exe)?\s+\^"')
+_WINDOWS_TOKEN_RE = re.compile(r'(\\*)"|[^\s"\\]+|\\+|\s+')
+
+
+def tokenize_curl_command(command):
+    """Split a shell command line into arguments.
+
+    Understands single, double and $'...' ANSI-C quoting, backslash escapes
+    and backslash-newline continuations. Commands copied from a Windows
+    browser ("Copy as cURL (cmd)") are detected by their ^ escapes and split
+    with cmd.exe rules instead: when they have no single quotes and start
+    with curl ^" or end a line with ^, or when they contain a ^ and POSIX
+    rules fail on their quoting. Quoted spans are located with str.find and
+    compiled regexes, so multi-megabyte bodies are not walked per character.
+
+    Raises CurlQuoteError (a ValueError, like shlex.split) on an unterminated quote.
+    """
+    if "'" not in command and _WINDOWS_HINT_RE.search(command):
+        return _tokenize_windows(command)
+    try:
+        return _tokenize_posix(command)
+    except CurlQuoteError:
+        if '^' in command:
+            return _tokenize_windows(command)
+        raise
+
+
+def _tokenize_posix(command):
+    """Split a command line with POSIX shell quoting rules."""
+    tokens = []
+    current = []
+    in_token = False
+    pos = 0
+    length = len(command)
+
+    while pos < length:
+        char = command[pos]
+
+        if char.isspace():
+            if in_token:
+                tokens.append(''.join(current))
+                current = []
+                in_token = False
+            pos = _SPACE_RE.match(command, pos).end()
+            continue
+
+        if char == '\\':
+            following = command[pos + 1:pos + 2]
+            if following in ('\n', ''):
+                # Line continuation (or a dangling one at the very end);
+                # doesn't start or end a token
+                pos += 2
+                continue
+            if command.startswith('\r\n', pos + 1):
+                pos += 3
+                continue
+            current.append(following)
+            pos += 2
+        elif char == "'":
+            end = command.find("'", pos + 1)
+            if end < 0:
+                raise CurlQuoteError("No closing quotation")
+            current.append(command[pos + 1:end])
+            pos = end + 1
+        elif char == '"':
+            pos = _read_double_quoted(command, pos + 1, current)
+        elif char == '$' and command.startswith("'", pos + 1):
+            pos = _read_ansi_c_quoted(command, pos + 2, current)
+        else:
+            match = _PLAIN_RE.match(command, pos)
+            if match:
+                current.append(match.group())
+                pos = match.end()
+            else:
+                # A lone '$' that doesn't start $'...'
+                current.append(char)
+                pos += 1
+        in_token = True
+
+    if in_token:
+        tokens.append(''.join(current))
+    return tokens
+
+
+def _read_double_quoted(command, pos, current):
+    """Append the contents of a "..." span starting after the quote; return the position past it."""
+    match = _DOUBLE_QUOTED_SPAN_RE.match(command, pos)
+    if not match:
+        raise CurlQuoteError("No closing quotation")
+    span = command[pos:match.end() - 1]
+    if '\\' in span:
+        span = _unescape_double_quoted(span)
+    current.append(span)
+    return match.end()
+
+
+def _unescape_double_quoted(span):
+    """Decode backslash escapes inside "...", which only apply to $ ` " \\ and newline."""
+    # Splitting on escaped backslashes first leaves every remaining backslash
+    # followed by the character it escapes, so plain str.replace is exact
+    parts = span.split('\\\\')
+    for i, part in enumerate(parts):
+        if '\\' in part:
+            parts[i] = (part.replace('\\"', '"').replace('\\$', '$')
+                        .replace('\\`', '`').replace('\\\n', ''))
+    return '\\'.join(parts)
+
+
+def _read_ansi_c_quoted(command, pos, current):
+    """Append the decoded contents of a $'...' span; return the position past it."""
+    match = _ANSI_C_SPAN_RE.match(command, pos)
+    if not match:
+        raise CurlQuoteError("No closing quotation")
+    span = command[pos:match.end() - 1]
+    if '\\' in span:
+        span = _ANSI_C_ESCAPE_RE.sub(_decode_ansi_c_escape, span)
+    current.append(span)
+    return match.end()
+
+
+def _decode_ansi_c_escape(match):
+    """Decode a single backslash escape inside $'...'."""
+    escape = match.group(1)
+    kind = escape[0]
+    if kind in 'xuU' and len(escape) > 1:
+        return chr(int(escape[1:], 16))
+    if kind in '01234567':
+        return chr(int(escape, 8))
+    if kind == 'c' and len(escape) == 2:
+        return chr(ord(escape[1]) & 0x1f)
+    return _ANSI_C_ESCAPES.get(escape, '\\' + escape)
+
+
+def _tokenize_windows(command):
+    """Split a cmd.exe command line with ^ escapes, as produced by "Copy as cURL (cmd)"."""
+    # Drop ^-newline continuations, then unescape ^X to X
+    command = re.sub(r'\^\r?\n', ' ', command)
+    command = re.sub(r'\^(.)', r'\1', command, flags=re.DOTALL)
+
+    tokens = []
+    current = []
+    in_token = False
+    in_quotes = False
+
+    for match in _WINDOWS_TOKEN_RE.finditer(command):
+        text = match.group()
+        backslashes = match.group(1)
+        if backslashes is not None:
+            # 2n backslashes before a quote give n backslashes and toggle
+            # quoting; 2n+1 give n backslashes and a literal quote
+            current.append('\\' * (len(backslashes) // 2))
+            if len(backslashes) % 2:
+                current.append('"')
+            else:
+                in_quotes = not in_quotes
+            in_token = True
+        elif text[0].isspace() and not in_quotes:
+            if in_token:
+                tokens.append(''.join(current))
+                current = []
+                in_token = False
+        else:
+            current.append(text)
+            in_token = True
+
+    if in_quotes:
+        raise CurlQuoteError("No closing quotation")
+    if in_token:
+        tokens.append(''.join(current))
+    return tokens
+
+
+@dataclass(slots=True)
+class _ParseState:
+    request: CurlRequest
+    explicit_method: bool = False
+    data_parts: list = field(default_factory=list)
+    binary_data: bool = False
+    get_mode: bool = False
+    read_files: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class _DataFile:
+    path: str
+    strip_newlines: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CurlOption:
+    name: str
+    takes_value: bool
+    handler: object = None
+    # Converts the value before it reaches the handler; raises ValueError
+    convert: object = None
+
+
+def parse_curl_command(curl_command, timings=None, read_files=True):
+    """Parse a cURL command into a CurlRequest.
+
+    Options are dispatched through the CURL_OPTIONS table. Combined short
+    flags (-sSL, -XPOST) and --option=value forms are accepted. Options
+    that have no handler, or that curl doesn't know, are recorded in
+    request.unhandled rather than silently dropped.
+
+    Raises CurlParseError (a ValueError) if the command cannot be tokenized,
+    gives an option a malformed number or names a data file that can't be
+    read. timings, a CurlTimings.Timings, gets the tokenize, parse and
+    classify phases marked.
+
+    With read_files=False no local file or stdin is read: a single @file
+    body is left for the generated code to open at run time (without -d's
+    newline stripping), and data that could only be built by reading a
+    file or stdin raises CurlDataFileError.
+    """
+    tokens = tokenize_curl_command(curl_command)
+    if timings:
+        timings.mark('tokenize')
+
+    # Remove 'curl' from the beginning
+    if tokens and tokens[0] in ('curl', 'curl.exe'):
+        tokens = tokens[1:]
+
+    state = _ParseState(CurlRequest(), read_files=read_files)
+    request = state.request
+    long_options = _LONG_OPTIONS
+    short_options = _SHORT_OPTIONS
+
+    i = 0
+    count = len(tokens)
+    while i < count:
+        token = tokens[i]
+        i += 1
+
+        if len(token) < 2 or token[0] != '-':
+            # Positional argument; the first one is the URL
+            if not request.url:
+                _parse_url(request, token)
+            continue
+
+        if token[1] == '-':
+            name, has_inline_value, inline_value = token.partition('=')
+            option = long_options.get(name)
+            enabled = True
+            if option is None and name.startswith('--no-'):
+                # Boolean options can be switched off with --no-<name>
+                option = long_options.get('--' + name[5:])
+                if option is not None and option.takes_value:
+                    option = None
+                enabled = False
+            if option is None:
+                request.unhandled.append(token)
+                continue
+
+            if option.takes_value:
+                if has_inline_value:
+                    value = inline_value
+                elif i < count:
+                    value = tokens[i]
+                    i += 1
+                else:
+                    request.unhandled.append(token)
+                    continue
+            else:
+                value = enabled
+            _apply_option(state, option, value)
+            continue
+
+        # One or more short flags; the last may take a value, either the
+        # rest of the token (-XPOST) or the next token (-X POST)
+        for position in range(1, len(token)):
+            option = short_options.get(token[position])
+            if option is None:
+                request.unhandled.append('-' + token[position])
+                continue
+            if not option.takes_value:
+                _apply_option(state, option, True)
+                continue
+            if position + 1 < len(token):
+                value = token[position + 1:]
+            elif i < count:
+                value = tokens[i]
+                i += 1
+            else:
+                request.unhandled.append('-' + token[position])
+                break
+            _apply_option(state, option, value)
+            break
+
+    if timings:
+        timings.mark('parse')
+    _finish(state)
+    if timings:
+        timings.mark('classify')
+    return request
+
+
+# HTTP/2 pseudo-headers aside, headers that curl works out for itself
+_HAR_SKIPPED_HEADERS = {'host', 'content-length'}
+
+
+def request_from_har(har_request):
+    """Build a CurlRequest from the request object of a HAR entry.
+
+    Headers curl computes itself are dropped, the Cookie header becomes
+    request.cookies and postData fills in the same body, form and file
+    fields that parse_curl_command would.
+    """
+    request = CurlRequest(method=har_request.get('method', 'GET').upper())
+    _parse_url(request, har_request.get('url', ''))
+
+    for header in har_request.get('headers', ()):
+        name = header.get('name', '')
+        value = header.get('value', '')
+        if name.startswith(':') or name.lower() in _HAR_SKIPPED_HEADERS:
+            continue
+        if name.lower() == 'cookie':
+            _parse_cookies(request, value)
+        else:
+            _parse_header(request, f"{name}: {value}")
+
+    post_data = har_request.get('postData')
+    if not post_data:
+        return request
+
+    mime_type = post_data.get('mimeType', '')
+    params = post_data.get('params') or ()
+    if mime_type.startswith('multipart/form-data') and params:
+        # The recorded boundary won't match a regenerated multipart body
+        for key in [key for key in request.headers if key.lower() == 'content-type']:
+            del request.headers[key]
+        request.content_type = None
+        for param in params:
+            if 'fileName' in param:
+                request.files[param['name']] = param['fileName']
+            else:
+                request.form[param['name']] = param.get('value', '')
+        return request
+
+    if not request.content_type and mime_type:
+        request.content_type = mime_type
+    text = post_data.get('text')
+    if not text and params:
+        text = '&'.join(f"{param['name']}={param.get('value', '')}" for param in params)
+    if text:
+        _parse_data(request, text)
+    return request
+
+
+def _apply_option(state, option, value):
+    """Check and convert an option's value, then run its handler or record it as unhandled."""
+    if option.convert is not None:
+        try:
+            value = option.convert(value)
+        except ValueError:
+            raise CurlParseError(f"Invalid number for {option.name}: {value!r}") from None
+    if option.handler is None:
+        state.request.unhandled.append(option.name)
+    else:
+        option.handler(state, value)
+
+
+def _finish(state):
+    """Resolve the body and method once every option has been seen."""
+    request = state.request
+
+    parts = state.data_parts
+    if len(parts) == 1 and isinstance(parts[0], _DataFile) and not state.get_mode:
+        # A single large or binary @file body is streamed, never loaded
+        request.body_file = parts[0].path
+        request.body_kind = _classify_body_file(
+            request.body_file, request.content_type, state.binary_data, state.read_files
+        )
+    elif parts:
+        # curl joins repeated -d options with '&'; files that were left for
+        # streaming have to be inlined once they are mixed with other data
+        if not state.read_files:
+            for part in parts:
+                if isinstance(part, _DataFile):
+                    raise CurlDataFileError(
+                        f"Not reading data from file {part.path}; it can only be sent on its own"
+                    )
+        data = '&'.join(
+            part if isinstance(part, str) else _read_text_file(part.path, part.strip_newlines)
+            for part in parts
+        )
+        if state.get_mode:
+            # -G sends the data as a query string instead of a body
+            request.params.update(parse_qs(data, keep_blank_values=True))
+        else:
+            _parse_data(request, data, state.binary_data)
+
+    # curl switches to POST when a body is sent without an explicit -X
+    if not state.explicit_method and request.has_body():
+        request.method = 'POST'
+
+
+def _parse_url(request, url):
+    """Set the URL, moving any query string into params."""
+    request.url = url
+    parsed_url = urlparse(url)
+    if parsed_url.query:
+        request.params.update(parse_qs(parsed_url.query, keep_blank_values=True))
+        # Remove query string from URL
+        request.url = url.split('?')[0]
+
+
+def _parse_header(request, header):
+    """Parse a header string and add it to the headers dict."""
+    if ':' in header:
+        key, value = header.split(':', 1)
+        key = key.strip()
+        value = value.strip()
+
+        if key.lower() == 'content-type':
+            request.content_type = value
+
+        request.headers[key] = value
+
+
+def _parse_data(request, data, binary_data=False):
+    """Store the raw body and classify it without decoding it."""
+    request.body = data
+    request.body_kind = _classify_body(data, request.content_type, binary_data)
+
+
+def _classify_body(data, content_type, binary_data=False):
+    """Return 'json', 'form' or 'raw' for a body.
+
+    The declared Content-Type wins. Without one, the body is sniffed cheaply
+    (its first character, or the presence of '=' and '&') rather than parsed.
+    --data-binary bodies are only classified by their declared Content-Type.
+    """
+    if content_type:
+        return _classify_content_type(content_type)
+
+    if binary_data:
+        return 'raw'
+    if _JSON_START_RE.match(data):
+        return 'json'
+    if '=' in data and '&' in data:
+        return 'form'
+    return 'raw'
+
+
+def _classify_body_file(path, content_type, binary_data=False, sniff=True):
+    """Classify a streamed @file body, sniffing it through mmap if needed and allowed."""
+    if content_type:
+        return _classify_content_type(content_type)
+    if binary_data or not sniff:
+        return 'raw'
+
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            if view[:4096].lstrip()[:1] in (b'{', b'['):
+                return 'json'
+            if view.find(b'=') >= 0 and view.find(b'&') >= 0:
+                return 'form'
+    except (OSError, ValueError):
+        # Missing or empty; the generated code opens it at run time
+        pass
+    return 'raw'
+
+
+def _classify_content_type(content_type):
+    """Map a Content-Type header value to a body kind."""
+    media_type = content_type.split(';', 1)[0].strip().lower()
+    if media_type == 'application/json' or media_type.endswith('+json'):
+        return 'json'
+    if media_type == 'application/x-www-form-urlencoded':
+        return 'form'
+    return 'raw'
+
+
+def _read_body_file(path, strip_newlines):
+    """Return an @file body as text if it should be inlined, or None to stream it.
+
+    The file is mapped rather than read so large files can be checked
+    without loading them. Files over INLINE_BODY_LIMIT, binary files and
+    files that can't be read yet are streamed by the generated code.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+    if size == 0:
+        return ''
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        if size > INLINE_BODY_LIMIT:
+            # -d strips newlines, which a streamed upload can't reproduce,
+            # so only newline-free files are streamed in that mode
+            if not strip_newlines or (view.find(b'\n') < 0 and view.find(b'\r') < 0):
+                return None
+        try:
+            text = view[:].decode('utf-8')
+        except UnicodeDecodeError:
+            return None
+
+    return _strip_newlines(text) if strip_newlines else text
+
+
+def _read_text_file(path, strip_newlines):
+    """Read an @file body that must be inlined whatever its size."""
+    try:
+        with open(path, 'rb') as f:
+            text = f.read().decode('utf-8', errors='replace')
+    except OSError as e:
+        raise CurlDataFileError(f"Couldn't read data from file {path}: {e.strerror}")
+    return _strip_newlines(text) if strip_newlines else text
+
+
+def _strip_newlines(text):
+    """Drop carriage returns and newlines, as curl does for -d @file."""
+    return text.replace('\r', '').replace('\n', '')
+
+
+def _parse_auth(request, auth):
+    """Parse authentication string."""
+    if ':' in auth:
+        username, password = auth.split(':', 1)
+        request.auth = (username, password)
+    else:
+        request.auth = (auth, '')
+
+
+def _parse_cookies(request, cookies):
+    """Parse cookies string."""
+    for cookie in cookies.split(';'):
+        if '=' in cookie:
+            key, value = cookie.split('=', 1)
+            request.cookies[key.strip()] = value.strip()
+
+
+def _parse_form_data(request, form_data):
+    """Parse form data for file uploads or form fields."""
+    if '=' in form_data:
+        key, value = form_data.split('=', 1)
+        if value.startswith('@'):
+            # File upload
+            request.files[key] = value[1:]
+        else:
+            # Regular form field
+            request.form[key] = value
+
+
+def _parse_proxy(request, proxy):
+    """Parse proxy configuration."""
+    request.proxies = {'http': proxy, 'https': proxy}
+
+
+def _set_method(state, value):
+    state.request.method = value.upper()
+    state.explicit_method = True
+
+
+def _set_head(state, enabled):
+    if enabled:
+        _set_method(state, 'HEAD')
+
+
+def _set_get(state, enabled):
+    state.get_mode = enabled
+
+
+def _add_header(state, value):
+    _parse_header(state.request, value)
+
+
+def _add_data(state, value):
+    if value.startswith('@'):
+        _add_data_file(state, value[1:], strip_newlines=True)
+    else:
+        state.data_parts.append(value)
+
+
+def _add_raw_data(state, value):
+    # Like -d, but a leading @ is literal
+    state.data_parts.append(value)
+
+
+def _add_binary_data(state, value):
+    if value.startswith('@'):
+        _add_data_file(state, value[1:], strip_newlines=False)
+    else:
+        state.data_parts.append(value)
+    state.binary_data = True
+
+
+def _add_data_file(state, path, strip_newlines):
+    if not state.read_files:
+        if path == '-':
+            raise CurlDataFileError("Not reading data from stdin")
+        state.data_parts.append(_DataFile(path, strip_newlines))
+        return
+
+    state.request.local_input = True
+    if path == '-':
+        text = sys.stdin.buffer.read().decode('utf-8', errors='replace')
+        state.data_parts.append(_strip_newlines(text) if strip_newlines else text)
+        return
+    text = _read_body_file(path, strip_newlines)
+    state.data_parts.append(text if text is not None else _DataFile(path, strip_newlines))
+
+
+def _add_urlencoded_data(state, value):
+    # content, =content, name=content, @file and name@file; whichever of
+    # '=' and '@' comes first decides the form
+    equals = value.find('=')
+    at = value.find('@')
+    if at >= 0 and (equals < 0 or at < equals):
+        name, path = value[:at], value[at + 1:]
+        if not state.read_files:
+            raise CurlDataFileError(f"Not reading data from file {path}")
+        content = _read_text_file(path, strip_newlines=False)
+        state.request.local_input = True
+    elif equals >= 0:
+        name, content = value[:equals], value[equals + 1:]
+    else:
+        name, content = '', value
+
+    encoded = quote(content, safe='')
+    state.data_parts.append(f"{name}={encoded}" if name else encoded)
+
+
+def _add_json(state, value):
+    _add_binary_data(state, value)
+    headers = {key.lower() for key in state.request.headers}
+    if 'content-type' not in headers:
+        _parse_header(state.request, 'Content-Type: application/json')
+    if 'accept' not in headers:
+        _parse_header(state.request, 'Accept: application/json')
+
+
+def _add_form(state, value):
+    _parse_form_data(state.request, value)
+
+
+def _add_form_string(state, value):
+    if '=' in value:
+        key, text = value.split('=', 1)
+        state.request.form[key] = text
+
+
+def _set_user(state, value):
+    _parse_auth(state.request, value)
+
+
+def _set_bearer(state, value):
+    _parse_header(state.request, f"Authorization: Bearer {value}")
+
+
+def _set_user_agent(state, value):
+    _parse_header(state.request, f"User-Agent: {value}")
+
+
+def _set_referer(state, value):
+    # curl's ';auto' suffix only affects redirects
+    referer = value[:-5] if value.endswith(';auto') else value
+    if referer:
+        _parse_header(state.request, f"Referer: {referer}")
+
+
+def _add_cookie(state, value):
+    _parse_cookies(state.request, value)
+
+
+def _set_insecure(state, enabled):
+    state.request.verify = not enabled
+
+
+def _set_location(state, enabled):
+    state.request.allow_redirects = enabled
+
+
+def _set_max_time(state, value):
+    state.request.timeout = value
+
+
+def _set_proxy(state, value):
+    _parse_proxy(state.request, value)
+
+
+def _set_url(state, value):
+    if not state.request.url:
+        _parse_url(state.request, value)
+
+
+def _seconds(value):
+    """Parse a number of seconds, which may have a decimal fraction."""
+    if not _SECONDS_RE.fullmatch(value):
+        raise ValueError(value)
+    return float(value)
+
+
+def _integer(value):
+    """Parse a whole number; -1 means unlimited for some options."""
+    if not _INTEGER_RE.fullmatch(value):
+        raise ValueError(value)
+    return int(value)
+
+
+def _ignore(state, value):
+    # Only changes what curl prints or saves locally, not the request itself
+    pass
+
+
+# (long name, short alias, takes a value, handler). Options with no handler
+# are accepted (and their argument consumed) but reported as unhandled.
+_OPTION_TABLE = [
+    ('--request', 'X', True, _set_method),
+    ('--head', 'I', False, _set_head),
+    ('--get', 'G', False, _set_get),
+    ('--header', 'H', True, _add_header),
+    ('--data', 'd', True, _add_data),
+    ('--data-ascii', None, True, _add_data),
+    ('--data-raw', None, True, _add_raw_data),
+    ('--data-binary', None, True, _add_binary_data),
+    ('--data-urlencode', None, True, _add_urlencoded_data),
+    ('--json', None, True, _add_json),
+    ('--form', 'F', True, _add_form),
+    ('--form-string', None, True, _add_form_string),
+    ('--user', 'u', True, _set_user),
+    ('--oauth2-bearer', None, True, _set_bearer),
+    ('--user-agent', 'A', True, _set_user_agent),
+    ('--referer', 'e', True, _set_referer),
+    ('--cookie', 'b', True, _add_cookie),
+    ('--insecure', 'k', False, _set_insecure),
+    ('--location', 'L', False, _set_location),
+    ('--max-time', 'm', True, _set_max_time),
+    ('--proxy', 'x', True, _set_proxy),
+    ('--url', None, True, _set_url),
+
+    # Output and diagnostics; no effect on the request
+    ('--silent', 's', False, _ignore),
+    ('--show-error', 'S', False, _ignore),
+    ('--verbose', 'v', False, _ignore),
+    ('--include', 'i', False, _ignore),
+    ('--show-headers', None, False, _ignore),
+    ('--progress-bar', '#', False, _ignore),
+    ('--no-progress-meter', None, False, _ignore),
+    ('--compressed', None, False, _ignore),
+    ('--output', 'o', True, _ignore),
+    ('--output-dir', None, True, _ignore),
+    ('--remote-name', 'O', False, _ignore),
+    ('--remote-name-all', None, False, _ignore),
+    ('--remote-header-name', 'J', False, _ignore),
+    ('--remote-time', 'R', False, _ignore),
+    ('--create-dirs', None, False, _ignore),
+    ('--dump-header', 'D', True, _ignore),
+    ('--write-out', 'w', True, _ignore),
+    ('--stderr', None, True, _ignore),
+    ('--trace', None, True, _ignore),
+    ('--trace-ascii', None, True, _ignore),
+    ('--trace-time', None, False, _ignore),
+    ('--styled-output', None, False, _ignore),
+    ('--no-buffer', 'N', False, _ignore),
+    ('--fail', 'f', False, _ignore),
+    ('--fail-with-body', None, False, _ignore),
+    ('--fail-early', None, False, _ignore),
+    ('--globoff', 'g', False, _ignore),
+    ('--path-as-is', None, False, _ignore),
+    ('--xattr', None, False, _ignore),
+
+    # Accepted but not translated into generated code
+    ('--abstract-unix-socket', None, True, None),
+    ('--alt-svc', None, True, None),
+    ('--anyauth', None, False, None),
+    ('--append', 'a', False, None),
+    ('--aws-sigv4', None, True, None),
+    ('--basic', None, False, None),
+    ('--ca-native', None, False, None),
+    ('--cacert', None, True, None),
+    ('--capath', None, True, None),
+    ('--cert', 'E', True, None),
+    ('--cert-status', None, False, None),
+    ('--cert-type', None, True, None),
+    ('--ciphers', None, True, None),
+    ('--config', 'K', True, None),
+    ('--connect-timeout', None, True, None),
+    ('--connect-to', None, True, None),
+    ('--continue-at', 'C', True, None),
+    ('--cookie-jar', 'c', True, None),
+    ('--create-file-mode', None, True, None),
+    ('--crlf', None, False, None),
+    ('--crlfile', None, True, None),
+    ('--curves', None, True, None),
+    ('--delegation', None, True, None),
+    ('--digest', None, False, None),
+    ('--disable', 'q', False, None),
+    ('--disable-eprt', None, False, None),
+    ('--disable-epsv', None, False, None),
+    ('--disallow-username-in-url', None, False, None),
+    ('--dns-interface', None, True, None),
+    ('--dns-ipv4-addr', None, True, None),
+    ('--dns-ipv6-addr', None, True, None),
+    ('--dns-servers', None, True, None),
+    ('--doh-cert-status', None, False, None),
+    ('--doh-insecure', None, False, None),
+    ('--doh-url', None, True, None),
+    ('--ech', None, True, None),
+    ('--egd-file', None, True, None),
+    ('--engine', None, True, None),
+    ('--etag-compare', None, True, None),
+    ('--etag-save', None, True, None),
+    ('--expect100-timeout', None, True, None),
+    ('--false-start', None, False, None),
+    ('--ftp-account', None, True, None),
+    ('--ftp-alternative-to-user', None, True, None),
+    ('--ftp-create-dirs', None, False, None),
+    ('--ftp-method', None, True, None),
+    ('--ftp-pasv', None, False, None),
+    ('--ftp-port', 'P', True, None),
+    ('--ftp-pret', None, False, None),
+    ('--ftp-skip-pasv-ip', None, False, None),
+    ('--ftp-ssl-ccc', None, False, None),
+    ('--ftp-ssl-ccc-mode', None, True, None),
+    ('--ftp-ssl-control', None, False, None),
+    ('--happy-eyeballs-timeout-ms', None, True, None),
+    ('--haproxy-clientip', None, True, None),
+    ('--haproxy-protocol', None, False, None),
+    ('--hostpubmd5', None, True, None),
+    ('--hostpubsha256', None, True, None),
+    ('--hsts', None, True, None),
+    ('--http0.9', None, False, None),
+    ('--http1.0', '0', False, None),
+    ('--http1.1', None, False, None),
+    ('--http2', None, False, None),
+    ('--http2-prior-knowledge', None, False, None),
+    ('--http3', None, False, None),
+    ('--http3-only', None, False, None),
+    ('--ignore-content-length', None, False, None),
+    ('--interface', None, True, None),
+    ('--ip-tos', None, True, None),
+    ('--ipfs-gateway', None, True, None),
+    ('--ipv4', '4', False, None),
+    ('--ipv6', '6', False, None),
+    ('--junk-session-cookies', 'j', False, None),
+    ('--keepalive', None, False, None),
+    ('--keepalive-cnt', None, True, None),
+    ('--keepalive-time', None, True, None),
+    ('--key', None, True, None),
+    ('--key-type', None, True, None),
+    ('--krb', None, True, None),
+    ('--libcurl', None, True, None),
+    ('--limit-rate', None, True, None),
+    ('--list-only', 'l', False, None),
+    ('--local-port', None, True, None),
+    ('--location-trusted', None, False, None),
+    ('--login-options', None, True, None),
+    ('--mail-auth', None, True, None),
+    ('--mail-from', None, True, None),
+    ('--mail-rcpt', None, True, None),
+    ('--mail-rcpt-allowfails', None, False, None),
+    ('--manual', 'M', False, None),
+    ('--max-filesize', None, True, None),
+    ('--max-redirs', None, True, None),
+    ('--metalink', None, False, None),
+    ('--mptcp', None, False, None),
+    ('--negotiate', None, False, None),
+    ('--netrc', 'n', False, None),
+    ('--netrc-file', None, True, None),
+    ('--netrc-optional', None, False, None),
+    ('--next', ':', False, None),
+    ('--no-alpn', None, False, None),
+    ('--no-npn', None, False, None),
+    ('--no-sessionid', None, False, None),
+    ('--noproxy', None, True, None),
+    ('--ntlm', None, False, None),
+    ('--ntlm-wb', None, False, None),
+    ('--parallel', 'Z', False, None),
+    ('--parallel-immediate', None, False, None),
+    ('--parallel-max', None, True, None),
+    ('--pass', None, True, None),
+    ('--pinnedpubkey', None, True, None),
+    ('--post301', None, False, None),
+    ('--post302', None, False, None),
+    ('--post303', None, False, None),
+    ('--preproxy', None, True, None),
+    ('--proto', None, True, None),
+    ('--proto-default', None, True, None),
+    ('--proto-redir', None, True, None),
+    ('--proxy-anyauth', None, False, None),
+    ('--proxy-basic', None, False, None),
+    ('--proxy-ca-native', None, False, None),
+    ('--proxy-cacert', None, True, None),
+    ('--proxy-capath', None, True, None),
+    ('--proxy-cert', None, True, None),
+    ('--proxy-cert-type', None, True, None),
+    ('--proxy-ciphers', None, True, None),
+    ('--proxy-crlfile', None, True, None),
+    ('--proxy-digest', None, False, None),
+    ('--proxy-header', None, True, None),
+    ('--proxy-http2', None, False, None),
+    ('--proxy-insecure', None, False, None),
+    ('--proxy-key', None, True, None),
+    ('--proxy-key-type', None, True, None),
+    ('--proxy-negotiate', None, False, None),
+    ('--proxy-ntlm', None, False, None),
+    ('--proxy-pass', None, True, None),
+    ('--proxy-pinnedpubkey', None, True, None),
+    ('--proxy-service-name', None, True, None),
+    ('--proxy-ssl-allow-beast', None, False, None),
+    ('--proxy-ssl-auto-client-cert', None, False, None),
+    ('--proxy-tls13-ciphers', None, True, None),
+    ('--proxy-tlsauthtype', None, True, None),
+    ('--proxy-tlspassword', None, True, None),
+    ('--proxy-tlsuser', None, True, None),
+    ('--proxy-tlsv1', None, False, None),
+    ('--proxy-user', 'U', True, None),
+    ('--proxy1.0', None, True, None),
+    ('--proxytunnel', 'p', False, None),
+    ('--pubkey', None, True, None),
+    ('--quote', 'Q', True, None),
+    ('--random-file', None, True, None),
+    ('--range', 'r', True, None),
+    ('--rate', None, True, None),
+    ('--raw', None, False, None),
+    ('--remove-on-error', None, False, None),
+    ('--request-target', None, True, None),
+    ('--resolve', None, True, None),
+    ('--retry', None, True, None),
+    ('--retry-all-errors', None, False, None),
+    ('--retry-connrefused', None, False, None),
+    ('--retry-delay', None, True, None),
+    ('--retry-max-time', None, True, None),
+    ('--sasl-authzid', None, True, None),
+    ('--sasl-ir', None, False, None),
+    ('--service-name', None, True, None),
+    ('--skip-existing', None, False, None),
+    ('--socks4', None, True, None),
+    ('--socks4a', None, True, None),
+    ('--socks5', None, True, None),
+    ('--socks5-basic', None, False, None),
+    ('--socks5-gssapi', None, False, None),
+    ('--socks5-gssapi-nec', None, False, None),
+    ('--socks5-gssapi-service', None, True, None),
+    ('--socks5-hostname', None, True, None),
+    ('--speed-limit', 'Y', True, None),
+    ('--speed-time', 'y', True, None),
+    ('--ssl', None, False, None),
+    ('--ssl-allow-beast', None, False, None),
+    ('--ssl-auto-client-cert', None, False, None),
+    ('--ssl-no-revoke', None, False, None),
+    ('--ssl-reqd', None, False, None),
+    ('--ssl-revoke-best-effort', None, False, None),
+    ('--sslv2', '2', False, None),
+    ('--sslv3', '3', False, None),
+    ('--suppress-connect-headers', None, False, None),
+    ('--tcp-fastopen', None, False, None),
+    ('--tcp-nodelay', None, False, None),
+    ('--telnet-option', 't', True, None),
+    ('--tftp-blksize', None, True, None),
+    ('--tftp-no-options', None, False, None),
+    ('--time-cond', 'z', True, None),
+    ('--tls-max', None, True, None),
+    ('--tls13-ciphers', None, True, None),
+    ('--tlsauthtype', None, True, None),
+    ('--tlspassword', None, True, None),
+    ('--tlsuser', None, True, None),
+    ('--tlsv1', '1', False, None),
+    ('--tlsv1.0', None, False, None),
+    ('--tlsv1.1', None, False, None),
+    ('--tlsv1.2', None, False, None),
+    ('--tlsv1.3', None, False, None),
+    ('--tr-encoding', None, False, None),
+    ('--unix-socket', None, True, None),
+    ('--upload-file', 'T', True, None),
+    ('--url-query', None, True, None),
+    ('--use-ascii', 'B', False, None),
+    ('--variable', None, True, None),
+    ('--version', 'V', False, None),
+    ('--help', 'h', False, None),
+]
+
+# Options whose value curl reads as a number; anything else is rejected, as
+# curl would, instead of failing later in a handler or the generated code
+_NUMERIC_OPTIONS = {
+    '--max-time': _seconds,
+    '--connect-timeout': _seconds,
+    '--expect100-timeout': _seconds,
+    '--retry-delay': _seconds,
+    '--retry-max-time': _seconds,
+    '--happy-eyeballs-timeout-ms': _integer,
+    '--keepalive-cnt': _integer,
+    '--keepalive-time': _integer,
+    '--max-redirs': _integer,
+    '--retry': _integer,
+    '--speed-limit': _integer,
+    '--speed-time': _integer,
+}
+
+CURL_OPTIONS = {}
+_LONG_OPTIONS = CURL_OPTIONS
+_SHORT_OPTIONS = {}
+for _name, _short, _takes_value, _handler in _OPTION_TABLE:
+    _option = CurlOption(_name, _takes_value, _handler, _NUMERIC_OPTIONS.get(_name))
+    CURL_OPTIONS[_name] = _option
+    if _short:
+        _SHORT_OPTIONS[_short] = _option
+del _name, _short, _takes_value, _handler, _option
@@ -0,0 +1,127 @@
+"""
+Find curl invocations in shell history files and logs.
+
+The input is memory-mapped and searched with compiled byte regexes, so a
+multi-gigabyte CI log is never read into memory; only the commands that are
+found are copied out, one at a time, as the caller asks for them. Commands
+may span lines through backslash continuations or quoted newlines, and zsh
+extended-history entries (": 1700000000:0;curl ...") are unescaped. Text
+that only mentions curl, with nothing that looks like a URL after it, is
+skipped.
+"""
+
+import mmap
+import re
+
+# Longest command that will be extracted; an unterminated quote in a log
+# would otherwise swallow everything up to the next matching quote
+MAX_COMMAND_BYTES = 16 << 20
+
+# Mapped pages behind the scan position are released in steps of this size
+# (a multiple of the page size) so resident memory stays flat on huge logs
+RELEASE_BYTES = 64 << 20
+
+_CURL_START_RE = re.compile(rb'curl(?:\.exe)?[ \t]')
+
+# Characters that may directly precede 'curl' when it starts a command;
+# '/' allows invocations by path such as /usr/bin/curl
+_COMMAND_BOUNDARY = b' \t\r\n;|&(`/'
+
+# A command runs until an unquoted, unescaped newline or shell operator
+_COMMAND_RE = re.compile(rb"""
+    (?:
+        \$'(?:[^'\\]|\\.)*'         # ANSI-C quoted
+      | '[^']*'                     # single quoted, may contain newlines
+      | "(?:[^"\\]|\\.)*"           # double quoted, may contain newlines
+      | \\\r\n | \\.                # escapes, including line continuations
+      | [^'"\\$;|&<>()\r\n]+        # anything else up to a shell operator
+      | \$
+    )*
+""", re.VERBOSE | re.DOTALL)
+
+# An argument that can be the URL: anything with a scheme, localhost or an
+# IP address, a dotted host name, or a shell variable holding a base URL.
+# Prose such as "running curl to fetch the logs" has none of these
+_URL_ARGUMENT_RE = re.compile(rb"""
+    [\s'"=]                                # start of a word, quoted or --url=
+    (?:
+        [a-zA-Z][a-zA-Z0-9+.-]*://          # any scheme
+      | (?:localhost|\d{1,3}(?:\.\d{1,3}){3}|\[[0-9a-fA-F:.]+\])(?![\w.-])
+      | [a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*\.[a-zA-Z]{2,}(?![\w.-])
+      | \$\{?[a-zA-Z_]\w*\}?[:/]
+    )
+""", re.VERBOSE)
+
+_ZSH_HISTORY_PREFIX_RE = re.compile(rb': \d+:\d+;')
+_ZSH_META_RE = re.compile(rb'\x83(.)', re.DOTALL)
+
+
+def _unmetafy(data):
+    """Undo zsh's history encoding of bytes >= 0x80 as 0x83, byte ^ 0x20."""
+    return _ZSH_META_RE.sub(lambda match: bytes([match.group(1)[0] ^ 0x20]), data)
+
+
+def scan_curl_commands(path):
+    """Yield every curl command found in a file, lazily."""
+    with open(path, 'rb') as f:
+        try:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return
+        with view:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                view.madvise(mmap.MADV_SEQUENTIAL)
+            yield from _scan_view(view)
+
+
+def _scan_view(view):
+    size = len(view)
+    pos = 0
+    released = 0
+    while match := _CURL_START_RE.search(view, pos):
+        start = match.start()
+        if start - released >= RELEASE_BYTES and hasattr(mmap, 'MADV_DONTNEED'):
+            # Everything before the match has been scanned and copied out
+            release_end = start - start % RELEASE_BYTES
+            view.madvise(mmap.MADV_DONTNEED, released, release_end - released)
+            released = release_end
+        pos = match.end()
+        if start and view[start - 1] not in _COMMAND_BOUNDARY:
+            # Part of a longer word, such as libcurl
+            continue
+
+        limit = min(size, start + MAX_COMMAND_BYTES)
+        line_start = view.rfind(b'\n', 0, start) + 1
+        if _ZSH_HISTORY_PREFIX_RE.match(view, line_start):
+            # zsh writes every newline inside an entry as backslash-newline,
+            # so the entry has to be unescaped before its end can be found
+            entry = view[start:_zsh_entry_end(view, start, limit)]
+            if b'\x83' in entry:
+                entry = _unmetafy(entry)
+            entry = entry.replace(b'\\\n', b'\n')
+            command = entry[:_COMMAND_RE.match(entry).end()]
+            # Unescaping only shortens the text, so this never skips past
+            # a later command in the same entry
+            pos = max(pos, start + len(command))
+        else:
+            end = _COMMAND_RE.match(view, start, limit).end()
+            pos = max(pos, end)
+            command = view[start:end]
+
+        # Most commands have a scheme, which a substring search finds cheaply
+        if b'://' not in command and not _URL_ARGUMENT_RE.search(command):
+            continue
+        yield command.decode('utf-8', errors='replace').strip()
+
+
+def _zsh_entry_end(view, start, limit):
+    """Return the end of the zsh history entry that contains start."""
+    end = start
+    while True:
+        end = view.find(b'\n', end, limit)
+        if end < 0:
+            return limit
+        if view[end - 1] != ord('\\'):
+            return end
+        end += 1
@@ -0,0 +1,187 @@
+"""
+Manifest for incremental regeneration of a directory of .curl files.
+
+`Curl2All.py --sync SOURCE --dir OUTPUT` converts every SOURCE/**/name.curl
+to OUTPUT/**/name.{py,cs,http}. The manifest, kept in OUTPUT, records each
+input's mtime, size and content hash with the outputs it produced and the
+converter version and options that produced them. A re-run only stats the
+inputs; files are hashed only when their mtime or size changed, and
+converted only when their content, the converters or the options did.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+MANIFEST_NAME = '.curl2all-manifest.json'
+INPUT_EXTENSION = '.curl'
+MANIFEST_FORMAT = 1
+
+
+def find_inputs(source_dir):
+    """Return {relative path: (mtime_ns, size)} for every .curl file under source_dir.
+
+    Hidden directories such as .git are skipped.
+    """
+    inputs = {}
+    pending = ['']
+    while pending:
+        relative_dir = pending.pop()
+        with os.scandir(os.path.join(source_dir, relative_dir)) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                relative = os.path.join(relative_dir, entry.name)
+                if entry.is_dir():
+                    pending.append(relative)
+                elif entry.name.endswith(INPUT_EXTENSION) and entry.is_file():
+                    stat = entry.stat()
+                    inputs[relative] = (stat.st_mtime_ns, stat.st_size)
+    return inputs
+
+
+def file_digest(path):
+    """Return the SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_outputs(output_dir):
+    """Return the set of relative paths of every file under output_dir, skipping hidden ones."""
+    found = set()
+    pending = ['']
+    while pending:
+        relative_dir = pending.pop()
+        try:
+            entries = os.scandir(os.path.join(output_dir, relative_dir))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                relative = os.path.join(relative_dir, entry.name)
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    pending.append(relative)
+                else:
+                    found.add(relative)
+    return found
+
+
+class SyncManifest:
+    def __init__(self, output_dir, version, options):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.version = version
+        self.options = options
+        # relative input path -> {'mtime_ns', 'size', 'digest', 'outputs', ['error']}
+        self.inputs = {}
+        # False when the converters or options changed since the last run,
+        # which makes every input out of date
+        self.current = False
+        self.dirty = False
+
+    def load(self):
+        """Read the manifest from the output directory, if there is one."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get('format') != MANIFEST_FORMAT:
+            return self
+        self.inputs = data.get('inputs', {})
+        self.current = data.get('version') == self.version and data.get('options') == self.options
+        return self
+
+    def save(self):
+        """Write the manifest atomically if anything changed."""
+        if not self.dirty and self.current:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=self.output_dir)
+        try:
+            # Encoding in one go and writing once is several times faster than
+            # json.dump's many small writes for a manifest of thousands of inputs
+            data = json.dumps({'format': MANIFEST_FORMAT, 'version': self.version,
+                               'options': self.options, 'inputs': self.inputs})
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        self.current = True
+        self.dirty = False
+
+    def plan(self, source_dir, inputs, existing_outputs):
+        """Split inputs into the ones that need converting and the ones that are gone.
+
+        Returns ([changed relative paths], unchanged count, [removed relative paths]).
+        Inputs whose mtime changed but whose content didn't, as after a git
+        checkout, are only updated in the manifest.
+        """
+        changed = []
+        unchanged = 0
+        for relative, (mtime_ns, size) in inputs.items():
+            entry = self.inputs.get(relative)
+            up_to_date = (entry is not None and self.current
+                          and all(output in existing_outputs for output in entry['outputs']))
+            if up_to_date and entry['mtime_ns'] == mtime_ns and entry['size'] == size:
+                unchanged += 1
+                continue
+
+            digest = file_digest(os.path.join(source_dir, relative))
+            if up_to_date and entry['digest'] == digest:
+                entry.update(mtime_ns=mtime_ns, size=size)
+                self.dirty = True
+                unchanged += 1
+                continue
+            changed.append(relative)
+
+        removed = [relative for relative in self.inputs if relative not in inputs]
+        return changed, unchanged, removed
+
+    def record(self, relative, mtime_ns, size, digest, outputs, error=None):
+        """Store the result of converting one input; return outputs it no longer produces."""
+        previous = self.inputs.get(relative)
+        self.inputs[relative] = {'mtime_ns': mtime_ns, 'size': size,
+                                 'digest': digest, 'outputs': outputs}
+        if error:
+            # Kept so the failure is reported again until the input is fixed
+            self.inputs[relative]['error'] = error
+        self.dirty = True
+        return [output for output in (previous or {}).get('outputs', []) if output not in outputs]
+
+    def errors(self):
+        """Return [(relative path, error)] for every input that failed to convert."""
+        return sorted((relative, entry['error']) for relative, entry in self.inputs.items()
+                      if entry.get('error'))
+
+    def forget(self, relative):
+        """Drop an input that no longer exists; return the outputs it had produced."""
+        self.dirty = True
+        return self.inputs.pop(relative, {}).get('outputs', [])
+
+    def remove_outputs(self, outputs):
+        """Delete output files, and any directories that become empty, under output_dir."""
+        removed = 0
+        for output in outputs:
+            path = os.path.join(self.output_dir, output)
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                continue
+            directory = os.path.dirname(path)
+            while os.path.abspath(directory) != os.path.abspath(self.output_dir):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+        return removed
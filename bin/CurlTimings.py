@@ -0,0 +1,141 @@
+"""
+Phase timings and profiling hooks for the Curl2* scripts.
+
+`--timings` on any of the scripts prints one JSON object on stderr with the
+wall time spent in each phase of a conversion: reading input, cache lookup,
+tokenizing, option parsing, body classification, code generation and
+writing output. Batch runs add up the phases over every command and worker.
+
+Setting CURL2_PROFILE=cprofile or CURL2_PROFILE=tracemalloc profiles a run
+without any code changes. The cProfile stats or tracemalloc snapshot are
+dumped to $CURL2_PROFILE_DIR (the temp directory by default) and a short
+summary is printed on stderr.
+"""
+
+import io
+import os
+import sys
+import time
+
+PHASES = ('read', 'cache', 'tokenize', 'parse', 'classify', 'generate', 'write')
+
+PROFILE_ENV = 'CURL2_PROFILE'
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+# Lines of the profile summary printed on stderr
+SUMMARY_LINES = 15
+
+
+class Timings:
+    """Accumulated wall time per conversion phase.
+
+    Phases are timed by marking the end of each one; the time since the
+    previous mark (or start()) is added to the phase being marked.
+    """
+
+    def __init__(self):
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.count = 0
+        self.created = time.perf_counter()
+        self._last = self.created
+
+    def start(self):
+        """Start timing a new phase without charging the time since the last mark to anything."""
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Add the time since the last mark to phase."""
+        now = time.perf_counter()
+        self.totals[phase] += now - self._last
+        self._last = now
+
+    def take(self):
+        """Return (totals, count) and reset them, for sending from a worker to its parent."""
+        taken = (self.totals, self.count)
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.count = 0
+        return taken
+
+    def merge(self, totals, count):
+        """Add phase totals and a conversion count reported by take()."""
+        for phase, seconds in totals.items():
+            self.totals[phase] += seconds
+        self.count += count
+
+    def report(self, script, file=None):
+        """Print the timings as one line of JSON, on stderr by default."""
+        import json
+        data = {
+            'script': script,
+            'conversions': self.count,
+            'wall_ms': round((time.perf_counter() - self.created) * 1000, 3),
+            'phases_ms': {phase: round(seconds * 1000, 3) for phase, seconds in self.totals.items()}
+        }
+        if self.count > 1:
+            data['mean_ms'] = {phase: round(seconds * 1000 / self.count, 3)
+                               for phase, seconds in self.totals.items()}
+        print(json.dumps(data), file=file or sys.stderr)
+
+
+def timed_output(generate, out, timings=None):
+    """Call generate(out), timing generation and writing separately when timings are on.
+
+    Generators normally stream straight into out; to tell the two phases
+    apart the output is built in memory first.
+    """
+    if timings is None:
+        generate(out)
+        return
+    buffer = io.StringIO()
+    generate(buffer)
+    timings.mark('generate')
+    out.write(buffer.getvalue())
+    timings.mark('write')
+
+
+def profile_mode():
+    """Return the profiler named by $CURL2_PROFILE, or None."""
+    return os.environ.get(PROFILE_ENV, '').strip().lower() or None
+
+
+def run_profiled(function, *args):
+    """Call function(*args) under the profiler named by $CURL2_PROFILE, if any, and return its result."""
+    mode = profile_mode()
+    if mode is None:
+        return function(*args)
+    if mode not in PROFILE_MODES:
+        print(f"Warning: unknown {PROFILE_ENV}={mode!r}, expected one of {', '.join(PROFILE_MODES)}",
+              file=sys.stderr)
+        return function(*args)
+
+    import tempfile
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'curl2'
+    output_dir = os.environ.get('CURL2_PROFILE_DIR') or tempfile.gettempdir()
+    path = os.path.join(output_dir, f"{script}-{os.getpid()}.{mode}")
+
+    if mode == 'cprofile':
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(function, *args)
+        finally:
+            profiler.dump_stats(path)
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(SUMMARY_LINES)
+            print(summary.getvalue(), file=sys.stderr)
+            print(f"cProfile stats written to {path}", file=sys.stderr)
+
+    import tracemalloc
+    tracemalloc.start(25)
+    try:
+        return function(*args)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot.dump(path)
+        print(f"Allocated: {current / 1024:.1f} KiB live, {peak / 1024:.1f} KiB peak", file=sys.stderr)
+        for stat in snapshot.statistics('lineno')[:SUMMARY_LINES]:
+            print(stat, file=sys.stderr)
+        print(f"tracemalloc snapshot written to {path}", file=sys.stderr)
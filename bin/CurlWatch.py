@@ -0,0 +1,194 @@
+"""
+Change notification for `Curl2All.py --watch`.
+
+On Linux the source tree is watched with inotify, called through ctypes so
+there is nothing to install; elsewhere, or when asked to, it is polled by
+comparing an index of .curl file mtimes and sizes. Either way the watcher
+reports the relative paths of .curl files that may have changed, and
+bursts of events (an editor's write-then-rename, a git checkout) are
+debounced into one batch.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from CurlSync import INPUT_EXTENSION, find_inputs
+
+DEFAULT_POLL_INTERVAL = 0.5
+# Long enough to merge an editor's write-to-temp-then-rename into one change
+DEFAULT_DEBOUNCE = 0.02
+
+# inotify constants from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+               | _IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+
+class PollingWatcher:
+    """Find changes by rescanning the mtime and size of every .curl file."""
+
+    name = 'polling'
+
+    def __init__(self, source_dir, interval=DEFAULT_POLL_INTERVAL):
+        self.source_dir = source_dir
+        self.interval = interval
+        self.index = find_inputs(source_dir)
+
+    def wait(self, timeout=None):
+        """Return the paths that changed within timeout (or the next change, if None)."""
+        while True:
+            time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+            index = find_inputs(self.source_dir)
+            changed = {relative for relative in index.keys() | self.index.keys()
+                       if index.get(relative) != self.index.get(relative)}
+            self.index = index
+            if changed or timeout is not None:
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Find changes from inotify events on every directory of the source tree."""
+
+    name = 'inotify'
+
+    def __init__(self, source_dir, libc):
+        self.source_dir = source_dir
+        self.libc = libc
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # watch descriptor -> directory relative to source_dir
+        self.directories = {}
+        self._add_tree('')
+
+    def _add_tree(self, relative_dir):
+        """Watch a directory and everything below it; return the .curl files found there."""
+        found = set()
+        pending = [relative_dir]
+        while pending:
+            relative_dir = pending.pop()
+            path = os.path.join(self.source_dir, relative_dir)
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+            if wd < 0:
+                # Removed again already, or not a directory after all
+                continue
+            self.directories[wd] = relative_dir
+            try:
+                entries = os.scandir(path)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    relative = os.path.join(relative_dir, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(relative)
+                    elif entry.name.endswith(INPUT_EXTENSION):
+                        found.add(relative)
+        return found
+
+    def wait(self, timeout=None):
+        """Return the paths that changed within timeout (or the next change, if None).
+
+        Returns None when events were lost and the whole tree has to be rescanned.
+        """
+        changed = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        try:
+            data = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        rescan = False
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & _IN_IGNORED:
+                self.directories.pop(wd, None)
+                continue
+            relative_dir = self.directories.get(wd)
+            if relative_dir is None or name.startswith('.'):
+                continue
+            relative = os.path.join(relative_dir, name)
+
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    changed |= self._add_tree(relative)
+                elif mask & (_IN_MOVED_FROM | _IN_DELETE):
+                    # Everything that was inside it is gone
+                    rescan = True
+            elif name.endswith(INPUT_EXTENSION) and not mask & _IN_CREATE:
+                # A new file is reported again once it has been written
+                changed.add(relative)
+        return None if rescan else changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _load_libc():
+    """Return libc if it has inotify, otherwise None."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def open_watcher(source_dir, poll_interval=None):
+    """Return a watcher for source_dir: inotify if available, polling if not or if poll_interval is given."""
+    if poll_interval is None:
+        libc = _load_libc()
+        if libc:
+            try:
+                return InotifyWatcher(source_dir, libc)
+            except OSError:
+                pass
+    return PollingWatcher(source_dir, poll_interval or DEFAULT_POLL_INTERVAL)
+
+
+def wait_for_changes(watcher, debounce=DEFAULT_DEBOUNCE):
+    """Block until something changes, then keep collecting until debounce seconds pass quietly.
+
+    Returns the changed relative paths, or None if the tree must be rescanned.
+    """
+    changed = watcher.wait()
+    while changed is not None and not changed:
+        # Only files that aren't .curl inputs changed
+        changed = watcher.wait()
+    while True:
+        more = watcher.wait(debounce)
+        if not more and more is not None:
+            return changed
+        if changed is None or more is None:
+            changed = None
+        else:
+            changed |= more
@@ -0,0 +1,73 @@
+"""
+Tests for the Curl2All library API and daemon handler in bin/Curl2All.py.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+BIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'bin')
+sys.path.insert(0, BIN_DIR)
+
+from Curl2All import atomic_output, convert, handle_daemon_request  # noqa: E402
+from CurlRequest import CurlParseError  # noqa: E402
+
+COMMANDS = [
+    "curl https://api.example.com/users",
+    "curl -X POST https://api.example.com/users -H 'Content-Type: application/json' "
+    "-d '{\"name\": \"John\", \"tags\": [\"a\", \"b\"]}'",
+    "curl https://api.example.com/search?q=1 -u user:pass -m 5 -k",
+    "curl https://api.example.com/upload -F file=@photo.png -F caption=hi",
+    "curl -X PUT https://api.example.com/items/1 -d 'a=1&b=2' -b 'session=abc'",
+]
+
+
+class ConvertTest(unittest.TestCase):
+    def test_concurrent_calls_match_sequential_output(self):
+        expected = [convert(command, deterministic=True) for command in COMMANDS]
+        work = COMMANDS * 20
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda command: convert(command, deterministic=True), work))
+        self.assertEqual(results, expected * 20)
+
+    def test_malformed_number_raises_parse_error(self):
+        with self.assertRaises(CurlParseError):
+            convert("curl -m abc https://x")
+
+    def test_read_files_false_keeps_the_reference(self):
+        results = convert("curl https://a.com -d @/etc/hostname", read_files=False)
+        self.assertIn("open('/etc/hostname', 'rb')", results['python'])
+        self.assertIn('< /etc/hostname', results['http'])
+
+
+class AtomicOutputTest(unittest.TestCase):
+    def test_finished_file_gets_the_umask_mode(self):
+        umask = os.umask(0o022)
+        os.umask(umask)
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, 'out.py')
+            with atomic_output(output_file) as tmp_path:
+                with open(tmp_path, 'w') as f:
+                    f.write('pass\n')
+            self.assertEqual(os.stat(output_file).st_mode & 0o777, 0o666 & ~umask)
+
+
+class DaemonRequestTest(unittest.TestCase):
+    def test_local_input_is_left_to_the_client(self):
+        for command in ("curl https://a.com -d@body.json",
+                        "curl https://a.com --data-binary @-"):
+            with self.subTest(command=command):
+                reply = handle_daemon_request({'op': 'convert', 'target': 'python', 'command': command})
+                self.assertFalse(reply['ok'])
+                self.assertIn('converted by the client', reply['error'])
+
+    def test_convert(self):
+        reply = handle_daemon_request({'op': 'convert', 'target': 'http', 'command': "curl https://a.com/users"})
+        self.assertTrue(reply['ok'])
+        self.assertIn('GET https://a.com/users', reply['output'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests for the code generated by bin/Curl2CSharp.py.
+"""
+
+import os
+import sys
+import unittest
+
+BIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'bin')
+sys.path.insert(0, BIN_DIR)
+
+from Curl2CSharp import CurlToCSharp  # noqa: E402
+from CurlRequest import parse_curl_command  # noqa: E402
+
+
+def generate(curl_command):
+    return CurlToCSharp(parse_curl_command(curl_command)).generate_csharp_code()
+
+
+class ContentTypeTest(unittest.TestCase):
+    def test_json_body_keeps_declared_media_type(self):
+        code = generate("curl https://a.com -H 'Content-Type: application/vnd.api+json' -d '{\"a\": 1}'")
+        self.assertIn('new StringContent(jsonData, Encoding.UTF8, "application/vnd.api+json");', code)
+
+    def test_declared_parameters_are_set_on_the_header(self):
+        code = generate("curl https://a.com -H 'Content-Type: application/json; charset=utf-8' -d '{\"a\": 1}'")
+        self.assertIn('new StringContent(jsonData, Encoding.UTF8);', code)
+        self.assertIn('MediaTypeHeaderValue.Parse("application/json; charset=utf-8");', code)
+
+    def test_undeclared_json_is_sent_as_application_json(self):
+        code = generate("curl https://a.com -d '{\"a\": 1}'")
+        self.assertIn('new StringContent(jsonData, Encoding.UTF8, "application/json");', code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests for the code generated by bin/Curl2Python.py.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+BIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'bin')
+sys.path.insert(0, BIN_DIR)
+
+from Curl2Python import CurlToPython  # noqa: E402
+from CurlRequest import parse_curl_command  # noqa: E402
+
+
+class RecordingSession:
+    """Stands in for requests.Session, recording the arguments of each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        files = kwargs.get('files') or {}
+        self.calls.append((url, kwargs, [f.closed for f in files.values()]))
+        return kwargs
+
+
+@unittest.skipUnless(importlib.util.find_spec('requests'), "the generated module imports requests")
+class SessionFlavorTest(unittest.TestCase):
+    def load_send_request(self, curl_command):
+        """Generate the session module for curl_command and return its send_request."""
+        code = CurlToPython(parse_curl_command(curl_command), flavor='session').generate_python_code()
+        namespace = {'__name__': 'generated'}
+        exec(code, namespace)
+        return namespace['send_request']
+
+    def test_caller_arguments_replace_the_commands(self):
+        send_request = self.load_send_request("curl https://a.com -X POST -m 5 -k -d a=1")
+        session = RecordingSession()
+        kwargs = send_request(session, timeout=1, verify=True)
+        self.assertEqual(kwargs['timeout'], 1)
+        self.assertIs(kwargs['verify'], True)
+        self.assertEqual(kwargs['data'], 'a=1')
+
+    def test_uploaded_files_are_closed_after_the_request(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'photo.png')
+            with open(path, 'wb') as f:
+                f.write(b'image')
+            send_request = self.load_send_request(f"curl https://a.com -F 'photo=@{path}' -F caption=hi")
+            session = RecordingSession()
+            kwargs = send_request(session)
+        self.assertEqual(session.calls[0][2], [False])
+        self.assertTrue(kwargs['files']['photo'].closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for the Curl2All conversion cache in bin/CurlCache.py.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+BIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'bin')
+sys.path.insert(0, BIN_DIR)
+
+from CurlCache import ConversionCache  # noqa: E402
+
+
+class TrimTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def store(self, cache, name, size):
+        key = cache.key(f"curl https://a.com/{name}", {})
+        cache.put_contents(key, {}, {'.py': 'x' * size})
+        return key
+
+    def test_trim_skips_scan_while_under_budget(self):
+        cache = ConversionCache(self.tmp.name, max_bytes=10000)
+        self.store(cache, 'a', 1000)
+        cache.record_run(evictions=cache.trim())
+
+        cache = ConversionCache(self.tmp.name, max_bytes=10000)
+        self.store(cache, 'b', 1000)
+        with mock.patch.object(ConversionCache, '_entries') as entries:
+            self.assertEqual(cache.trim(), 0)
+        entries.assert_not_called()
+        cache.record_run()
+        self.assertGreater(cache.load_stats()['bytes'], 2000)
+
+    def test_trim_evicts_once_total_passes_budget(self):
+        cache = ConversionCache(self.tmp.name, max_bytes=2500)
+        first = self.store(cache, 'a', 1000)
+        cache.record_run(evictions=cache.trim())
+        self.store(cache, 'b', 1000)
+        self.store(cache, 'c', 1000)
+
+        self.assertEqual(cache.trim(), 1)
+        cache.record_run()
+        self.assertIsNone(cache.get(first))
+        self.assertLessEqual(cache.load_stats()['bytes'], 2500)
+
+
+class GetTest(unittest.TestCase):
+    def test_entry_without_extensions_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ConversionCache(tmp)
+            key = cache.key("curl https://a.com", {})
+            cache.put_contents(key, {}, {'.py': 'pass'})
+            with open(os.path.join(cache._entry_dir(key), 'meta.json'), 'w') as f:
+                f.write('{}')
+            self.assertIsNone(cache.get(key))
+            self.assertEqual(cache.misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Regression tests for the shared curl parser in bin/CurlRequest.py.
+
+Run with `python -m pytest tests/curl2` or `python -m unittest discover tests/curl2`.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+BIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'bin')
+sys.path.insert(0, BIN_DIR)
+
+from CurlRequest import (CurlDataFileError, CurlParseError, parse_curl_command,  # noqa: E402
+                         split_curl_commands, tokenize_curl_command)
+
+
+class SplitCurlCommandsTest(unittest.TestCase):
+    def test_odd_trailing_backslashes_continue(self):
+        lines = ['curl https://a.com \\\n', '-d x\n', 'curl https://b.com \\\\\\\n', '-d y\n']
+        self.assertEqual(list(split_curl_commands(lines)),
+                         ['curl https://a.com  -d x', 'curl https://b.com \\\\ -d y'])
+
+    def test_escaped_backslash_ends_command(self):
+        lines = ['curl https://a.com -d \\\\\n', 'curl https://b.com\n']
+        self.assertEqual(list(split_curl_commands(lines)),
+                         ['curl https://a.com -d \\\\', 'curl https://b.com'])
+
+
+class TokenizeCurlCommandTest(unittest.TestCase):
+    def test_caret_quote_in_bash_command(self):
+        command = ("curl https://a.com -H 'X-Rule: ^\"' "
+                   "-d '{\"pattern\": \"^[a-z]+$\", \"anchor\": \"^\"}'")
+        self.assertEqual(tokenize_curl_command(command), [
+            'curl', 'https://a.com', '-H', 'X-Rule: ^"',
+            '-d', '{"pattern": "^[a-z]+$", "anchor": "^"}',
+        ])
+
+    def test_windows_cmd_copy(self):
+        command = 'curl ^"https://a.com/?q=1^&r=2^" ^\n  -H ^"accept: */*^" ^\n  --data-raw ^"^{^\\^"a^\\^":1^}^"'
+        self.assertEqual(tokenize_curl_command(command), [
+            'curl', 'https://a.com/?q=1&r=2', '-H', 'accept: */*', '--data-raw', '{"a":1}',
+        ])
+
+    def test_windows_fallback_when_posix_quoting_fails(self):
+        command = 'curl ^"https://a.com^" --data-raw ^"^{^\\^"it\'s^\\^":1^}^"'
+        self.assertEqual(tokenize_curl_command(command),
+                         ['curl', 'https://a.com', '--data-raw', '{"it\'s":1}'])
+
+
+
+class LocalInputTest(unittest.TestCase):
+    def test_data_files_mark_local_input(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'body.txt')
+            with open(path, 'w') as f:
+                f.write('hello')
+            for command in (f"curl https://a.com -d@{path}",
+                            f"curl https://a.com --data-binary @{path}",
+                            f"curl https://a.com --data-urlencode 'msg@{path}'"):
+                with self.subTest(command=command):
+                    self.assertTrue(parse_curl_command(command).local_input)
+
+    def test_inline_data_is_not_local_input(self):
+        for command in ("curl https://a.com -d 'a=1&b=2'",
+                        "curl https://a.com --data-raw @literal",
+                        "curl https://a.com --data-urlencode 'name=a@b.com'"):
+            with self.subTest(command=command):
+                self.assertFalse(parse_curl_command(command).local_input)
+
+
+
+class NumericOptionTest(unittest.TestCase):
+    def test_max_time_is_parsed_as_seconds(self):
+        self.assertEqual(parse_curl_command("curl -m 2.5 https://a.com").timeout, 2.5)
+        self.assertEqual(parse_curl_command("curl --max-time=.5 https://a.com").timeout, 0.5)
+
+    def test_malformed_numbers_raise_parse_error(self):
+        for command in ("curl -m abc https://a.com",
+                        "curl --max-time nan https://a.com",
+                        "curl --connect-timeout 1e3 https://a.com",
+                        "curl --retry many https://a.com"):
+            with self.subTest(command=command):
+                with self.assertRaises(CurlParseError):
+                    parse_curl_command(command)
+
+
+class ReadFilesTest(unittest.TestCase):
+    def test_data_file_is_left_as_a_reference(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'body.json')
+            with open(path, 'w') as f:
+                f.write('{"secret": 1}')
+            request = parse_curl_command(f"curl https://a.com -d @{path}", read_files=False)
+        self.assertEqual(request.body_file, path)
+        self.assertIsNone(request.body)
+        self.assertEqual(request.body_kind, 'raw')
+        self.assertFalse(request.local_input)
+
+    def test_data_that_needs_reading_is_refused(self):
+        for command in ("curl https://a.com -d @-",
+                        "curl https://a.com -d @body.txt -d a=1",
+                        "curl https://a.com --data-urlencode 'msg@body.txt'"):
+            with self.subTest(command=command):
+                with self.assertRaises(CurlDataFileError):
+                    parse_curl_command(command, read_files=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
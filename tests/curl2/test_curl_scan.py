@@ -0,0 +1,44 @@
+"""
+Tests for finding curl commands in logs and shell history with bin/CurlScan.py.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+BIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'bin')
+sys.path.insert(0, BIN_DIR)
+
+from CurlScan import scan_curl_commands  # noqa: E402
+
+
+class ScanCurlCommandsTest(unittest.TestCase):
+    def scan(self, text):
+        with tempfile.NamedTemporaryFile('wb', suffix='.log', delete=False) as f:
+            f.write(text.encode())
+        self.addCleanup(os.unlink, f.name)
+        return list(scan_curl_commands(f.name))
+
+    def test_prose_mentioning_curl_is_skipped(self):
+        log = ("Running curl to fetch stuff\n"
+               "curl is not installed\n"
+               "we used curl and then jq\n")
+        self.assertEqual(self.scan(log), [])
+
+    def test_commands_with_a_url_argument_are_found(self):
+        commands = [
+            "curl https://api.example.com/users -H 'X: y'",
+            "curl -sSL localhost:8080/health",
+            "curl example.com",
+            "curl -X POST 10.0.0.1/api",
+            'curl "$API_URL/users" -d x=1',
+            "curl --url=https://b.com/x",
+            "curl 'http://[::1]:8080/'",
+        ]
+        log = ''.join(f"+ {command}\nRunning curl to fetch stuff\n" for command in commands)
+        self.assertEqual(self.scan(log), commands)
+
+
+if __name__ == '__main__':
+    unittest.main()
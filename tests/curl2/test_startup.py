@@ -0,0 +1,47 @@
+"""
+Cold-start budget tests for the Curl2* scripts, using bench/curl2/startup.py.
+
+Set CURL2_STARTUP_SCALE to multiply every budget on a much slower machine,
+the same as startup.py's --scale.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                         'bench', 'curl2')
+sys.path.insert(0, BENCH_DIR)
+
+import startup  # noqa: E402
+
+# Runs of each entry point; the fastest counts
+RUNS = 3
+
+SCALE = float(os.environ.get('CURL2_STARTUP_SCALE', '1'))
+
+
+class StartupBudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env = startup.isolated_env(tmp_dir)
+            cls.startup_modules = set(startup.run_importtime(['-c', 'pass'], env)[0])
+            cls.results = [(script, arguments, budget,
+                            startup.measure(script, arguments, env, RUNS, cls.startup_modules))
+                           for script, arguments, budget in startup.ENTRY_POINTS]
+
+    def test_imports_stay_within_budget(self):
+        for script, arguments, budget, (import_ms, _, _) in self.results:
+            with self.subTest(script=script, arguments=arguments):
+                self.assertLessEqual(import_ms, budget * SCALE)
+
+    def test_lazy_modules_are_not_imported(self):
+        for script, arguments, _, (_, _, modules) in self.results:
+            with self.subTest(script=script, arguments=arguments):
+                self.assertEqual(startup.eager_modules(modules - self.startup_modules), [])
+
+
+if __name__ == '__main__':
+    unittest.main()